@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark.
+
+Measures cold-start cost of the CLI in fresh interpreter processes, which is
+what short-lived batch workers pay on every spawn.
+
+Usage:
+    uv run benchmarks/bench_startup.py
+    uv run benchmarks/bench_startup.py --runs 20
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "import config": ["-c", "import config"],
+    "import main": ["-c", "import main"],
+    "main.py --help": ["main.py", "--help"],
+    "mock adapter": ["-c", "import config; config.get_selected_adapter('mock')"],
+    "build verifier": [
+        "-c",
+        "import config; from core.verifier import ConsensusVerifier; "
+        "from models import HeroCapabilities; "
+        "ConsensusVerifier(config.get_selected_adapter('mock'), HeroCapabilities)",
+    ],
+}
+
+
+def time_process(args, runs):
+    """Run `python <args>` `runs` times and return wall-clock timings in ms."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup time")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per scenario")
+    args = parser.parse_args()
+
+    # Baseline: bare interpreter startup
+    baseline = statistics.median(time_process(["-c", "pass"], args.runs))
+
+    print(f"{'Scenario':<20} {'median ms':>10} {'min ms':>10} {'over python':>12}")
+    print("-" * 55)
+    print(f"{'python -c pass':<20} {baseline:>10.1f}")
+    for name, scenario_args in SCENARIOS.items():
+        timings = time_process(scenario_args, args.runs)
+        median = statistics.median(timings)
+        print(
+            f"{name:<20} {median:>10.1f} {min(timings):>10.1f} "
+            f"{median - baseline:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
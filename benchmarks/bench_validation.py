@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Validation engine benchmark.
+
+Measures CPU time per call of the "guard" and "fast" engines against the
+offline MockAdapter, so the numbers are pure framework overhead (no network).
+
+Usage:
+    uv run benchmarks/bench_validation.py
+    uv run benchmarks/bench_validation.py --calls 500
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.verifier import HeroVerifier
+from model_adapters.mock_adapter import MockAdapter
+from models import HeroCapabilities
+from examples.domains.product_review_config import ProductReview
+
+SCHEMAS = {
+    "HeroCapabilities": (
+        HeroCapabilities,
+        '{"can_fly": true, "has_super_strength": true, "gender": "male"}',
+    ),
+    "ProductReview": (
+        ProductReview,
+        '{"is_positive": true, "mentions_quality": true, "mentions_price": false}',
+    ),
+}
+
+
+class CannedAdapter(MockAdapter):
+    """MockAdapter that always answers with one schema-valid response."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+    def _answer(self, text):
+        return self.response
+
+
+def cpu_ms_per_call(verifier, item, calls):
+    """CPU milliseconds per verify() call, after one warm-up call."""
+    verifier.verify(item)
+    start = time.process_time()
+    for _ in range(calls):
+        verifier.verify(item)
+    return (time.process_time() - start) * 1000 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark validation engines")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per engine")
+    args = parser.parse_args()
+
+    print(f"{'Schema':<18} {'guard ms':>10} {'fast ms':>10} {'speedup':>9}")
+    print("-" * 50)
+    for name, (schema, response) in SCHEMAS.items():
+        timings = {
+            engine: cpu_ms_per_call(
+                HeroVerifier(CannedAdapter(response), schema, engine=engine),
+                "benchmark item",
+                args.calls,
+            )
+            for engine in ("guard", "fast")
+        }
+        print(
+            f"{name:<18} {timings['guard']:>10.3f} {timings['fast']:>10.3f} "
+            f"{timings['guard'] / timings['fast']:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,5 @@
 import os
-from dotenv import load_dotenv
-from model_adapters.gemini_adapter import GeminiAdapter
-from model_adapters.mock_adapter import MockAdapter
-from model_adapters.gpt_adapter import GPTAdapter
-from model_adapters.groq_adapter import GroqAdapter
-
-# Load environment variables
-load_dotenv()
+import importlib
 
 # --- FRAMEWORK CONFIGURATION ---
 # These settings control the validation framework behavior
@@ -25,10 +18,218 @@ assert 0.0 <= CONSENSUS_THRESHOLD_RATIO <= 1.0, (
     "CONSENSUS_THRESHOLD_RATIO must be between 0.0 and 1.0"
 )
 
+# Request all iterations of an item as `n` choices of a single API call when
+# the adapter supports it (adapter.supports_n); others fall back to one call
+# per iteration
+MULTI_SAMPLE = False
+
+# Stream each item's iterations concurrently (STREAM_CONCURRENCY at once,
+# None = all), parse fields as tokens arrive and close the streams still
+# running once the consensus can no longer change. JSON output only; not
+# combined with MULTI_SAMPLE
+STREAM_RESPONSES = False
+STREAM_CONCURRENCY = None
+assert STREAM_CONCURRENCY is None or STREAM_CONCURRENCY > 0, (
+    "STREAM_CONCURRENCY must be positive"
+)
+
+# After consensus, re-ask only the fields that came out "ambiguous" with a
+# reduced schema (REQUERY_ITERATIONS calls, default CONSENSUS_ITERATIONS);
+# decided fields are not asked again
+REQUERY_AMBIGUOUS = False
+REQUERY_ITERATIONS = None
+assert REQUERY_ITERATIONS is None or REQUERY_ITERATIONS > 0, (
+    "REQUERY_ITERATIONS must be positive"
+)
+
+# Keep history entries as compact, shared read-only records (dict-like)
+# instead of one dict per call; cuts resident memory on large runs. Use
+# dict(entry) where a real dict is needed (e.g. JSON)
+COMPACT_HISTORY = False
+
+# Remember decisive consensus results in the domain's database and reuse them
+# in later sessions for the same normalized item, schema fingerprint, task,
+# model and iterations/threshold policy (no LLM calls on a hit). Entries older
+# than CONSENSUS_MEMO_TTL_SECONDS are ignored (None = never expire)
+CONSENSUS_MEMO = False
+CONSENSUS_MEMO_TTL_SECONDS = 7 * 24 * 3600
+assert CONSENSUS_MEMO_TTL_SECONDS is None or CONSENSUS_MEMO_TTL_SECONDS > 0, (
+    "CONSENSUS_MEMO_TTL_SECONDS must be positive or None"
+)
+
+# === RUN DEADLINE ===
+# Wall-clock (seconds) and API-call limits of a run (None = unlimited). Items
+# get fewer iterations as the limit approaches (never fewer than
+# DEADLINE_MIN_ITERATIONS); then dispatching stops, the session is marked
+# partial and the skipped items are recorded
+RUN_DEADLINE_SECONDS = None
+RUN_MAX_CALLS = None
+DEADLINE_MIN_ITERATIONS = 2
+DEADLINE_SAFETY_FACTOR = 1.2
+assert RUN_DEADLINE_SECONDS is None or RUN_DEADLINE_SECONDS > 0, (
+    "RUN_DEADLINE_SECONDS must be positive or None"
+)
+assert RUN_MAX_CALLS is None or RUN_MAX_CALLS > 0, (
+    "RUN_MAX_CALLS must be positive or None"
+)
+assert DEADLINE_MIN_ITERATIONS > 0, "DEADLINE_MIN_ITERATIONS must be positive"
+assert DEADLINE_SAFETY_FACTOR >= 1.0, "DEADLINE_SAFETY_FACTOR must be at least 1"
+
+# === RESULT SINKS ===
+# Sinks fed each item's result from a background thread (core.sinks), as
+# specs: "jsonl:PATH", "csv:PATH", "sqlite[:DB_PATH]" (default: the run's
+# database) or "progress"
+RESULT_SINKS = []
+
+# === VALIDATION ENGINE ===
+# "guard": every call goes through the full Guardrails pipeline.
+# "fast": flat schemas (bool/int/float/str/Literal fields) are validated
+# directly with pydantic from the raw completion; the Guard is only used
+# when that fails or for nested schemas.
+VALIDATION_ENGINE = "guard"
+assert VALIDATION_ENGINE in ("guard", "fast"), (
+    "VALIDATION_ENGINE must be 'guard' or 'fast'"
+)
+
+# === REASKS ===
+# A guarded answer that fails validation can be re-asked. Every reask is one
+# more provider call behind the same sample; they all count in api_calls and
+# in the response metadata ("provider_calls").
+# NUM_REASKS: re-asks per sample (0 = accept the first answer as it is).
+# FULL_SCHEMA_REASK: re-ask for the whole object (True) or only the failing
+# fields (False); None keeps the Guardrails default (whole object).
+# REASK_MODE: "reask" sends Guardrails' correction prompt (schema, previous
+# answer and errors); "resample" sends the original prompt again, i.e. a
+# fresh sample, which is shorter and reuses a cached prompt prefix.
+# Domain configs can override each setting with an attribute of the same name.
+NUM_REASKS = 1
+FULL_SCHEMA_REASK = None
+REASK_MODE = "reask"
+assert NUM_REASKS >= 0, "NUM_REASKS cannot be negative"
+assert REASK_MODE in ("reask", "resample"), "REASK_MODE must be 'reask' or 'resample'"
+
+# === PROMPT LAYOUT ===
+# "inline": the item is embedded in one user message with the instructions.
+# "prefix": the schema instructions are a byte-identical system message for
+# every call and the item is a trailing user message, so provider prompt
+# caching (or KV reuse in local servers) can skip the shared prefix.
+PROMPT_LAYOUT = "inline"
+assert PROMPT_LAYOUT in ("inline", "prefix"), (
+    "PROMPT_LAYOUT must be 'inline' or 'prefix'"
+)
+
+# === OUTPUT FORMAT ===
+# "json": the model returns a JSON object matching the schema.
+# "compact": flat schemas only; the model returns a positional JSON array
+# (1/0 for booleans, option index for Literal fields) that is decoded back
+# into the full schema dict before consensus. Fewer output tokens per call.
+OUTPUT_FORMAT = "json"
+assert OUTPUT_FORMAT in ("json", "compact"), "OUTPUT_FORMAT must be 'json' or 'compact'"
+
+# === ADAPTIVE SAMPLING ===
+# Instead of CONSENSUS_ITERATIONS calls for every item, start each item with
+# ADAPTIVE_INITIAL_ITERATIONS calls and spend the rest of the call budget on
+# items whose fields have not reached ADAPTIVE_CONFIDENCE (posterior
+# probability that the top answer is the true majority).
+# CONSENSUS_ITERATIONS becomes the per-item cap.
+ADAPTIVE_SAMPLING = False
+ADAPTIVE_INITIAL_ITERATIONS = 2
+ADAPTIVE_CONFIDENCE = 0.9
+assert 0.0 < ADAPTIVE_CONFIDENCE < 1.0, "ADAPTIVE_CONFIDENCE must be between 0 and 1"
+
+# === DEDUPLICATION ===
+# Validate items that normalize to the same key only once and fan the result
+# out to every duplicate. Domains can set ITEM_NORMALIZER to customize keys.
+DEDUPLICATE_ITEMS = False
+
 # === ADAPTER CONFIGURATION ===
 # Default adapter to use: "groq", "gpt", "gemini", or "mock"
 DEFAULT_ADAPTER_TYPE = "groq"
 
+# Adapter registry: name -> "module:ClassName"
+# Adapter modules are only imported when selected, so startup stays cheap
+# for runs (and --help) that never touch a given provider.
+ADAPTER_REGISTRY = {
+    "groq": "model_adapters.groq_adapter:GroqAdapter",
+    "gpt": "model_adapters.gpt_adapter:GPTAdapter",
+    "gemini": "model_adapters.gemini_adapter:GeminiAdapter",
+    "mock": "model_adapters.mock_adapter:MockAdapter",
+    # Needs REPLAY_SESSION_ID and REPLAY_DB_PATH (see ReplayAdapter)
+    "replay": "model_adapters.replay_adapter:ReplayAdapter",
+}
+
+# === FAILOVER ===
+# With failover on, each call tries the selected adapter, then its chain in
+# order. A per-adapter circuit breaker opens when CIRCUIT_FAILURE_RATE of the
+# last CIRCUIT_WINDOW calls failed or took longer than CIRCUIT_SLOW_CALL_SECONDS,
+# so calls skip that provider for CIRCUIT_OPEN_SECONDS instead of timing out.
+FAILOVER_ENABLED = False
+FAILOVER_CHAINS = {
+    "groq": ["gemini", "gpt"],
+    "gemini": ["gpt", "groq"],
+    "gpt": ["groq", "gemini"],
+}
+CIRCUIT_FAILURE_RATE = 0.5
+CIRCUIT_WINDOW = 20
+CIRCUIT_MIN_CALLS = 5
+CIRCUIT_SLOW_CALL_SECONDS = 10.0
+CIRCUIT_OPEN_SECONDS = 30.0
+assert 0.0 < CIRCUIT_FAILURE_RATE <= 1.0, "CIRCUIT_FAILURE_RATE must be between 0 and 1"
+assert 0 < CIRCUIT_MIN_CALLS <= CIRCUIT_WINDOW, (
+    "CIRCUIT_MIN_CALLS must be between 1 and CIRCUIT_WINDOW"
+)
+
+# === DOMAIN CONFIGURATION ===
+# Registered domain configs: name -> module path
+# Names can be passed to --domain, and their schemas are used to pre-warm
+# the shared Guard cache (core.guard_cache.warm_guard_cache)
+DOMAIN_REGISTRY = {
+    "superhero": "examples.domains.superhero_config",
+    "product_review": "examples.domains.product_review_config",
+}
+
+# === SERVICE CONFIGURATION ===
+# `main.py serve`: requests arriving within SERVICE_BATCH_WINDOW_MS are
+# micro-batched per domain (up to SERVICE_MAX_BATCH items); SERVICE_WORKERS
+# items are verified concurrently. Each domain logs to one session per
+# SERVICE_SESSION_SECONDS (0: one session for the server's lifetime). A
+# request still waiting after SERVICE_REQUEST_TIMEOUT_SECONDS gets a 504
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+SERVICE_BATCH_WINDOW_MS = 5
+SERVICE_MAX_BATCH = 32
+SERVICE_WORKERS = 8
+SERVICE_SESSION_SECONDS = 3600
+SERVICE_REQUEST_TIMEOUT_SECONDS = 120
+assert SERVICE_BATCH_WINDOW_MS >= 0, "SERVICE_BATCH_WINDOW_MS cannot be negative"
+assert SERVICE_MAX_BATCH > 0, "SERVICE_MAX_BATCH must be positive"
+assert SERVICE_WORKERS > 0, "SERVICE_WORKERS must be positive"
+assert SERVICE_SESSION_SECONDS >= 0, "SERVICE_SESSION_SECONDS cannot be negative"
+assert SERVICE_REQUEST_TIMEOUT_SECONDS > 0, (
+    "SERVICE_REQUEST_TIMEOUT_SECONDS must be positive"
+)
+
+# === SCHEDULER CONFIGURATION ===
+# Several `--domain` values share one worker pool, rate limiter and DB
+# writer. Higher priorities go first; within a priority, items are
+# interleaved by weight (weighted fair queuing). Domain configs may set
+# SCHEDULE_PRIORITY / SCHEDULE_WEIGHT; `--domain name:weight=W,priority=P`
+# overrides them.
+SCHEDULER_WORKERS = 4
+SCHEDULER_RATE_LIMIT = None  # Provider calls per second (None = unlimited)
+SCHEDULER_DEFAULT_PRIORITY = 0
+SCHEDULER_DEFAULT_WEIGHT = 1.0
+assert SCHEDULER_WORKERS > 0, "SCHEDULER_WORKERS must be positive"
+assert SCHEDULER_RATE_LIMIT is None or SCHEDULER_RATE_LIMIT > 0, (
+    "SCHEDULER_RATE_LIMIT must be positive or None"
+)
+assert SCHEDULER_DEFAULT_WEIGHT > 0, "SCHEDULER_DEFAULT_WEIGHT must be positive"
+
+# === PROFILING ===
+# Profile runs (cProfile, tracemalloc, per-phase timings); artifacts are
+# written to DATA_DIR as <session_id>.profile.prof / .json. Off = no overhead.
+PROFILE_RUNS = False
+
 # === DATABASE CONFIGURATION ===
 # Directory for storing validation databases
 DATA_DIR = "data"
@@ -46,27 +247,101 @@ os.makedirs(DATA_DIR, exist_ok=True)
 # --- ADAPTER FACTORY ---
 
 
+def register_adapter(adapter_type: str, target):
+    """
+    Register an adapter under a name.
+
+    Args:
+        adapter_type: Name used to select the adapter (case-insensitive)
+        target: Adapter class, or a "module:ClassName" string imported on first use
+    """
+    assert adapter_type, "adapter_type cannot be empty"
+    ADAPTER_REGISTRY[adapter_type.lower()] = target
+
+
+def get_adapter_class(adapter_type: str):
+    """Resolve an adapter class from the registry, importing it on demand."""
+    target = ADAPTER_REGISTRY.get(adapter_type.lower())
+    if not target:
+        raise ValueError(f"Unknown adapter type: {adapter_type}")
+
+    if isinstance(target, str):
+        module_path, _, class_name = target.partition(":")
+        target = getattr(importlib.import_module(module_path), class_name)
+        # Cache the resolved class so later lookups skip the import machinery
+        ADAPTER_REGISTRY[adapter_type.lower()] = target
+
+    return target
+
+
 def get_selected_adapter(adapter_type: str | None = None):
     """Returns the adapter instance based on type."""
     adapter_type = adapter_type or DEFAULT_ADAPTER_TYPE
 
-    adapters = {
-        "groq": GroqAdapter,
-        "gpt": GPTAdapter,
-        "gemini": GeminiAdapter,
-        "mock": MockAdapter,
-    }
-
-    adapter_class = adapters.get(adapter_type.lower())
-    if not adapter_class:
-        raise ValueError(f"Unknown adapter type: {adapter_type}")
+    adapter_class = get_adapter_class(adapter_type)
 
     try:
         return adapter_class()
     except Exception as e:
         print(f"Initialization Error for {adapter_type}: {e}")
         print("Falling back to MockAdapter for demonstration.")
-        return MockAdapter()
+        return get_adapter_class("mock")()
+
+
+def get_failover_adapter(adapter_type: str | None = None):
+    """
+    Adapter for `adapter_type` wrapped with its failover chain and circuit breakers.
+
+    Chain members that can't be initialized (e.g. missing API key) are left
+    out; with no usable adapter this falls back to MockAdapter.
+    """
+    from core.circuit_breaker import FailoverAdapter, get_breaker
+
+    adapter_type = (adapter_type or DEFAULT_ADAPTER_TYPE).lower()
+    chain = []
+    for name in [adapter_type, *FAILOVER_CHAINS.get(adapter_type, [])]:
+        try:
+            chain.append((name, get_adapter_class(name)()))
+        except Exception as e:
+            print(f"Failover: skipping {name} ({e})")
+
+    if not chain:
+        print("Falling back to MockAdapter for demonstration.")
+        return get_adapter_class("mock")()
+
+    breakers = {
+        name: get_breaker(
+            name,
+            failure_rate=CIRCUIT_FAILURE_RATE,
+            window=CIRCUIT_WINDOW,
+            min_calls=CIRCUIT_MIN_CALLS,
+            slow_call_seconds=CIRCUIT_SLOW_CALL_SECONDS,
+            open_seconds=CIRCUIT_OPEN_SECONDS,
+        )
+        for name, _ in chain
+    }
+    return FailoverAdapter(chain, breakers)
+
+
+def load_domain_config(domain: str):
+    """
+    Import a domain config by registered name or module path.
+
+    Raises:
+        ImportError: If the module cannot be imported
+        ValueError: If required attributes are missing
+    """
+    domain_path = DOMAIN_REGISTRY.get(domain, domain)
+    domain_config = importlib.import_module(domain_path)
+
+    required_attrs = ["VALIDATION_TASK", "ITEMS_TO_VALIDATE", "VALIDATION_SCHEMA"]
+    missing = [attr for attr in required_attrs if not hasattr(domain_config, attr)]
+    if missing:
+        raise ValueError(
+            f"Domain config missing required attributes: {', '.join(missing)}"
+        )
+
+    return domain_config
 
 
 def get_db_path(domain_config):
@@ -87,3 +362,18 @@ def get_db_path(domain_config):
         db_path = os.path.join(DATA_DIR, db_filename)
 
     return db_path
+
+
+def get_reask_policy(domain_config) -> dict:
+    """
+    Reask options for a domain's verifiers.
+    Uses the domain's NUM_REASKS, FULL_SCHEMA_REASK and REASK_MODE if
+    specified, otherwise the defaults.
+    """
+    return {
+        "num_reasks": getattr(domain_config, "NUM_REASKS", NUM_REASKS),
+        "full_schema_reask": getattr(
+            domain_config, "FULL_SCHEMA_REASK", FULL_SCHEMA_REASK
+        ),
+        "reask_mode": getattr(domain_config, "REASK_MODE", REASK_MODE),
+    }
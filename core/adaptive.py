@@ -0,0 +1,127 @@
+"""
+Adaptive call allocation for consensus verification.
+
+Instead of a fixed number of calls per item, every item starts with a few
+calls and the rest of a global budget goes to the items that are still
+uncertain. Certainty of a field is the Beta posterior probability that its
+most common value is the true majority answer (uniform prior):
+
+    P(p > 0.5 | k of n votes) with p ~ Beta(k + 1, n - k + 1)
+
+An item is settled once every field reaches the confidence target.
+"""
+
+import heapq
+from math import comb
+
+
+def majority_confidence(top_votes: int, total_votes: int) -> float:
+    """
+    Posterior probability that the top value holds a majority (share > 0.5).
+
+    For integer Beta parameters this is a binomial tail, computed exactly:
+    P(p > 0.5) = sum_{j < k + 1} C(n + 1, j) / 2^(n + 1)
+    """
+    assert 0 <= top_votes <= total_votes, "top_votes must be within total_votes"
+    trials = total_votes + 1
+    return sum(comb(trials, j) for j in range(top_votes + 1)) / 2**trials
+
+
+def history_confidence(history: list, field_names: list) -> float:
+    """Confidence of the least certain field (0.0 if there are no valid responses)."""
+    valid_history = [res for res in history if "error" not in res]
+    if not valid_history:
+        return 0.0
+
+    confidences = []
+    for key in field_names:
+        counts = {}
+        for res in valid_history:
+            if key in res:
+                counts[res[key]] = counts.get(res[key], 0) + 1
+        if counts:
+            total = sum(counts.values())
+            confidences.append(majority_confidence(max(counts.values()), total))
+    return min(confidences, default=0.0)
+
+
+class AdaptiveSampler:
+    def __init__(
+        self,
+        verifier,
+        call_budget: int | None = None,
+        confidence: float = 0.9,
+        initial_iterations: int = 2,
+        max_iterations: int | None = None,
+    ):
+        """
+        Allocate calls across items for a ConsensusVerifier.
+
+        Args:
+            verifier: ConsensusVerifier used for sampling and consensus
+            call_budget: Total calls across all items (default: items * max_iterations)
+            confidence: Stop sampling an item once every field reaches this confidence
+            initial_iterations: Calls every item gets before allocation starts
+            max_iterations: Cap per item (default: the verifier's iterations)
+        """
+        assert 0.0 < confidence < 1.0, "confidence must be between 0 and 1"
+        assert initial_iterations > 0, "initial_iterations must be at least 1"
+        self.verifier = verifier
+        self.call_budget = call_budget
+        self.confidence = confidence
+        self.max_iterations = max_iterations or verifier.iterations
+        self.initial_iterations = min(initial_iterations, self.max_iterations)
+        assert call_budget is None or call_budget >= 0, "call_budget cannot be negative"
+        self.field_names = list(verifier.schema.model_fields.keys())
+        self.calls_made = 0
+
+    def run(self, items: list) -> list:
+        """Sample all items within the budget; returns verify()-style dicts in order."""
+        budget = self.call_budget
+        if budget is None:
+            budget = len(items) * self.max_iterations
+
+        histories = [[] for _ in items]
+
+        # Initial round, breadth-first so a tight budget still covers every item
+        for _ in range(self.initial_iterations):
+            for index in range(len(items)):
+                if self.calls_made >= budget:
+                    break
+                self._sample(items, histories, index)
+
+        # Allocate the rest to the least certain items first
+        heap = []
+        for index in range(len(items)):
+            self._push(heap, histories, index)
+
+        while heap and self.calls_made < budget:
+            _, _, index = heapq.heappop(heap)
+            self._sample(items, histories, index)
+            self._push(heap, histories, index)
+
+        return [
+            {
+                "consensus": self.verifier._calculate_consensus(
+                    history, self.verifier.threshold_for(len(history))
+                ),
+                "history": history,
+                "iterations": len(history),
+            }
+            for history in histories
+        ]
+
+    def _sample(self, items, histories, index):
+        history = histories[index]
+        history.append(self.verifier._sample(items[index], len(history) + 1))
+        self.calls_made += 1
+
+    def _push(self, heap, histories, index):
+        """Queue an item for more calls unless it is settled or capped."""
+        history = histories[index]
+        if len(history) >= self.max_iterations:
+            return
+        certainty = history_confidence(history, self.field_names)
+        if certainty < self.confidence:
+            # Ties go to the item with fewer calls, then input order
+            heapq.heappush(heap, (certainty, len(history), index))
@@ -0,0 +1,188 @@
+"""
+Vectorized consensus over many items at once.
+
+Votes are integer-coded into an (items x iterations x fields) NumPy array so
+a whole session can be re-scored (e.g. under a new threshold) without a
+per-item Python loop. Results match ConsensusVerifier._calculate_consensus
+exactly, including tie-breaking, "ambiguous" and error handling.
+
+Requires NumPy (optional dependency: `pip install guardrails-validator[analysis]`).
+"""
+
+from typing import Any
+
+# Code for "no vote" (error iteration, missing field, or padding)
+MISSING = -1
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(
+            "Batch consensus requires NumPy. Install it with: pip install numpy"
+        ) from e
+    return np
+
+
+class EncodedVotes:
+    def __init__(
+        self,
+        codes,
+        vocabularies: list[list[Any]],
+        field_names: list[str],
+        has_valid: list[bool],
+    ):
+        """
+        Integer-coded votes for a batch of items.
+
+        Args:
+            codes: int array of shape (items, iterations, fields); MISSING for no vote
+            vocabularies: Per field, the decoded value for each code
+            field_names: Field name for each position on the last axis
+            has_valid: Per item, whether any non-error response exists
+        """
+        self.codes = codes
+        self.vocabularies = vocabularies
+        self.field_names = field_names
+        self.has_valid = has_valid
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+
+def encode_votes(histories: list[list[dict]], field_names: list[str]) -> EncodedVotes:
+    """
+    Encode per-item histories into an integer vote array.
+
+    Codes are assigned per field in order of first appearance. Values are
+    matched with dict semantics, the same as collections.Counter. Error
+    entries and missing fields become MISSING. Ragged histories are padded.
+    """
+    np = _require_numpy()
+
+    n_items = len(histories)
+    n_fields = len(field_names)
+    n_iterations = max((len(history) for history in histories), default=0)
+    missing_row = [MISSING] * n_fields
+
+    lookups: list[dict] = [{} for _ in field_names]
+    vocabularies: list[list[Any]] = [[] for _ in field_names]
+    has_valid = [False] * n_items
+
+    # Built as a flat list and converted once; per-element array writes are slow
+    flat = []
+    for i, history in enumerate(histories):
+        for res in history:
+            if "error" in res:
+                flat.extend(missing_row)
+                continue
+            has_valid[i] = True
+            for f, key in enumerate(field_names):
+                if key not in res:
+                    flat.append(MISSING)
+                    continue
+                value = res[key]
+                lookup = lookups[f]
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(vocabularies[f])
+                    vocabularies[f].append(value)
+                flat.append(code)
+        # Pad ragged histories
+        flat.extend(missing_row * (n_iterations - len(history)))
+
+    codes = np.array(flat, dtype=np.int32).reshape(n_items, n_iterations, n_fields)
+
+    return EncodedVotes(codes, vocabularies, list(field_names), has_valid)
+
+
+def batch_consensus(
+    histories: list[list[dict]], field_names: list[str], threshold: int
+) -> list[dict]:
+    """
+    Compute consensus for many items at once.
+
+    Args:
+        histories: One list of response dicts per item (as in verify()["history"])
+        field_names: Schema field names to vote on
+        threshold: Absolute number of matching votes required
+
+    Returns:
+        One consensus dict per item, identical to ConsensusVerifier._calculate_consensus
+    """
+    encoded = encode_votes(histories, field_names)
+    verdicts = score_votes(encoded, threshold)
+    return decode_verdicts(encoded, *verdicts)
+
+
+def score_votes(encoded: EncodedVotes, threshold: int):
+    """
+    Compute mode, vote count and threshold verdict for every item/field.
+
+    Returns:
+        (mode_codes, mode_counts, decided) arrays of shape (items, fields).
+        mode_codes is MISSING where a field received no votes.
+    """
+    np = _require_numpy()
+
+    codes = encoded.codes
+    n_items, n_iterations, n_fields = codes.shape
+    mode_codes = np.full((n_items, n_fields), MISSING, dtype=np.int64)
+    mode_counts = np.zeros((n_items, n_fields), dtype=np.int64)
+
+    # One field at a time, over its actual votes only: memory grows with the
+    # votes cast, not with items x the largest vocabulary of any field
+    for f, vocabulary in enumerate(encoded.vocabularies):
+        field_codes = codes[:, :, f]
+        item_idx, step_idx = np.nonzero(field_codes != MISSING)
+        if item_idx.size == 0:
+            continue
+
+        # One entry per distinct (item, code) vote, with its count and the
+        # earliest iteration that cast it
+        keys = item_idx * len(vocabulary) + field_codes[item_idx, step_idx]
+        votes, inverse, counts = np.unique(
+            keys, return_inverse=True, return_counts=True
+        )
+        first = np.full(votes.size, n_iterations, dtype=np.int64)
+        np.minimum.at(first, inverse, step_idx)
+
+        # Per item, the most votes wins. Counter.most_common breaks ties by
+        # first appearance, so the earliest-seen code wins among the maxima.
+        vote_items = votes // len(vocabulary)
+        order = np.lexsort((first, -counts, vote_items))
+        leaders = order[np.r_[True, vote_items[order][1:] != vote_items[order][:-1]]]
+        mode_codes[vote_items[leaders], f] = votes[leaders] % len(vocabulary)
+        mode_counts[vote_items[leaders], f] = counts[leaders]
+
+    decided = (mode_counts > 0) & (mode_counts >= threshold)
+    return mode_codes, mode_counts, decided
+
+
+def decode_verdicts(
+    encoded: EncodedVotes, mode_codes, mode_counts, decided
+) -> list[dict]:
+    """Turn scored arrays back into per-item consensus dicts."""
+    mode_codes = mode_codes.tolist()
+    mode_counts = mode_counts.tolist()
+    decided = decided.tolist()
+
+    results = []
+    for i, item_has_valid in enumerate(encoded.has_valid):
+        if not item_has_valid:
+            results.append({"error": "No valid responses"})
+            continue
+
+        final_result = {}
+        for f, key in enumerate(encoded.field_names):
+            if mode_counts[i][f] == 0:
+                final_result[key] = None
+            elif decided[i][f]:
+                final_result[key] = encoded.vocabularies[f][mode_codes[i][f]]
+            else:
+                final_result[key] = "ambiguous"
+        results.append(final_result)
+
+    return results
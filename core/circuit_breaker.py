@@ -0,0 +1,284 @@
+"""
+Circuit breakers and per-call failover between adapters.
+
+Each adapter has a breaker tracking its recent calls. Errors and slow calls
+count as failures; once their share of the rolling window crosses the
+threshold the circuit opens and calls skip that adapter immediately instead
+of waiting for it to time out. After a cool-down one trial call is let
+through (half-open): success closes the circuit, failure opens it again.
+
+FailoverAdapter tries an ordered chain of adapters per call, skipping open
+circuits, and reports every hop as a failover event (an open circuit once
+per opening, not on every skipped call).
+"""
+
+import threading
+import time
+from collections import deque
+from llm_adapters import LLMAdapter
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        slow_call_seconds: float | None = 10.0,
+        open_seconds: float = 30.0,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            failure_rate: Share of failed (or slow) calls in the window that opens the circuit
+            window: Number of recent calls considered
+            min_calls: Calls needed in the window before the circuit can open
+            slow_call_seconds: Successful calls slower than this count as failures (None: off)
+            open_seconds: Cool-down before a trial call is allowed
+            clock: Monotonic time source (for tests)
+        """
+        assert 0.0 < failure_rate <= 1.0, "failure_rate must be between 0 and 1"
+        assert window > 0, "window must be positive"
+        assert 0 < min_calls <= window, "min_calls must be between 1 and window"
+        assert open_seconds >= 0, "open_seconds cannot be negative"
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._outcomes = deque(maxlen=window)  # True = failed or slow
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        # Times the circuit has opened; tells a fresh opening from a known one
+        self.openings = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> bool:
+        """Whether a call may go to this adapter now."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record(self, success: bool, latency: float = 0.0):
+        """Record the outcome of an allowed call."""
+        slow = self.slow_call_seconds is not None and latency > self.slow_call_seconds
+        failed = not success or slow
+        with self._lock:
+            if self._current_state() == HALF_OPEN:
+                self._trial_in_flight = False
+                if failed:
+                    self._open()
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append(failed)
+            if len(self._outcomes) >= self.min_calls:
+                rate = sum(self._outcomes) / len(self._outcomes)
+                if rate >= self.failure_rate:
+                    self._open()
+
+    def release(self):
+        """Give back an allowed call that ended without an outcome (interrupted)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _open(self):
+        self._state = OPEN
+        self.openings += 1
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+
+# Breakers are shared per adapter name, so every run in a process sees the
+# same provider health
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(adapter_name: str, **options) -> CircuitBreaker:
+    """Shared breaker for an adapter name (options only apply on creation)."""
+    with _breakers_lock:
+        breaker = _breakers.get(adapter_name)
+        if breaker is None:
+            breaker = _breakers[adapter_name] = CircuitBreaker(**options)
+        return breaker
+
+
+def reset_breakers():
+    """Forget all breaker state."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+class AllAdaptersUnavailable(RuntimeError):
+    """Every adapter in a failover chain failed or had an open circuit."""
+
+
+class FailoverAdapter(LLMAdapter):
+    def __init__(self, chain: list, breakers: dict | None = None, on_event=None):
+        """
+        Adapter that tries an ordered chain of adapters per call.
+
+        Args:
+            chain: List of (name, adapter), primary first
+            breakers: name -> CircuitBreaker (default: shared get_breaker(name))
+            on_event: Function(event dict) called for every failover hop
+        """
+        assert chain, "chain cannot be empty"
+        self.chain = chain
+        self.breakers = breakers or {name: get_breaker(name) for name, _ in chain}
+        self.on_event = on_event
+        primary = chain[0][1]
+        self.supports_n = getattr(primary, "supports_n", False)
+        self.model_name = getattr(primary, "model_name", None) or (
+            primary.get_params().get("model", "unknown")
+        )
+        # Name of the adapter that served the latest call
+        self.last_adapter = None
+        # name -> breaker openings already reported as circuit_open
+        self._reported_openings = {}
+        self._events_lock = threading.Lock()
+
+    def get_params(self) -> dict:
+        # Guard calls route through __call__, so failover applies to them too
+        return {"llm_api": self}
+
+    def __call__(
+        self, prompt: str | None = None, messages: list | None = None, **kwargs
+    ) -> str:
+        messages = messages or [{"role": "user", "content": prompt or ""}]
+        return self.complete(messages)[0]
+
+    def complete(self, messages: list, n: int = 1) -> list:
+        """Completion from the first available adapter of the chain."""
+        last_error = None
+        for position, (name, adapter) in enumerate(self.chain):
+            next_name = (
+                self.chain[position + 1][0] if position + 1 < len(self.chain) else None
+            )
+            breaker = self.breakers[name]
+            if not breaker.allow():
+                self._skip_open(name, next_name, breaker)
+                continue
+
+            start = time.monotonic()
+            outcome = None
+            try:
+                choices = adapter.complete(messages, n=n)
+                outcome = True
+            except Exception as e:
+                outcome = False
+                last_error = e
+            finally:
+                # None: interrupted (e.g. KeyboardInterrupt), free a half-open trial
+                if outcome is None:
+                    breaker.release()
+                else:
+                    breaker.record(outcome, time.monotonic() - start)
+            if not outcome:
+                self._emit(name, next_name, "error", str(last_error))
+                continue
+
+            self.last_usage = getattr(adapter, "last_usage", None)
+            self.last_adapter = name
+            return choices
+
+        raise AllAdaptersUnavailable(
+            f"No adapter available in chain {[name for name, _ in self.chain]}"
+            + (f": {last_error}" if last_error else "")
+        )
+
+    def stream(self, messages: list):
+        """
+        Streamed completion from the first available adapter of the chain.
+        Failover happens until an adapter delivers its first chunk; a later
+        error is raised to the caller and still counts against the breaker.
+        The outcome is recorded once the stream ends, with the latency of
+        the first chunk.
+        """
+        last_error = None
+        for position, (name, adapter) in enumerate(self.chain):
+            next_name = (
+                self.chain[position + 1][0] if position + 1 < len(self.chain) else None
+            )
+            breaker = self.breakers[name]
+            if not breaker.allow():
+                self._skip_open(name, next_name, breaker)
+                continue
+
+            start = time.monotonic()
+            chunks = adapter.stream(messages)
+            latency = None
+            outcome = None
+            try:
+                first = next(chunks, None)
+                latency = time.monotonic() - start
+                self.last_adapter = name
+                if first is not None:
+                    yield first
+                yield from chunks
+                outcome = True
+            except Exception as e:
+                outcome = False
+                if latency is not None:
+                    # Chunks were already delivered: too late to fail over
+                    raise
+                last_error = e
+            finally:
+                chunks.close()
+                # None: closed early or interrupted, free a half-open trial
+                if outcome is None:
+                    breaker.release()
+                else:
+                    elapsed = time.monotonic() - start
+                    breaker.record(outcome, elapsed if latency is None else latency)
+            if outcome:
+                return
+            self._emit(name, next_name, "error", str(last_error))
+
+        raise AllAdaptersUnavailable(
+            f"No adapter available in chain {[name for name, _ in self.chain]}"
+            + (f": {last_error}" if last_error else "")
+        )
+
+    def _skip_open(self, name, next_name, breaker):
+        # Report each opening of a circuit once, not every call it skips
+        with self._events_lock:
+            fresh = self._reported_openings.get(name) != breaker.openings
+            self._reported_openings[name] = breaker.openings
+        if fresh:
+            self._emit(name, next_name, "circuit_open")
+
+    def _emit(self, from_adapter, to_adapter, reason, error_message=None):
+        if self.on_event:
+            self.on_event(
+                {
+                    "from_adapter": from_adapter,
+                    "to_adapter": to_adapter,
+                    "reason": reason,
+                    "error_message": error_message,
+                }
+            )
@@ -0,0 +1,157 @@
+"""
+Compact positional output encoding.
+
+Instead of a JSON object that repeats every field name, the model answers
+with a JSON array holding one value per field in schema order. Booleans are
+1/0 and Literal fields are the index of their option:
+
+    {"can_fly": true, "has_super_strength": true, "gender": "male"}  ->  [1, 1, 0]
+
+The codec is derived from a flat schema and decodes answers back into the
+full field dict before validation and consensus. compact_answer does the
+reverse from the prompt alone, for adapters that replay or fake JSON answers.
+"""
+
+import json
+import re
+import weakref
+from typing import Literal, Type, get_args, get_origin
+from pydantic import BaseModel
+from core.fast_path import is_flat_schema
+
+OUTPUT_FORMATS = ("json", "compact")
+
+# Compact output instructions start with COMPACT_MARKER, followed by one
+# "  <position>. <field>: <code> = <value>, ..." line per field
+COMPACT_MARKER = "Return ONLY a JSON array"
+_COMPACT_FIELD = re.compile(r"^\s+\d+\. (\w+): (.+)$", re.MULTILINE)
+_COMPACT_CODE = re.compile(r"(\d+) = ([^,]+)")
+
+# Weak keys, like core.schema_utils; codecs keep no reference to their schema
+_codecs = weakref.WeakKeyDictionary()
+
+
+class CompactCodec:
+    def __init__(self, schema: Type[BaseModel]):
+        """
+        Positional codec for a flat schema (see core.fast_path.is_flat_schema).
+
+        Args:
+            schema: Pydantic model class whose fields define the array positions
+        """
+        assert is_flat_schema(schema), f"{schema.__name__} is not a flat schema"
+        self.field_names = list(schema.model_fields.keys())
+        self.annotations = {
+            name: info.annotation for name, info in schema.model_fields.items()
+        }
+        # field -> tuple of Literal options (codes are their indices), None otherwise
+        self.options = {}
+        for name, info in schema.model_fields.items():
+            annotation = info.annotation
+            is_literal = get_origin(annotation) is Literal
+            self.options[name] = get_args(annotation) if is_literal else None
+
+    def instructions(self) -> str:
+        """Prompt text describing the array layout and codes."""
+        lines = [f"{COMPACT_MARKER} with one value per attribute, in this order:"]
+        for position, name in enumerate(self.field_names, start=1):
+            lines.append(f"  {position}. {name}: {self._codes_text(name)}")
+        lines.append(f"Example: {self.encode(self._example())}")
+        return "\n".join(lines)
+
+    def encode(self, data: dict) -> str:
+        """Compact array text for a full field dict."""
+        values = []
+        for name in self.field_names:
+            value = data[name]
+            options = self.options[name]
+            if options is not None:
+                value = options.index(value)
+            elif isinstance(value, bool):
+                value = int(value)
+            values.append(value)
+        return json.dumps(values)
+
+    def decode(self, text: str) -> dict:
+        """
+        Full field dict from a compact answer (not yet schema-validated).
+
+        Raises:
+            ValueError: No array found, wrong length or an unknown code
+        """
+        start = text.find("[")
+        end = text.rfind("]")
+        if start == -1 or end < start:
+            raise ValueError("No JSON array in LLM output")
+        values = json.loads(text[start : end + 1])
+        if not isinstance(values, list) or len(values) != len(self.field_names):
+            raise ValueError(f"Expected {len(self.field_names)} values, got {values!r}")
+
+        data = {}
+        for name, value in zip(self.field_names, values):
+            options = self.options[name]
+            if options is not None:
+                if not isinstance(value, int) or not 0 <= value < len(options):
+                    raise ValueError(f"Invalid code {value!r} for {name}")
+                value = options[value]
+            elif self.annotations[name] is bool and value in (0, 1):
+                value = bool(value)
+            data[name] = value
+        return data
+
+    def _codes_text(self, name: str) -> str:
+        options = self.options[name]
+        annotation = self.annotations[name]
+        if options is not None:
+            return ", ".join(
+                f"{code} = {option}" for code, option in enumerate(options)
+            )
+        if annotation is bool:
+            return "1 = true, 0 = false"
+        return annotation.__name__
+
+    def _example(self) -> dict:
+        defaults = {bool: True, int: 0, float: 0.0, str: "text"}
+        return {
+            name: (
+                self.options[name][0]
+                if self.options[name] is not None
+                else defaults[self.annotations[name]]
+            )
+            for name in self.field_names
+        }
+
+
+def get_codec(schema: Type[BaseModel]) -> CompactCodec:
+    """Shared codec per schema."""
+    codec = _codecs.get(schema)
+    if codec is None:
+        codec = _codecs[schema] = CompactCodec(schema)
+    return codec
+
+
+def compact_answer(response: str, prompt: str) -> str:
+    """
+    Re-encode a JSON answer as the positional array the prompt asks for.
+
+    Raises:
+        ValueError: A coded field (bool or Literal) holds a value the prompt
+            has no code for
+    """
+    data = json.loads(response)
+    values = []
+    for field, codes_text in _COMPACT_FIELD.findall(prompt):
+        codes = {
+            value.strip(): int(code)
+            for code, value in _COMPACT_CODE.findall(codes_text)
+        }
+        value = data.get(field)
+        if not codes:
+            # int, float and str fields are sent as they are
+            values.append(value)
+            continue
+        key = str(value).lower() if isinstance(value, bool) else str(value)
+        if key not in codes:
+            raise ValueError(f"No compact code for {field}={value!r}")
+        values.append(codes[key])
+    return json.dumps(values)
@@ -0,0 +1,161 @@
+"""
+Compact consensus history.
+
+A history entry is normally a dict repeating every field name. With compact
+history each entry is a HistoryRecord: two slots pointing at a layout shared
+by the schema (field names and their positions) and a tuple of values.
+String values are interned. Identical answers (the common case: most calls
+agree) share one record instance, and so do identical errors.
+
+Records are read-only Mappings: `"error" in res`, `res.get(key)`, `res[key]`,
+iteration and `==` against dicts behave as for the original dicts, so
+custom_display callbacks, _calculate_consensus and the batch consensus
+engine consume them unchanged. Use dict(record) where a real dict is needed
+(e.g. JSON).
+"""
+
+import sys
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Type
+from pydantic import BaseModel
+
+# Marks a field the response did not contain (distinct from a None answer)
+MISSING = object()
+
+# Distinct records/errors shared per layout; beyond this new ones are not cached
+SHARED_RECORDS_LIMIT = 4096
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class HistoryLayout:
+    """Field names of a schema, their positions and the shared records."""
+
+    def __init__(self, field_names: tuple):
+        self.field_names = field_names
+        self.index = {name: i for i, name in enumerate(field_names)}
+        self._records = {}
+        self._errors = {}
+
+    def compact(self, res):
+        """
+        Compact one response dict (valid or {"error": ...}).
+
+        Responses with keys outside the schema are returned unchanged.
+        """
+        if isinstance(res, HistoryRecord):
+            return res
+        if "error" in res:
+            if len(res) != 1:
+                return res
+            message = res["error"]
+            record = self._errors.get(message)
+            if record is None:
+                record = HistoryRecord(self, None, _intern(message))
+                if len(self._errors) < SHARED_RECORDS_LIMIT:
+                    self._errors[message] = record
+            return record
+
+        index = self.index
+        if any(key not in index for key in res):
+            return res
+        values = tuple(
+            _intern(res[name]) if name in res else MISSING for name in self.field_names
+        )
+        # Types are part of the key: 1, 1.0 and True are equal but must not
+        # share a record
+        key = (values, tuple(map(type, values)))
+        try:
+            record = self._records.get(key)
+        except TypeError:
+            # Unhashable value (e.g. a list): keep it, just don't share it
+            return HistoryRecord(self, values, None)
+        if record is None:
+            record = HistoryRecord(self, values, None)
+            if len(self._records) < SHARED_RECORDS_LIMIT:
+                self._records[key] = record
+        return record
+
+
+class HistoryRecord(Mapping):
+    """Read-only dict-like view of one response."""
+
+    __slots__ = ("_layout", "_values", "_error")
+
+    def __init__(self, layout: HistoryLayout, values: tuple | None, error):
+        self._layout = layout
+        self._values = values
+        self._error = error
+
+    def __getitem__(self, key):
+        if self._values is None:
+            if key == "error":
+                return self._error
+            raise KeyError(key)
+        position = self._layout.index.get(key)
+        if position is None or self._values[position] is MISSING:
+            raise KeyError(key)
+        return self._values[position]
+
+    def __contains__(self, key) -> bool:
+        if self._values is None:
+            return key == "error"
+        position = self._layout.index.get(key)
+        return position is not None and self._values[position] is not MISSING
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __iter__(self):
+        if self._values is None:
+            yield "error"
+            return
+        for name, value in zip(self._layout.field_names, self._values):
+            if value is not MISSING:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"HistoryRecord({dict(self)!r})"
+
+
+def record_votes(history: list, field_names: list) -> list | None:
+    """
+    Per-field vote lists read straight from the records' value tuples.
+
+    Error records are skipped. Returns None unless the history holds only
+    records of one layout and at least one is valid (the caller then falls
+    back to dict access).
+    """
+    layout = getattr(history[0], "_layout", None) if history else None
+    if layout is None:
+        return None
+    rows = []
+    for res in history:
+        if type(res) is not HistoryRecord or res._layout is not layout:
+            return None
+        if res._values is not None:
+            rows.append(res._values)
+    if not rows:
+        return None
+    columns = list(zip(*rows))
+    return [
+        [value for value in columns[layout.index[key]] if value is not MISSING]
+        if key in layout.index
+        else []
+        for key in field_names
+    ]
+
+
+@lru_cache(maxsize=256)
+def get_layout(schema: Type[BaseModel]) -> HistoryLayout:
+    """
+    Shared layout for a schema. If a layout is evicted, records of the old
+    and new layout mix in a history and record_votes falls back to dict access.
+    """
+    return HistoryLayout(tuple(schema.model_fields))
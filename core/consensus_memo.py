@@ -0,0 +1,51 @@
+"""
+Cross-session consensus memo.
+
+Items that an earlier session resolved decisively (no field "ambiguous",
+no error) are remembered in the logger database, keyed by:
+
+    (normalized item, schema fingerprint, validation task, model,
+     iterations/threshold policy)
+
+A later verify() with the same key and an entry younger than the TTL
+returns the stored consensus without calling the LLM. The schema
+fingerprint is structural, so editing a field (name, type, description)
+changes the key and old entries are simply never hit again.
+"""
+
+import hashlib
+import json
+from typing import Type
+from pydantic import BaseModel
+from core.dedup import normalize_item
+from core.schema_utils import schema_fingerprint
+
+
+def consensus_policy(iterations: int, threshold: int) -> str:
+    return f"{threshold}/{iterations}"
+
+
+def memo_key(
+    item: str,
+    schema: Type[BaseModel],
+    validation_task: str,
+    model_name: str | None,
+    policy: str,
+    normalizer=None,
+) -> str:
+    """Stable key of a consensus memo entry."""
+    parts = [
+        (normalizer or normalize_item)(item),
+        schema_fingerprint(schema),
+        validation_task,
+        model_name or "",
+        policy,
+    ]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+def is_decisive(consensus: dict) -> bool:
+    """Whether a consensus is worth remembering: every field decided."""
+    return "error" not in consensus and all(
+        value != "ambiguous" for value in consensus.values()
+    )
@@ -1,11 +1,52 @@
+import os
+import gzip
+import shutil
 import sqlite3
+import uuid
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from contextlib import contextmanager
 
+import config
+
+# Per item/field vote counts ranked so rank 1 is the consensus candidate.
+# Ties break by earliest iteration, matching Counter.most_common in the verifier.
+_RANKED_VOTES_SQL = """
+    WITH votes AS (
+        SELECT item_name, field_name, field_value,
+               COUNT(*) AS votes, MIN(iteration_number) AS first_seen
+        FROM validation_responses
+        WHERE session_id = ? AND is_error = 0
+        GROUP BY item_name, field_name, field_value
+    ),
+    ranked AS (
+        SELECT item_name, field_name, field_value, votes,
+               SUM(votes) OVER (PARTITION BY item_name, field_name) AS total_votes,
+               ROW_NUMBER() OVER (
+                   PARTITION BY item_name, field_name
+                   ORDER BY votes DESC, first_seen ASC
+               ) AS vote_rank
+        FROM votes
+    )
+"""
+
+# One row per API call (item/iteration); error calls log a single row
+_CALLS_SQL = """
+    WITH calls AS (
+        SELECT item_name, iteration_number, model_name, adapter_type,
+               MAX(is_error) AS is_error
+        FROM validation_responses
+        WHERE session_id = ?
+        GROUP BY item_name, iteration_number
+    )
+"""
+
 
 class ValidationLogger:
+    # Run ANALYZE after retention deletes at least this many response rows
+    ANALYZE_AFTER_ROWS = 10_000
+
     def __init__(self, db_path: str):
         self.db_path = db_path
         self._init_database()
@@ -15,6 +56,9 @@ class ValidationLogger:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            # Lets compact() reclaim space incrementally (only takes effect on new DBs)
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
             # Validation sessions table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS validation_sessions (
@@ -25,10 +69,31 @@ class ValidationLogger:
                     consensus_iterations INTEGER,
                     consensus_threshold INTEGER,
                     validation_task TEXT,
-                    adapter_type TEXT
+                    adapter_type TEXT,
+                    model_name TEXT
                 )
             """)
 
+            # Migrate databases created before model_name was tracked per session
+            if self._ensure_column(cursor, "validation_sessions", "model_name", "TEXT"):
+                cursor.execute("""
+                    UPDATE validation_sessions
+                    SET model_name = (
+                        SELECT r.model_name FROM validation_responses r
+                        WHERE r.session_id = validation_sessions.session_id
+                        LIMIT 1
+                    )
+                """)
+
+            # Runs stopped early by a deadline or call budget
+            self._ensure_column(
+                cursor, "validation_sessions", "partial", "INTEGER NOT NULL DEFAULT 0"
+            )
+            self._ensure_column(cursor, "validation_sessions", "stop_reason", "TEXT")
+
+            # Provider calls of the run, reasks included
+            self._ensure_column(cursor, "validation_sessions", "api_calls", "INTEGER")
+
             # Validation responses table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS validation_responses (
@@ -49,14 +114,134 @@ class ValidationLogger:
                 )
             """)
 
-            # Create index for faster queries
+            # Items collapsed into a canonical item by deduplication
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_session_item 
-                ON validation_responses(session_id, item_name)
+                CREATE TABLE IF NOT EXISTS item_aliases (
+                    session_id TEXT NOT NULL,
+                    item_name TEXT NOT NULL,
+                    canonical_item TEXT NOT NULL,
+                    dedup_key TEXT,
+                    occurrences INTEGER NOT NULL DEFAULT 1,
+                    PRIMARY KEY (session_id, item_name),
+                    FOREIGN KEY (session_id) REFERENCES validation_sessions(session_id)
+                )
+            """)
+
+            # Calls that skipped an adapter (error or open circuit) for the next one
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS failover_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    timestamp DATETIME NOT NULL,
+                    from_adapter TEXT NOT NULL,
+                    to_adapter TEXT,
+                    reason TEXT NOT NULL,
+                    error_message TEXT,
+                    FOREIGN KEY (session_id) REFERENCES validation_sessions(session_id)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_failover_session
+                ON failover_events(session_id)
+            """)
+
+            # Items a partial session never dispatched
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS skipped_items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    item_name TEXT NOT NULL,
+                    reason TEXT NOT NULL,
+                    FOREIGN KEY (session_id) REFERENCES validation_sessions(session_id)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_skipped_session
+                ON skipped_items(session_id)
+            """)
+
+            # Per-item consensus written by the sqlite result sink (core.sinks)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS item_consensus (
+                    session_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    item_name TEXT NOT NULL,
+                    consensus TEXT NOT NULL,
+                    calls INTEGER NOT NULL,
+                    PRIMARY KEY (session_id, position),
+                    FOREIGN KEY (session_id) REFERENCES validation_sessions(session_id)
+                )
+            """)
+
+            # Decisive consensus results reusable across sessions (see core.consensus_memo)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS consensus_memo (
+                    memo_key TEXT PRIMARY KEY,
+                    item_name TEXT NOT NULL,
+                    schema_fingerprint TEXT NOT NULL,
+                    validation_task TEXT NOT NULL,
+                    model_name TEXT,
+                    policy TEXT NOT NULL,
+                    consensus TEXT NOT NULL,
+                    session_id TEXT,
+                    created_at DATETIME NOT NULL
+                )
+            """)
+
+            # validation_responses is the insert-heavy table: every index is
+            # updated on each response row, so only one of them is wide.
+            # idx_response_votes covers the vote queries (per-session consensus
+            # and the per-item votes of the ambiguous-items pages). The narrow
+            # ones serve the cross-session lookups: items per field (ambiguous
+            # pages without a session), responses per item, and by time.
+            for index in (
+                "idx_session_item",
+                "idx_session_votes",
+                "idx_session_calls",
+                "idx_field_votes",
+                "idx_session_responses",
+            ):
+                # Superseded by the indexes below
+                cursor.execute(f"DROP INDEX IF EXISTS {index}")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_response_votes
+                ON validation_responses(session_id, item_name, field_name, is_error,
+                                        field_value, iteration_number)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_field_items
+                ON validation_responses(field_name, is_error, session_id, item_name)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_item_name
+                ON validation_responses(item_name)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_response_time
+                ON validation_responses(timestamp)
+            """)
+
+            # Session lookups by model and by age (small table, rarely written)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_sessions_model_time
+                ON validation_sessions(model_name, started_at, session_id)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_sessions_started
+                ON validation_sessions(started_at)
             """)
 
             conn.commit()
 
+    def _ensure_column(self, cursor, table: str, column: str, definition: str) -> bool:
+        """Add a column to an existing table if missing. Returns True if added."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column in [row[1] for row in cursor.fetchall()]:
+            return False
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return True
+
     @contextmanager
     def _get_connection(self):
         """Context manager for database connections."""
@@ -74,6 +259,7 @@ class ValidationLogger:
         consensus_threshold: int,
         validation_task: str,
         adapter_type: str,
+        model_name: Optional[str] = None,
     ):
         """Log the start of a validation session."""
         assert session_id, "session_id cannot be empty"
@@ -85,8 +271,8 @@ class ValidationLogger:
                 """
                 INSERT INTO validation_sessions 
                 (session_id, started_at, total_items, consensus_iterations, 
-                 consensus_threshold, validation_task, adapter_type)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                 consensus_threshold, validation_task, adapter_type, model_name)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
                 (
                     session_id,
@@ -96,24 +282,132 @@ class ValidationLogger:
                     consensus_threshold,
                     validation_task,
                     adapter_type,
+                    model_name,
                 ),
             )
             conn.commit()
 
-    def complete_session(self, session_id: str):
-        """Mark a session as completed."""
+    def complete_session(
+        self,
+        session_id: str,
+        partial: bool = False,
+        stop_reason: Optional[str] = None,
+        api_calls: Optional[int] = None,
+        total_items: Optional[int] = None,
+    ):
+        """
+        Mark a session as completed.
+
+        Args:
+            session_id: Session to complete
+            partial: The run stopped before dispatching every item
+            stop_reason: Why it stopped (e.g. "deadline", "call_budget")
+            api_calls: Provider calls the session made, reasks included
+            total_items: Final item count, for sessions whose size was not
+                known at the start (None keeps the logged one)
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
                 UPDATE validation_sessions 
-                SET completed_at = ? 
+                SET completed_at = ?, partial = ?, stop_reason = ?, api_calls = ?,
+                    total_items = COALESCE(?, total_items)
                 WHERE session_id = ?
             """,
-                (datetime.now().isoformat(), session_id),
+                (
+                    datetime.now().isoformat(),
+                    int(partial),
+                    stop_reason,
+                    api_calls,
+                    total_items,
+                    session_id,
+                ),
+            )
+            conn.commit()
+
+    def log_skipped_items(self, session_id: str, rows: list):
+        """
+        Record items a partial session did not validate.
+
+        Args:
+            session_id: Session the items belong to
+            rows: (position, item_name, reason) tuples; position is the item's
+                index in ITEMS_TO_VALIDATE
+        """
+        assert session_id, "session_id cannot be empty"
+        if not rows:
+            return
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """
+                INSERT INTO skipped_items (session_id, position, item_name, reason)
+                VALUES (?, ?, ?, ?)
+            """,
+                [(session_id, *row) for row in rows],
+            )
+            conn.commit()
+
+    def log_item_consensus(self, session_id: str, rows: list):
+        """
+        Record per-item consensus results.
+
+        Args:
+            session_id: Session the items belong to
+            rows: (position, item_name, consensus dict, calls) tuples
+        """
+        assert session_id, "session_id cannot be empty"
+        if not rows:
+            return
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """
+                INSERT OR REPLACE INTO item_consensus
+                (session_id, position, item_name, consensus, calls)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                [
+                    (session_id, position, item_name, json.dumps(consensus), calls)
+                    for position, item_name, consensus, calls in rows
+                ],
             )
             conn.commit()
 
+    def get_item_consensus(self, session_id: str):
+        """Per-item consensus of a session in item order: (position, item_name, consensus, calls)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT position, item_name, consensus, calls FROM item_consensus
+                WHERE session_id = ?
+                ORDER BY position
+            """,
+                (session_id,),
+            )
+            return [
+                (position, item_name, json.loads(consensus), calls)
+                for position, item_name, consensus, calls in cursor.fetchall()
+            ]
+
+    def get_skipped_items(self, session_id: str):
+        """Skipped items of a session in item order: (position, item_name, reason)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT position, item_name, reason FROM skipped_items
+                WHERE session_id = ?
+                ORDER BY position
+            """,
+                (session_id,),
+            )
+            return cursor.fetchall()
+
     def log_response(
         self,
         session_id: str,
@@ -190,6 +484,162 @@ class ValidationLogger:
 
             conn.commit()
 
+    def log_item_aliases(self, session_id: str, rows: list):
+        """
+        Record which items were deduplicated into which canonical item.
+
+        Args:
+            session_id: Session the items belong to
+            rows: (item_name, canonical_item, dedup_key, occurrences) tuples
+        """
+        assert session_id, "session_id cannot be empty"
+        if not rows:
+            return
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """
+                INSERT OR REPLACE INTO item_aliases
+                (session_id, item_name, canonical_item, dedup_key, occurrences)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                [(session_id, *row) for row in rows],
+            )
+            conn.commit()
+
+    def get_item_aliases(self, session_id: str):
+        """Retrieve (item_name, canonical_item, dedup_key, occurrences) for a session."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT item_name, canonical_item, dedup_key, occurrences
+                FROM item_aliases
+                WHERE session_id = ?
+                ORDER BY canonical_item, item_name
+            """,
+                (session_id,),
+            )
+            return cursor.fetchall()
+
+    def log_failover_event(
+        self,
+        session_id: str,
+        from_adapter: str,
+        to_adapter: Optional[str],
+        reason: str,
+        error_message: Optional[str] = None,
+    ):
+        """Record a call moving past an adapter ("error" or "circuit_open")."""
+        assert session_id, "session_id cannot be empty"
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO failover_events
+                (session_id, timestamp, from_adapter, to_adapter, reason, error_message)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    session_id,
+                    datetime.now().isoformat(),
+                    from_adapter,
+                    to_adapter,
+                    reason,
+                    error_message,
+                ),
+            )
+            conn.commit()
+
+    def store_consensus_memo(
+        self,
+        memo_key: str,
+        item_name: str,
+        schema_fingerprint: str,
+        validation_task: str,
+        model_name: Optional[str],
+        policy: str,
+        consensus: Dict[str, Any],
+        session_id: Optional[str] = None,
+    ):
+        """Remember a decisive consensus (replaces an older entry for the key)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO consensus_memo
+                (memo_key, item_name, schema_fingerprint, validation_task,
+                 model_name, policy, consensus, session_id, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    memo_key,
+                    item_name,
+                    schema_fingerprint,
+                    validation_task,
+                    model_name,
+                    policy,
+                    json.dumps(consensus),
+                    session_id,
+                    datetime.now().isoformat(),
+                ),
+            )
+            conn.commit()
+
+    def get_consensus_memo(
+        self, memo_key: str, max_age_seconds: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        A remembered consensus, unless missing or older than max_age_seconds.
+
+        Returns:
+            dict with consensus, session_id and created_at, or None
+        """
+        query = "SELECT consensus, session_id, created_at FROM consensus_memo WHERE memo_key = ?"
+        params = [memo_key]
+        if max_age_seconds is not None:
+            query += " AND created_at >= ?"
+            params.append(
+                (datetime.now() - timedelta(seconds=max_age_seconds)).isoformat()
+            )
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return {
+            "consensus": json.loads(row[0]),
+            "session_id": row[1],
+            "created_at": row[2],
+        }
+
+    def prune_consensus_memo(self, max_age_seconds: float) -> int:
+        """Delete memo entries older than max_age_seconds. Returns entries deleted."""
+        cutoff = (datetime.now() - timedelta(seconds=max_age_seconds)).isoformat()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM consensus_memo WHERE created_at < ?", (cutoff,))
+            conn.commit()
+            return cursor.rowcount
+
+    def get_failover_events(self, session_id: str):
+        """Failover events of a session, oldest first:
+        (timestamp, from_adapter, to_adapter, reason, error_message)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT timestamp, from_adapter, to_adapter, reason, error_message
+                FROM failover_events
+                WHERE session_id = ?
+                ORDER BY id
+            """,
+                (session_id,),
+            )
+            return cursor.fetchall()
+
     def get_session_responses(self, session_id: str):
         """Retrieve all responses for a session."""
         with self._get_connection() as conn:
@@ -203,3 +653,663 @@ class ValidationLogger:
                 (session_id,),
             )
             return cursor.fetchall()
+
+    def iter_session_rows(self, session_id: str, chunk_size: int = 1000):
+        """
+        Stream a session's responses in chunks (bounded memory).
+
+        Rows are ordered by item and iteration, so all fields of one call are
+        contiguous. Each chunk is a list of:
+        (item_name, iteration_number, timestamp, model_name, adapter_type,
+         validation_task, field_name, field_value, is_error, error_message)
+        """
+        assert chunk_size > 0, "chunk_size must be positive"
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT item_name, iteration_number, timestamp, model_name,
+                       adapter_type, validation_task, field_name, field_value,
+                       is_error, error_message
+                FROM validation_responses
+                WHERE session_id = ?
+                ORDER BY item_name, iteration_number
+            """,
+                (session_id,),
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+
+    def get_session(self, session_id: str) -> dict | None:
+        """A session's validation_sessions row as a dict (None if unknown)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM validation_sessions WHERE session_id = ?",
+                (session_id,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return dict(zip([col[0] for col in cursor.description], row))
+
+    def get_session_field_names(self, session_id: str) -> list:
+        """Distinct field names logged for a session, in first-logged (schema) order."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT field_name FROM validation_responses
+                WHERE session_id = ? AND is_error = 0
+                GROUP BY field_name
+                ORDER BY MIN(id)
+            """,
+                (session_id,),
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def _get_session_threshold(self, cursor, session_id: str) -> int:
+        cursor.execute(
+            "SELECT consensus_threshold FROM validation_sessions WHERE session_id = ?",
+            (session_id,),
+        )
+        row = cursor.fetchone()
+        assert row and row[0] is not None, (
+            f"No consensus threshold recorded for session {session_id}"
+        )
+        return row[0]
+
+    def get_session_consensus(self, session_id: str, threshold: int | None = None):
+        """
+        Compute consensus per item/field in SQL.
+
+        Args:
+            session_id: Session to aggregate
+            threshold: Votes required; defaults to the session's recorded threshold
+
+        Returns:
+            List of (item_name, field_name, consensus_value, votes, total_votes)
+            where consensus_value is "ambiguous" below the threshold.
+            Items with only errors have no rows.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if threshold is None:
+                threshold = self._get_session_threshold(cursor, session_id)
+            cursor.execute(
+                _RANKED_VOTES_SQL
+                + """
+                SELECT item_name, field_name,
+                       CASE WHEN votes >= ? THEN field_value ELSE 'ambiguous' END,
+                       votes, total_votes
+                FROM ranked
+                WHERE vote_rank = 1
+                ORDER BY item_name, field_name
+            """,
+                (session_id, threshold),
+            )
+            return cursor.fetchall()
+
+    def get_agreement_rates(self, session_id: str, threshold: int | None = None):
+        """
+        Per-field agreement across a session.
+
+        Returns:
+            List of (field_name, items, mean_agreement, decided_items) where
+            mean_agreement is the average share of votes held by the top value.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if threshold is None:
+                threshold = self._get_session_threshold(cursor, session_id)
+            cursor.execute(
+                _RANKED_VOTES_SQL
+                + """
+                SELECT field_name, COUNT(*),
+                       AVG(CAST(votes AS REAL) / total_votes),
+                       SUM(votes >= ?)
+                FROM ranked
+                WHERE vote_rank = 1
+                GROUP BY field_name
+                ORDER BY field_name
+            """,
+                (session_id, threshold),
+            )
+            return cursor.fetchall()
+
+    def get_error_rates(self, session_id: str):
+        """
+        Per-item error rates.
+
+        Returns:
+            List of (item_name, calls, errors, error_rate)
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                _CALLS_SQL
+                + """
+                SELECT item_name, COUNT(*), SUM(is_error), AVG(is_error)
+                FROM calls
+                GROUP BY item_name
+                ORDER BY item_name
+            """,
+                (session_id,),
+            )
+            return cursor.fetchall()
+
+    def get_model_breakdown(self, session_id: str):
+        """
+        Per-model call and error counts.
+
+        Returns:
+            List of (model_name, adapter_type, items, calls, errors, error_rate)
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                _CALLS_SQL
+                + """
+                SELECT model_name, adapter_type, COUNT(DISTINCT item_name),
+                       COUNT(*), SUM(is_error), AVG(is_error)
+                FROM calls
+                GROUP BY model_name, adapter_type
+                ORDER BY model_name, adapter_type
+            """,
+                (session_id,),
+            )
+            return cursor.fetchall()
+
+    # --- PAGINATED QUERIES ---
+    # Page methods return (rows, next_after); pass next_after back to get the
+    # following page (None when exhausted). Keyset pagination keeps every page
+    # an index seek, however deep. iter_* methods yield rows across pages.
+
+    def _iter_pages(self, fetch_page, page_size: int):
+        after = None
+        while True:
+            rows, after = fetch_page(after=after, limit=page_size)
+            yield from rows
+            if after is None:
+                break
+
+    def get_item_responses_page(
+        self, item_name: str, after: int | None = None, limit: int = 100
+    ):
+        """
+        Responses for an item across all sessions, oldest first.
+
+        Returns:
+            (rows, next_after): full validation_responses rows; next_after is the last id
+        """
+        assert limit > 0, "limit must be positive"
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT * FROM validation_responses
+                WHERE item_name = ? AND id > ?
+                ORDER BY id
+                LIMIT ?
+            """,
+                (item_name, after or 0, limit),
+            )
+            rows = cursor.fetchall()
+        return rows, (rows[-1][0] if len(rows) == limit else None)
+
+    def iter_item_responses(self, item_name: str, page_size: int = 500):
+        """Generator over all responses for an item across sessions."""
+        return self._iter_pages(
+            lambda after, limit: self.get_item_responses_page(item_name, after, limit),
+            page_size,
+        )
+
+    def get_model_sessions_page(
+        self,
+        model_name: str,
+        since: datetime | str | None = None,
+        until: datetime | str | None = None,
+        after: tuple | None = None,
+        limit: int = 100,
+    ):
+        """
+        Sessions run with a model, optionally within [since, until), oldest first.
+
+        Returns:
+            (rows, next_after): validation_sessions rows; next_after is (started_at, session_id)
+        """
+        assert limit > 0, "limit must be positive"
+        conditions = ["model_name = ?"]
+        params: list = [model_name]
+        if since is not None:
+            conditions.append("started_at >= ?")
+            params.append(since.isoformat() if isinstance(since, datetime) else since)
+        if until is not None:
+            conditions.append("started_at < ?")
+            params.append(until.isoformat() if isinstance(until, datetime) else until)
+        if after is not None:
+            conditions.append("(started_at, session_id) > (?, ?)")
+            params.extend(after)
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT * FROM validation_sessions
+                WHERE {" AND ".join(conditions)}
+                ORDER BY started_at, session_id
+                LIMIT ?
+            """,
+                (*params, limit),
+            )
+            columns = [c[0] for c in cursor.description]
+            rows = cursor.fetchall()
+
+        next_after = None
+        if len(rows) == limit:
+            last = dict(zip(columns, rows[-1]))
+            next_after = (last["started_at"], last["session_id"])
+        return rows, next_after
+
+    def iter_model_sessions(
+        self,
+        model_name: str,
+        since: datetime | str | None = None,
+        until: datetime | str | None = None,
+        page_size: int = 500,
+    ):
+        """Generator over sessions run with a model within a time range."""
+        return self._iter_pages(
+            lambda after, limit: self.get_model_sessions_page(
+                model_name, since, until, after, limit
+            ),
+            page_size,
+        )
+
+    def get_ambiguous_items_page(
+        self,
+        field_name: str,
+        session_id: str | None = None,
+        after: tuple | None = None,
+        limit: int = 100,
+    ):
+        """
+        Items whose consensus on a field fell below their session's threshold.
+
+        Items are scanned in windows of `limit` (session_id, item_name) keys
+        after the cursor, and only the responses of a window's items are
+        aggregated, so a page costs the items it scans, not the rest of the
+        table. Windows are scanned until the page is full or the items run out.
+
+        Returns:
+            (rows, next_after): rows of (session_id, item_name, top_value, votes,
+            total_votes, threshold); next_after is (session_id, item_name)
+        """
+        assert limit > 0, "limit must be positive"
+        rows = []
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            while True:
+                conditions = ["field_name = ?", "is_error = 0"]
+                params: list = [field_name]
+                if session_id is not None:
+                    conditions.append("session_id = ?")
+                    params.append(session_id)
+                if after is not None:
+                    conditions.append("(session_id, item_name) > (?, ?)")
+                    params.extend(after)
+                # The window's keys come straight off idx_field_items
+                page = f"""
+                    SELECT DISTINCT session_id, item_name
+                    FROM validation_responses
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY session_id, item_name
+                    LIMIT ?
+                """
+                cursor.execute(page, (*params, limit))
+                window = cursor.fetchall()
+                if not window:
+                    return rows, None
+
+                cursor.execute(
+                    f"""
+                    WITH page AS ({page}),
+                    votes AS (
+                        SELECT r.session_id, r.item_name, r.field_value,
+                               COUNT(*) AS votes, MIN(r.iteration_number) AS first_seen
+                        FROM page p
+                        JOIN validation_responses r
+                          ON r.field_name = ? AND r.is_error = 0
+                         AND r.session_id = p.session_id AND r.item_name = p.item_name
+                        GROUP BY r.session_id, r.item_name, r.field_value
+                    ),
+                    ranked AS (
+                        SELECT session_id, item_name, field_value, votes,
+                               SUM(votes) OVER (
+                                   PARTITION BY session_id, item_name
+                               ) AS total_votes,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY session_id, item_name
+                                   ORDER BY votes DESC, first_seen ASC
+                               ) AS vote_rank
+                        FROM votes
+                    )
+                    SELECT r.session_id, r.item_name, r.field_value, r.votes,
+                           r.total_votes, s.consensus_threshold
+                    FROM ranked r
+                    JOIN validation_sessions s ON s.session_id = r.session_id
+                    WHERE r.vote_rank = 1 AND r.votes < s.consensus_threshold
+                    ORDER BY r.session_id, r.item_name
+                """,
+                    (*params, limit, field_name),
+                )
+                found = cursor.fetchall()
+                rows.extend(found[: limit - len(rows)])
+                if len(rows) == limit:
+                    return rows, rows[-1][:2]
+                if len(window) < limit:
+                    return rows, None
+                after = window[-1]
+
+    def iter_ambiguous_items(
+        self, field_name: str, session_id: str | None = None, page_size: int = 500
+    ):
+        """Generator over items whose consensus on a field was ambiguous."""
+        return self._iter_pages(
+            lambda after, limit: self.get_ambiguous_items_page(
+                field_name, session_id, after, limit
+            ),
+            page_size,
+        )
+
+    # --- RETENTION ---
+
+    def select_sessions(
+        self, older_than_days: float | None = None, keep_last: int | None = None
+    ) -> list:
+        """
+        Select session IDs for retention.
+
+        Args:
+            older_than_days: Sessions started more than this many days ago
+            keep_last: Everything except the most recent N sessions
+
+        Returns:
+            Session IDs matching either criterion, oldest first
+        """
+        assert older_than_days is not None or keep_last is not None, (
+            "older_than_days or keep_last is required"
+        )
+        assert keep_last is None or keep_last >= 0, "keep_last cannot be negative"
+
+        selected = set()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if older_than_days is not None:
+                cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+                cursor.execute(
+                    "SELECT session_id FROM validation_sessions WHERE started_at < ?",
+                    (cutoff,),
+                )
+                selected.update(row[0] for row in cursor.fetchall())
+            if keep_last is not None:
+                cursor.execute(
+                    """
+                    SELECT session_id FROM validation_sessions
+                    ORDER BY started_at DESC
+                    LIMIT -1 OFFSET ?
+                """,
+                    (keep_last,),
+                )
+                selected.update(row[0] for row in cursor.fetchall())
+
+            cursor.execute(
+                "SELECT session_id FROM validation_sessions ORDER BY started_at"
+            )
+            return [row[0] for row in cursor.fetchall() if row[0] in selected]
+
+    def delete_sessions(self, session_ids: list) -> int:
+        """Delete sessions and their responses. Returns response rows deleted."""
+        deleted = 0
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for session_id in session_ids:
+                cursor.execute(
+                    "DELETE FROM validation_responses WHERE session_id = ?",
+                    (session_id,),
+                )
+                deleted += cursor.rowcount
+                cursor.execute(
+                    "DELETE FROM item_aliases WHERE session_id = ?", (session_id,)
+                )
+                cursor.execute(
+                    "DELETE FROM failover_events WHERE session_id = ?", (session_id,)
+                )
+                cursor.execute(
+                    "DELETE FROM skipped_items WHERE session_id = ?", (session_id,)
+                )
+                cursor.execute(
+                    "DELETE FROM item_consensus WHERE session_id = ?", (session_id,)
+                )
+                cursor.execute(
+                    "DELETE FROM consensus_memo WHERE session_id = ?", (session_id,)
+                )
+                cursor.execute(
+                    "DELETE FROM validation_sessions WHERE session_id = ?",
+                    (session_id,),
+                )
+            conn.commit()
+        return deleted
+
+    def archive_sessions(
+        self, session_ids: list, archive_path: str, compress: bool = True
+    ) -> str:
+        """
+        Copy sessions into a separate database file (not deleted here).
+
+        Args:
+            session_ids: Sessions to copy
+            archive_path: Archive database path (created, or appended to if uncompressed)
+            compress: Gzip the archive afterwards (writes archive_path + ".gz")
+
+        Returns:
+            Path of the written archive
+
+        Raises:
+            FileExistsError: The compressed archive already exists
+        """
+        final_path = archive_path + ".gz" if compress else archive_path
+        if compress and os.path.exists(final_path):
+            raise FileExistsError(f"Archive already exists: {final_path}")
+
+        # Create the archive with the same schema
+        ValidationLogger(archive_path)
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+
+            # Explicit column lists: columns added by later migrations may be
+            # ordered differently between the live DB and a fresh archive
+            session_cols = ", ".join(self._table_columns(cursor, "validation_sessions"))
+            response_cols = ", ".join(
+                c
+                for c in self._table_columns(cursor, "validation_responses")
+                if c != "id"
+            )
+            for session_id in session_ids:
+                cursor.execute(
+                    f"""
+                    INSERT OR REPLACE INTO archive.validation_sessions ({session_cols})
+                    SELECT {session_cols} FROM main.validation_sessions
+                    WHERE session_id = ?
+                """,
+                    (session_id,),
+                )
+                cursor.execute(
+                    f"""
+                    INSERT INTO archive.validation_responses ({response_cols})
+                    SELECT {response_cols} FROM main.validation_responses
+                    WHERE session_id = ?
+                    ORDER BY id
+                """,
+                    (session_id,),
+                )
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO archive.item_aliases
+                    SELECT * FROM main.item_aliases WHERE session_id = ?
+                """,
+                    (session_id,),
+                )
+                cursor.execute(
+                    """
+                    INSERT INTO archive.failover_events
+                    (session_id, timestamp, from_adapter, to_adapter, reason, error_message)
+                    SELECT session_id, timestamp, from_adapter, to_adapter, reason,
+                           error_message
+                    FROM main.failover_events WHERE session_id = ?
+                    ORDER BY id
+                """,
+                    (session_id,),
+                )
+                cursor.execute(
+                    """
+                    INSERT INTO archive.skipped_items
+                    (session_id, position, item_name, reason)
+                    SELECT session_id, position, item_name, reason
+                    FROM main.skipped_items WHERE session_id = ?
+                    ORDER BY id
+                """,
+                    (session_id,),
+                )
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO archive.item_consensus
+                    (session_id, position, item_name, consensus, calls)
+                    SELECT session_id, position, item_name, consensus, calls
+                    FROM main.item_consensus WHERE session_id = ?
+                """,
+                    (session_id,),
+                )
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO archive.consensus_memo
+                    (memo_key, item_name, schema_fingerprint, validation_task,
+                     model_name, policy, consensus, session_id, created_at)
+                    SELECT memo_key, item_name, schema_fingerprint, validation_task,
+                           model_name, policy, consensus, session_id, created_at
+                    FROM main.consensus_memo WHERE session_id = ?
+                """,
+                    (session_id,),
+                )
+            conn.commit()
+            cursor.execute("DETACH DATABASE archive")
+
+        if compress:
+            # "x": never overwrite an archive written since the check above
+            with open(archive_path, "rb") as src, gzip.open(final_path, "xb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(archive_path)
+
+        return final_path
+
+    def _table_columns(self, cursor, table: str) -> list:
+        cursor.execute(f"PRAGMA main.table_info({table})")
+        return [row[1] for row in cursor.fetchall()]
+
+    def analyze(self):
+        """Refresh query planner statistics."""
+        with self._get_connection() as conn:
+            conn.execute("ANALYZE")
+            conn.commit()
+
+    def compact(self, max_pages: int | None = None) -> int:
+        """
+        Reclaim free pages left by deletes.
+
+        Uses incremental vacuum; databases created before auto_vacuum was
+        enabled get a one-time full VACUUM to switch modes.
+
+        Args:
+            max_pages: Maximum pages to free (all if None)
+
+        Returns:
+            Number of pages freed
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            free_before = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+
+            if cursor.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                cursor.execute("VACUUM")
+            elif max_pages is None:
+                # Each step frees one page; fetch the results to run them all
+                cursor.execute("PRAGMA incremental_vacuum").fetchall()
+            else:
+                cursor.execute(
+                    f"PRAGMA incremental_vacuum({int(max_pages)})"
+                ).fetchall()
+            conn.commit()
+
+            free_after = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+            return free_before - free_after
+
+    def apply_retention(
+        self,
+        older_than_days: float | None = None,
+        keep_last: int | None = None,
+        archive_dir: str | None = None,
+        compress: bool = True,
+        dry_run: bool = False,
+    ) -> dict:
+        """
+        Prune sessions by age or count, optionally archiving them first.
+
+        Memo entries of pruned sessions go with them (archived too), and memo
+        entries older than CONSENSUS_MEMO_TTL_SECONDS are deleted.
+
+        Returns:
+            dict with sessions, rows_deleted, memo_deleted, archive_path,
+            pages_freed, analyzed
+        """
+        session_ids = self.select_sessions(older_than_days, keep_last)
+        summary = {
+            "sessions": session_ids,
+            "rows_deleted": 0,
+            "memo_deleted": 0,
+            "archive_path": None,
+            "pages_freed": 0,
+            "analyzed": False,
+        }
+        if dry_run:
+            return summary
+
+        if config.CONSENSUS_MEMO_TTL_SECONDS is not None:
+            summary["memo_deleted"] = self.prune_consensus_memo(
+                config.CONSENSUS_MEMO_TTL_SECONDS
+            )
+        if not session_ids:
+            return summary
+
+        if archive_dir:
+            os.makedirs(archive_dir, exist_ok=True)
+            db_name = os.path.splitext(os.path.basename(self.db_path))[0]
+            # Microseconds and a random suffix: runs in the same second get their own archive
+            archive_name = f"{db_name}_archive_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{uuid.uuid4().hex[:8]}.db"
+            summary["archive_path"] = self.archive_sessions(
+                session_ids, os.path.join(archive_dir, archive_name), compress
+            )
+
+        summary["rows_deleted"] = self.delete_sessions(session_ids)
+        if summary["rows_deleted"] >= self.ANALYZE_AFTER_ROWS:
+            self.analyze()
+            summary["analyzed"] = True
+        summary["pages_freed"] = self.compact()
+
+        return summary
@@ -0,0 +1,116 @@
+"""
+Run-level deadlines and call budgets.
+
+RunBudget plans each item before it is dispatched. It learns the cost of one
+iteration (wall time and API calls, with an exponential moving average) from
+the items already done, then gives the next item as many iterations as still
+fit:
+
+    iterations = min(configured, time left / time per iteration,
+                     calls left / calls per iteration)
+
+As the deadline approaches, items therefore get fewer iterations. Once fewer
+than `min_iterations` fit, the run stops dispatching. Because an item is
+only started when it is expected to finish in time, the item in flight
+drains before the deadline instead of being killed mid-way.
+"""
+
+import math
+import time
+
+DEADLINE = "deadline"
+CALL_BUDGET = "call_budget"
+
+
+class RunBudget:
+    def __init__(
+        self,
+        deadline_seconds: float | None = None,
+        max_calls: int | None = None,
+        min_iterations: int = 1,
+        safety_factor: float = 1.2,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            deadline_seconds: Wall-clock budget of the run from now (None: no limit)
+            max_calls: Maximum API calls of the run (None: no limit)
+            min_iterations: Fewest iterations worth running for an item
+            safety_factor: Margin applied to the time estimate of the next item
+            clock: Monotonic time source (for tests)
+        """
+        assert deadline_seconds is None or deadline_seconds > 0, (
+            "deadline_seconds must be positive"
+        )
+        assert max_calls is None or max_calls > 0, "max_calls must be positive"
+        assert min_iterations > 0, "min_iterations must be at least 1"
+        assert safety_factor >= 1.0, "safety_factor must be at least 1"
+        self.deadline_seconds = deadline_seconds
+        self.max_calls = max_calls
+        self.min_iterations = min_iterations
+        self.safety_factor = safety_factor
+        self._clock = clock
+        self._started = clock()
+        self.calls_used = 0
+        # Per-iteration cost estimates (None until an item finished)
+        self._seconds_per_iteration = None
+        self._calls_per_iteration = 1.0
+        # Reason the run stopped dispatching (DEADLINE / CALL_BUDGET), if it did
+        self.stop_reason = None
+
+    @property
+    def elapsed(self) -> float:
+        return self._clock() - self._started
+
+    def plan(self, iterations: int, stop: bool = True) -> int:
+        """
+        Iterations to give the next item (at most `iterations`).
+
+        Returns 0 when fewer than min_iterations fit. With `stop`, the run
+        then stops dispatching for good and stop_reason says why; without it
+        (e.g. to check an optional follow-up) nothing changes.
+        """
+        if self.stop_reason:
+            return 0
+        min_iterations = min(self.min_iterations, iterations)
+
+        by_time = math.inf
+        if self.deadline_seconds is not None:
+            remaining = self.deadline_seconds - self.elapsed
+            if remaining <= 0:
+                by_time = 0
+            elif self._seconds_per_iteration:
+                by_time = math.floor(
+                    remaining / (self._seconds_per_iteration * self.safety_factor)
+                )
+
+        by_calls = math.inf
+        if self.max_calls is not None:
+            remaining_calls = self.max_calls - self.calls_used
+            by_calls = math.floor(remaining_calls / self._calls_per_iteration + 1e-9)
+
+        planned = min(iterations, by_time, by_calls)
+        if planned < min_iterations:
+            if stop:
+                self.stop_reason = DEADLINE if by_time <= by_calls else CALL_BUDGET
+            return 0
+        return int(planned)
+
+    def record(self, iterations: int, seconds: float, calls: int):
+        """Account for a finished item that ran `iterations` iterations."""
+        self.calls_used += calls
+        if iterations <= 0 or calls <= 0:
+            # Served without calls (memo hit): says nothing about call cost
+            return
+        seconds_per_iteration = seconds / iterations
+        calls_per_iteration = calls / iterations
+        if self._seconds_per_iteration is None:
+            self._seconds_per_iteration = seconds_per_iteration
+            self._calls_per_iteration = calls_per_iteration
+        else:
+            self._seconds_per_iteration = (
+                0.7 * self._seconds_per_iteration + 0.3 * seconds_per_iteration
+            )
+            self._calls_per_iteration = (
+                0.7 * self._calls_per_iteration + 0.3 * calls_per_iteration
+            )
@@ -0,0 +1,51 @@
+"""
+Item deduplication before dispatch.
+
+Items that normalize to the same key are validated once; the first
+occurrence (original text) is sent to the LLM and its result is fanned out
+to every duplicate.
+"""
+
+import re
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def normalize_item(item: str) -> str:
+    """Default normalizer: case-insensitive, punctuation and extra whitespace removed."""
+    return " ".join(_NON_WORD.sub("", item.casefold()).split())
+
+
+def group_duplicates(items, normalizer=normalize_item) -> dict:
+    """
+    Group items by normalized key.
+
+    Returns:
+        dict of key -> list of original items (duplicates included), in
+        first-seen order; the first member is the canonical item
+    """
+    groups = {}
+    for item in items:
+        groups.setdefault(normalizer(item), []).append(item)
+    return groups
+
+
+def alias_rows(groups: dict) -> list:
+    """
+    Mapping rows for items collapsed into another item.
+
+    Returns:
+        List of (item_name, canonical_item, dedup_key, occurrences), one per
+        distinct original text; the canonical item itself is listed only if
+        it occurred more than once
+    """
+    rows = []
+    for key, members in groups.items():
+        canonical = members[0]
+        counts = {}
+        for item in members:
+            counts[item] = counts.get(item, 0) + 1
+        for item, occurrences in counts.items():
+            if item != canonical or occurrences > 1:
+                rows.append((item, canonical, key, occurrences))
+    return rows
@@ -0,0 +1,190 @@
+"""
+Streaming export of logged sessions to JSONL, CSV or Parquet.
+
+Rows are streamed from SQLite with fetchmany and pivoted back to one record
+per item/iteration, then written chunk by chunk, so memory stays bounded
+regardless of session size. Field values are exported as logged (strings).
+"""
+
+import os
+import csv
+import json
+from contextlib import ExitStack
+from core.db_logger import ValidationLogger
+
+EXPORT_FORMATS = ("jsonl", "csv", "parquet")
+
+# Columns present on every record, before the schema fields
+BASE_COLUMNS = [
+    "session_id",
+    "item_name",
+    "iteration_number",
+    "timestamp",
+    "model_name",
+    "adapter_type",
+    "validation_task",
+    "is_error",
+    "error_message",
+]
+
+
+def iter_session_records(
+    logger: ValidationLogger, session_id: str, chunk_size: int = 1000
+):
+    """
+    Yield lists of pivoted records (one dict per item/iteration).
+
+    Each yielded list holds at most about one chunk of source rows.
+    """
+    record = None
+    for rows in logger.iter_session_rows(session_id, chunk_size):
+        batch = []
+        for (
+            item_name,
+            iteration_number,
+            timestamp,
+            model_name,
+            adapter_type,
+            validation_task,
+            field_name,
+            field_value,
+            is_error,
+            error_message,
+        ) in rows:
+            if (
+                record is None
+                or record["item_name"] != item_name
+                or record["iteration_number"] != iteration_number
+            ):
+                if record is not None:
+                    batch.append(record)
+                record = {
+                    "session_id": session_id,
+                    "item_name": item_name,
+                    "iteration_number": iteration_number,
+                    "timestamp": timestamp,
+                    "model_name": model_name,
+                    "adapter_type": adapter_type,
+                    "validation_task": validation_task,
+                    "is_error": False,
+                    "error_message": None,
+                }
+
+            if is_error:
+                record["is_error"] = True
+                record["error_message"] = error_message
+            else:
+                record[field_name] = field_value
+
+        if batch:
+            yield batch
+
+    # The last record is only complete once the stream ends
+    if record is not None:
+        yield [record]
+
+
+class _ChunkWriter:
+    """Base class: a writer is a context manager that closes its file on exit."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        pass
+
+
+class JsonlWriter(_ChunkWriter):
+    def __init__(self, path: str, columns: list):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write_chunk(self, records: list):
+        self.file.writelines(json.dumps(record) + "\n" for record in records)
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter(_ChunkWriter):
+    def __init__(self, path: str, columns: list):
+        with ExitStack() as stack:
+            self.file = stack.enter_context(
+                open(path, "w", encoding="utf-8", newline="")
+            )
+            self.writer = csv.DictWriter(self.file, fieldnames=columns)
+            self.writer.writeheader()
+            # Header written: the file stays open until close()
+            stack.pop_all()
+
+    def write_chunk(self, records: list):
+        self.writer.writerows(records)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter(_ChunkWriter):
+    def __init__(self, path: str, columns: list):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Parquet export requires pyarrow. Install it with: pip install pyarrow"
+            ) from e
+
+        types = {"iteration_number": pa.int64(), "is_error": pa.bool_()}
+        self.pa = pa
+        self.columns = columns
+        self.schema = pa.schema([(c, types.get(c, pa.string())) for c in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write_chunk(self, records: list):
+        arrays = {c: [record.get(c) for record in records] for c in self.columns}
+        # One row group per chunk
+        self.writer.write_table(self.pa.table(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"jsonl": JsonlWriter, "csv": CsvWriter, "parquet": ParquetWriter}
+
+
+def export_session(
+    logger: ValidationLogger,
+    session_id: str,
+    output_path: str,
+    fmt: str | None = None,
+    chunk_size: int = 1000,
+) -> int:
+    """
+    Export a session to a file.
+
+    Args:
+        logger: Logger for the session's database
+        session_id: Session to export
+        output_path: Destination file
+        fmt: "jsonl", "csv" or "parquet"; inferred from the extension if None
+        chunk_size: Rows fetched (and records written) per chunk
+
+    Returns:
+        Number of records written
+    """
+    fmt = (fmt or os.path.splitext(output_path)[1].lstrip(".")).lower()
+    if fmt not in WRITERS:
+        raise ValueError(
+            f"Unknown export format: {fmt!r} (expected one of {', '.join(EXPORT_FORMATS)})"
+        )
+
+    columns = BASE_COLUMNS + logger.get_session_field_names(session_id)
+    count = 0
+    with WRITERS[fmt](output_path, columns) as writer:
+        for records in iter_session_records(logger, session_id, chunk_size):
+            writer.write_chunk(records)
+            count += len(records)
+
+    return count
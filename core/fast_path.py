@@ -0,0 +1,69 @@
+"""
+Lightweight validation engine for flat schemas.
+
+Schemas made only of scalar fields (bool, int, float, str, Literal) don't need
+the full Guard pipeline: the raw completion is validated directly with
+pydantic's native JSON parser (`model_validate_json`). Fields carrying
+Guardrails validators (`Field(json_schema_extra={"validators": [...]})`) need
+the Guard to run them, so their schemas are not flat. Anything this path
+can't handle is left to the Guard.
+"""
+
+import weakref
+from typing import Literal, Type, get_args, get_origin
+from pydantic import BaseModel
+
+VALIDATION_ENGINES = ("guard", "fast")
+
+_SCALAR_TYPES = (bool, int, float, str)
+
+# Weak keys, like core.schema_utils: schema classes can be collected once unused
+_flat_schemas = weakref.WeakKeyDictionary()
+
+
+def _is_scalar(annotation) -> bool:
+    if annotation in _SCALAR_TYPES:
+        return True
+    if get_origin(annotation) is Literal:
+        return all(isinstance(arg, _SCALAR_TYPES) for arg in get_args(annotation))
+    return False
+
+
+def _has_guard_validators(info) -> bool:
+    extra = info.json_schema_extra
+    return isinstance(extra, dict) and bool(extra.get("validators"))
+
+
+def is_flat_schema(schema: Type[BaseModel]) -> bool:
+    """
+    True if every field is a bool, int, float, str or Literal of those, and
+    none has Guardrails validators.
+    """
+    flat = _flat_schemas.get(schema)
+    if flat is None:
+        flat = all(
+            _is_scalar(info.annotation) and not _has_guard_validators(info)
+            for info in schema.model_fields.values()
+        )
+        _flat_schemas[schema] = flat
+    return flat
+
+
+def extract_json(text: str) -> str:
+    """The outermost JSON object in a completion (drops code fences and chatter)."""
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("No JSON object in LLM output")
+    return text[start : end + 1]
+
+
+def fast_validate(schema: Type[BaseModel], text: str) -> dict:
+    """
+    Validate a raw completion against a flat schema.
+
+    Raises:
+        ValueError: No JSON object found, or pydantic.ValidationError (a
+            ValueError subclass) if the JSON doesn't match the schema
+    """
+    return schema.model_validate_json(extract_json(text)).model_dump()
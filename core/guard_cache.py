@@ -0,0 +1,101 @@
+"""
+Process-wide cache of compiled Guards, shared across verifiers.
+
+Building a Guard compiles the Pydantic schema, so verifiers created per
+request or per domain reuse one Guard per schema class instead. Guards are
+keyed by the class itself, not its JSON schema: two classes with the same
+JSON schema can still differ in validators.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Type
+from pydantic import BaseModel
+
+# Maximum number of compiled Guards kept in memory
+DEFAULT_CACHE_SIZE = 32
+
+
+class GuardCache:
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        """
+        Thread-safe LRU cache of Guards keyed by schema class.
+
+        Args:
+            maxsize: Maximum number of Guards kept; least recently used are evicted
+        """
+        assert maxsize > 0, "maxsize must be positive"
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._guards = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, schema: Type[BaseModel]):
+        """Return the Guard for a schema, compiling it on first use."""
+        # Compile under the lock so concurrent callers never build the same Guard twice
+        with self._lock:
+            guard = self._guards.get(schema)
+            if guard is not None:
+                self._guards.move_to_end(schema)
+                self.hits += 1
+                return guard
+
+            self.misses += 1
+
+            # Imported here: guardrails is slow to import (see core.verifier)
+            from guardrails import Guard
+
+            guard = Guard.for_pydantic(output_class=schema)
+            self._guards[schema] = guard
+            if len(self._guards) > self.maxsize:
+                self._guards.popitem(last=False)
+            return guard
+
+    def warm(self, schemas) -> int:
+        """Pre-compile Guards for an iterable of schemas. Returns the cache size."""
+        for schema in schemas:
+            self.get(schema)
+        return len(self)
+
+    def clear(self):
+        """Drop all cached Guards and reset statistics."""
+        with self._lock:
+            self._guards.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, schema) -> bool:
+        return schema in self._guards
+
+    def __len__(self) -> int:
+        return len(self._guards)
+
+
+# Shared by every verifier in the process
+guard_cache = GuardCache()
+
+
+def get_guard(schema: Type[BaseModel]):
+    """Return the shared Guard for a schema."""
+    return guard_cache.get(schema)
+
+
+def warm_guard_cache(domain_configs) -> int:
+    """
+    Pre-compile Guards for domain configs at startup.
+
+    Args:
+        domain_configs: Iterable of domain config modules or module paths
+
+    Returns:
+        Number of Guards in the cache
+    """
+    import importlib
+
+    schemas = []
+    for domain_config in domain_configs:
+        if isinstance(domain_config, str):
+            domain_config = importlib.import_module(domain_config)
+        schemas.append(domain_config.VALIDATION_SCHEMA)
+    return guard_cache.warm(schemas)
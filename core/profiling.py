@@ -0,0 +1,215 @@
+"""
+Run profiling.
+
+A RunProfiler records, for one validation run:
+  - cProfile statistics (<name>.prof, readable with pstats or snakeviz)
+  - a tracemalloc snapshot (peak memory and top allocation sites)
+  - a per-phase wall-time breakdown (prompt generation, guard call,
+    consensus, DB logging, display)
+
+Phases are timed by wrapping methods on the run's own verifier, adapter and
+logger instances, so nothing is patched (and nothing costs anything) when
+profiling is off. Nested phases count only their own time: a guard call that
+builds its prompt is split between the two phases.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+import config
+
+# Methods timed per phase, by object role
+PHASE_METHODS = {
+    "verifier": {
+        "_build_messages": "prompt_generation",
+        "_call": "guard_call",
+        "_validate_output": "guard_call",
+        "_calculate_consensus": "consensus",
+    },
+    "adapter": {"complete": "guard_call"},
+    "logger": {
+        "start_session": "db_logging",
+        "log_response": "db_logging",
+        "log_item_aliases": "db_logging",
+        "log_failover_event": "db_logging",
+        "log_skipped_items": "db_logging",
+        "log_item_consensus": "db_logging",
+        "get_consensus_memo": "db_logging",
+        "store_consensus_memo": "db_logging",
+        "complete_session": "db_logging",
+    },
+}
+PHASES = ("prompt_generation", "guard_call", "consensus", "db_logging", "display")
+
+
+class RunProfiler:
+    def __init__(self, top: int = 25):
+        """
+        Args:
+            top: Functions and allocation sites listed in the summary
+        """
+        self.top = top
+        self._profile = cProfile.Profile()
+        self._phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self._phase_calls = dict.fromkeys(PHASES, 0)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._restore = []
+        self._started = None
+        self._owns_tracemalloc = False
+
+    def start(self):
+        """Start cProfile, tracemalloc and the wall clock."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self._started = time.perf_counter()
+        self._profile.enable()
+
+    def instrument(self, obj, role: str):
+        """Time the phase methods of a verifier, adapter or logger instance."""
+        for method_name, phase in PHASE_METHODS[role].items():
+            method = getattr(obj, method_name, None)
+            if method is None:
+                continue
+            had_own = method_name in vars(obj)
+            setattr(obj, method_name, self.timed(phase, method))
+            self._restore.append((obj, method_name, method if had_own else None))
+
+    def timed(self, phase: str, fn):
+        """Wrap a callable so its self time counts towards `phase`."""
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            stack = getattr(self._local, "stack", None)
+            if stack is None:
+                stack = self._local.stack = []
+            # Each frame accumulates the time spent in nested phases
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                with self._lock:
+                    self._phase_seconds[phase] += elapsed - nested
+                    self._phase_calls[phase] += 1
+
+        return wrapper
+
+    def stop(self, name: str, output_dir: str | None = None) -> dict:
+        """
+        Stop profiling, restore instrumented methods and write the artifacts.
+
+        Args:
+            name: Artifact base name (e.g. the session ID)
+            output_dir: Directory for artifacts (default: DATA_DIR)
+
+        Returns:
+            Summary dict (also written as <name>.profile.json) with the phase
+            breakdown, memory figures and artifact paths
+        """
+        self._profile.disable()
+        total = time.perf_counter() - self._started
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        self.abort()
+
+        output_dir = output_dir or config.DATA_DIR
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, f"{name}.profile")
+        stats_path = f"{base}.prof"
+        summary_path = f"{base}.json"
+        self._profile.dump_stats(stats_path)
+
+        phases = {
+            phase: {
+                "seconds": round(seconds, 6),
+                "calls": self._phase_calls[phase],
+                "share": round(seconds / total, 4) if total else 0.0,
+            }
+            for phase, seconds in self._phase_seconds.items()
+        }
+        other = max(total - sum(self._phase_seconds.values()), 0.0)
+        phases["other"] = {
+            "seconds": round(other, 6),
+            "calls": 0,
+            "share": round(other / total, 4) if total else 0.0,
+        }
+
+        summary = {
+            "total_seconds": round(total, 6),
+            "phases": phases,
+            "memory": {
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top_allocations": [
+                    {
+                        "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                        "bytes": stat.size,
+                        "count": stat.count,
+                    }
+                    for stat in snapshot.statistics("lineno")[: self.top]
+                ],
+            },
+            "top_functions": self._top_functions(stats_path),
+            "artifacts": {"cprofile": stats_path, "summary": summary_path},
+        }
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    def abort(self):
+        """Stop profiling and restore instrumented methods without writing anything."""
+        self._profile.disable()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        for obj, method_name, original in reversed(self._restore):
+            if original is None:
+                delattr(obj, method_name)
+            else:
+                setattr(obj, method_name, original)
+        self._restore = []
+
+    def _top_functions(self, stats_path: str) -> list:
+        """Functions of this project by cumulative time (library internals left out)."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        stats = pstats.Stats(stats_path)
+        rows = []
+        for (filename, lineno, function), entry in stats.stats.items():
+            path = os.path.abspath(filename)
+            if not path.startswith(root) or f"{os.sep}.venv{os.sep}" in path:
+                continue
+            _, calls, own_time, cumulative_time = entry[:4]
+            rows.append(
+                {
+                    "function": f"{os.path.relpath(path, root)}:{lineno}({function})",
+                    "calls": calls,
+                    "own_seconds": round(own_time, 6),
+                    "cumulative_seconds": round(cumulative_time, 6),
+                }
+            )
+        rows.sort(key=lambda row: row["cumulative_seconds"], reverse=True)
+        return rows[: self.top]
+
+
+def format_phases(summary: dict) -> str:
+    """Human-readable phase breakdown of a profile summary."""
+    lines = [f"Profile ({summary['total_seconds']:.3f}s total):"]
+    for phase, entry in summary["phases"].items():
+        lines.append(
+            f"  {phase:<18} {entry['seconds']:>9.3f}s  {entry['share']:>6.1%}  ({entry['calls']} calls)"
+        )
+    lines.append(f"  peak memory        {summary['memory']['peak_bytes'] / 1e6:.1f} MB")
+    lines.append(f"  artifacts: {summary['artifacts']['cprofile']}")
+    return "\n".join(lines)
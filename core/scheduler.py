@@ -0,0 +1,375 @@
+"""
+Multi-domain scheduling.
+
+Several domains run in one process over a shared worker pool, a shared
+rate limiter and a single DB writer thread. Items are interleaved by
+priority first (higher classes always go first) and by weighted fair
+queuing within a priority class: each dispatched item advances its domain's
+virtual finish time by 1 / weight, and the domain with the smallest finish
+time goes next. A large domain therefore can't starve a small one, and a
+small urgent domain is served ahead of bulk work.
+"""
+
+import contextvars
+import math
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import config
+from core.db_logger import ValidationLogger
+from core.verifier import ConsensusVerifier
+
+# Session of the item being verified, so events of the shared adapter reach
+# the right session's log
+_CURRENT_SESSION = contextvars.ContextVar("current_session", default=None)
+
+
+class DomainJob:
+    def __init__(
+        self,
+        name: str,
+        domain_config,
+        priority: int | None = None,
+        weight: float | None = None,
+    ):
+        """
+        One domain to validate in a multi-domain run.
+
+        Args:
+            name: Label used in results and summaries
+            domain_config: Domain config module
+            priority: Higher priorities are always served first (default: the
+                domain's SCHEDULE_PRIORITY, then SCHEDULER_DEFAULT_PRIORITY)
+            weight: Relative share of dispatches within its priority (default: the
+                domain's SCHEDULE_WEIGHT, then SCHEDULER_DEFAULT_WEIGHT)
+        """
+        if priority is None:
+            priority = getattr(
+                domain_config, "SCHEDULE_PRIORITY", config.SCHEDULER_DEFAULT_PRIORITY
+            )
+        if weight is None:
+            weight = getattr(
+                domain_config, "SCHEDULE_WEIGHT", config.SCHEDULER_DEFAULT_WEIGHT
+            )
+        assert weight > 0, f"{name}: weight must be positive"
+        self.name = name
+        self.config = domain_config
+        self.priority = priority
+        self.weight = weight
+        self.items = list(domain_config.ITEMS_TO_VALIDATE)
+        assert self.items, f"{name}: ITEMS_TO_VALIDATE cannot be empty"
+
+
+class FairScheduler:
+    def __init__(self, jobs: list):
+        """Priority + weighted fair queuing over the items of several jobs."""
+        self.jobs = jobs
+        self._next_index = [0] * len(jobs)
+        self._finish = [0.0] * len(jobs)
+        self._lock = threading.Lock()
+
+    def next(self):
+        """Next (job_index, item_index) to dispatch, or None when all are handed out."""
+        with self._lock:
+            best = None
+            for index, job in enumerate(self.jobs):
+                if self._next_index[index] >= len(job.items):
+                    continue
+                key = (-job.priority, self._finish[index] + 1 / job.weight, index)
+                if best is None or key < best[0]:
+                    best = (key, index)
+            if best is None:
+                return None
+
+            index = best[1]
+            self._finish[index] += 1 / self.jobs[index].weight
+            item_index = self._next_index[index]
+            self._next_index[index] += 1
+            return index, item_index
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        """
+        Token bucket shared by all workers.
+
+        Args:
+            rate: Calls per second
+            burst: Bucket size (default: one second of calls)
+        """
+        assert rate > 0, "rate must be positive"
+        self.rate = rate
+        self.capacity = burst or rate
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1):
+        """Block until `tokens` calls may be made."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                # Requests larger than the bucket go through once it is full
+                if self._tokens >= min(tokens, self.capacity):
+                    self._tokens -= tokens
+                    return
+                wait = (min(tokens, self.capacity) - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+class LogWriter:
+    def __init__(self):
+        """Single thread performing every DB write of a run, in submission order."""
+        self._queue = queue.Queue()
+        self.errors = []
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, **kwargs):
+        self._queue.put((fn, args, kwargs))
+
+    def proxy(self, logger: ValidationLogger) -> "_QueuedLogger":
+        """Logger whose writes go through this writer."""
+        return _QueuedLogger(self, logger)
+
+    def close(self):
+        """Wait for queued writes; raises the first write error, if any."""
+        self._queue.put(None)
+        self._thread.join()
+        if self.errors:
+            raise self.errors[0]
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                break
+            fn, args, kwargs = entry
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                self.errors.append(e)
+
+
+class _QueuedLogger:
+    """ValidationLogger stand-in that queues writes and reads directly."""
+
+    _WRITES = (
+        "log_response",
+        "log_failover_event",
+        "store_consensus_memo",
+        "complete_session",
+    )
+
+    def __init__(self, writer: LogWriter, logger: ValidationLogger):
+        self._writer = writer
+        self._logger = logger
+
+    def __getattr__(self, name):
+        attr = getattr(self._logger, name)
+        if name in self._WRITES:
+            return lambda *args, **kwargs: self._writer.submit(attr, *args, **kwargs)
+        return attr
+
+
+class MultiDomainRunner:
+    def __init__(
+        self,
+        jobs: list,
+        adapter=None,
+        iterations: int | None = None,
+        threshold_ratio: float | None = None,
+        workers: int | None = None,
+        rate_limit: float | None = None,
+        on_result=None,
+        **verifier_options,
+    ):
+        """
+        Run several domains over one worker pool, rate limiter and DB writer.
+
+        Args:
+            jobs: DomainJob list
+            adapter: Adapter shared by all domains (default: configured one)
+            iterations: Consensus iterations (uses framework default if None)
+            threshold_ratio: Consensus threshold ratio (uses framework default if None)
+            workers: Items verified concurrently (default: SCHEDULER_WORKERS)
+            rate_limit: Provider calls per second across all domains
+                (default: SCHEDULER_RATE_LIMIT; None = unlimited)
+            on_result: Optional function(job, item, result_data) per finished item
+            **verifier_options: Extra ConsensusVerifier options (engine, multi_sample, ...);
+                the reask policy and memo normalizer default to each domain's
+        """
+        assert jobs, "at least one job is required"
+        self.jobs = jobs
+        self.adapter = adapter or config.get_selected_adapter()
+        self.model_name = getattr(self.adapter, "model_name", None) or (
+            self.adapter.get_params().get("model", "unknown")
+        )
+        self.iterations = iterations or config.CONSENSUS_ITERATIONS
+        threshold_ratio = threshold_ratio or config.CONSENSUS_THRESHOLD_RATIO
+        self.threshold = math.ceil(self.iterations * threshold_ratio)
+        self.workers = workers or config.SCHEDULER_WORKERS
+        rate_limit = config.SCHEDULER_RATE_LIMIT if rate_limit is None else rate_limit
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.on_result = on_result
+        self.verifier_options = verifier_options
+        # (job name, item) in dispatch order
+        self.dispatch_order = []
+
+    def run(self) -> list:
+        """
+        Validate every job's items.
+
+        Returns:
+            One session_info dict per job (as run_validation returns), in job order
+        """
+        writer = LogWriter()
+        sessions = [self._start_session(job, writer) for job in self.jobs]
+
+        # Record failover hops of the shared adapter in the session they belong to
+        previous_on_event = getattr(self.adapter, "on_event", None)
+        if hasattr(self.adapter, "on_event"):
+            self.adapter.on_event = _log_failover_event
+
+        results = [[None] * len(job.items) for job in self.jobs]
+        scheduler = FairScheduler(self.jobs)
+        order_lock = threading.Lock()
+        errors = []
+
+        def worker():
+            while not errors:
+                task = scheduler.next()
+                if task is None:
+                    return
+                job_index, item_index = task
+                job = self.jobs[job_index]
+                session = sessions[job_index]
+                verifier = session["verifier"]
+                item = job.items[item_index]
+                with order_lock:
+                    self.dispatch_order.append((job.name, item))
+                _CURRENT_SESSION.set(session)
+                try:
+                    # The verifier charges the rate limiter per provider call
+                    result_data = verifier.verify(item)
+                except Exception as e:
+                    errors.append(e)
+                    return
+                finally:
+                    _CURRENT_SESSION.set(None)
+                result = {
+                    "item": item,
+                    "consensus": result_data["consensus"],
+                    "history": result_data["history"],
+                }
+                if "memo_session_id" in result_data:
+                    result["memo_session_id"] = result_data["memo_session_id"]
+                results[job_index][item_index] = result
+                if self.on_result:
+                    self.on_result(job, item, result_data)
+
+        threads = [threading.Thread(target=worker) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if hasattr(self.adapter, "on_event"):
+            self.adapter.on_event = previous_on_event
+
+        for session in sessions:
+            session["logger"].complete_session(
+                session["session_id"], api_calls=session["verifier"].api_calls
+            )
+        writer.close()
+        if errors:
+            raise errors[0]
+
+        return [
+            {
+                "domain": job.name,
+                "session_id": session["session_id"],
+                "db_path": session["logger"].db_path,
+                "results": job_results,
+                "model_name": self.model_name,
+                "iterations": self.iterations,
+                "threshold": self.threshold,
+                "api_calls": session["verifier"].api_calls,
+                "reask_calls": session["verifier"].reask_calls,
+            }
+            for job, session, job_results in zip(self.jobs, sessions, results)
+        ]
+
+    def _start_session(self, job: DomainJob, writer: LogWriter) -> dict:
+        logger = ValidationLogger(config.get_db_path(job.config))
+        task = job.config.VALIDATION_TASK
+        session_id = f"{task.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        logger.start_session(
+            session_id=session_id,
+            total_items=len(job.items),
+            consensus_iterations=self.iterations,
+            consensus_threshold=self.threshold,
+            validation_task=task,
+            adapter_type=self.adapter.__class__.__name__,
+            model_name=self.model_name,
+        )
+        queued_logger = writer.proxy(logger)
+        verifier = ConsensusVerifier(
+            adapter=self.adapter,
+            schema=job.config.VALIDATION_SCHEMA,
+            validation_task=task,
+            iterations=self.iterations,
+            threshold=self.threshold,
+            logger=queued_logger,
+            session_id=session_id,
+            model_name=self.model_name,
+            rate_limiter=self.rate_limiter,
+            **{
+                "memo_normalizer": getattr(job.config, "ITEM_NORMALIZER", None),
+                **config.get_reask_policy(job.config),
+                **self.verifier_options,
+            },
+        )
+        return {"session_id": session_id, "logger": queued_logger, "verifier": verifier}
+
+
+def _log_failover_event(event: dict):
+    """FailoverAdapter.on_event handler: log to the current item's session."""
+    session = _CURRENT_SESSION.get()
+    if session is not None:
+        session["logger"].log_failover_event(session["session_id"], **event)
+
+
+def parse_domain_spec(spec: str) -> tuple:
+    """
+    Parse "domain[:weight=W][,priority=P]" (e.g. "product_review:weight=3,priority=1").
+
+    Returns:
+        (domain, options dict with optional "weight" and "priority")
+    """
+    domain, _, options_text = spec.partition(":")
+    options = {}
+    for option in filter(None, options_text.split(",")):
+        key, _, value = option.partition("=")
+        key = key.strip()
+        if key == "weight":
+            options["weight"] = float(value)
+        elif key == "priority":
+            options["priority"] = int(value)
+        else:
+            raise ValueError(f"Unknown domain option '{key}' in '{spec}'")
+    return domain, options
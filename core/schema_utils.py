@@ -0,0 +1,60 @@
+"""
+Helpers for inspecting Pydantic validation schemas.
+"""
+
+import json
+import hashlib
+import weakref
+from typing import Type
+from pydantic import BaseModel, create_model
+
+# Weak keys: classes made with create_model can be collected once unused
+_fingerprints = weakref.WeakKeyDictionary()
+# schema -> {field names: reduced class}; the reduced classes don't refer
+# back to their schema, so they don't keep it alive
+_sub_schemas = weakref.WeakKeyDictionary()
+
+
+def schema_fingerprint(schema: Type[BaseModel]) -> str:
+    """
+    Structural hash of a schema.
+
+    Two schema classes with the same JSON schema (names, types, descriptions)
+    share a fingerprint; any change to a field changes it.
+    """
+    fingerprint = _fingerprints.get(schema)
+    if fingerprint is None:
+        schema_json = json.dumps(schema.model_json_schema(), sort_keys=True)
+        fingerprint = hashlib.sha256(schema_json.encode("utf-8")).hexdigest()
+        _fingerprints[schema] = fingerprint
+    return fingerprint
+
+
+def _sub_schema(schema: Type[BaseModel], field_names: tuple) -> Type[BaseModel]:
+    cached = _sub_schemas.setdefault(schema, {})
+    reduced = cached.get(field_names)
+    if reduced is None:
+        # setdefault: concurrent first calls still end up sharing one class
+        reduced = cached.setdefault(field_names, _make_sub_schema(schema, field_names))
+    return reduced
+
+
+def _make_sub_schema(schema: Type[BaseModel], field_names: tuple) -> Type[BaseModel]:
+    fields = {
+        name: (info.annotation, info)
+        for name, info in schema.model_fields.items()
+        if name in field_names
+    }
+    return create_model(f"{schema.__name__}Subset", __doc__=schema.__doc__, **fields)
+
+
+def sub_schema(schema: Type[BaseModel], field_names) -> Type[BaseModel]:
+    """
+    Reduced copy of a schema with only some fields (types and descriptions kept).
+
+    The same field set always returns the same class, so its Guard is shared.
+    """
+    unknown = set(field_names) - set(schema.model_fields)
+    assert not unknown, f"Unknown fields for {schema.__name__}: {sorted(unknown)}"
+    ordered = tuple(name for name in schema.model_fields if name in set(field_names))
+    return _sub_schema(schema, ordered)
@@ -0,0 +1,380 @@
+"""
+Long-running validation service.
+
+Domain configs, Guards and verifiers are loaded once at startup. Validation
+requests arriving within a short window are micro-batched per domain:
+duplicate items in a batch are verified once. Each domain logs to one
+session per SERVICE_SESSION_SECONDS window, with its own verifier so the
+session's call counters stay separate. Exposed over a local HTTP/JSON API (stdlib http.server):
+
+    POST /validate   {"domain": "superhero", "items": ["Superman", ...]}
+    GET  /health
+    GET  /stats
+"""
+
+import json
+import math
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import config
+from core.db_logger import ValidationLogger
+from core.guard_cache import warm_guard_cache
+from core.verifier import ConsensusVerifier
+
+
+class MicroBatcher:
+    def __init__(self, process_batch, window: float = 0.005, max_batch: int = 32):
+        """
+        Collect submitted items into small batches on a background thread.
+
+        Args:
+            process_batch: Function(list of (item, Future)) called per batch; it
+                must not block (hand the work to a pool)
+            window: Seconds to wait for more items after the first one arrives
+            max_batch: Dispatch early once this many items are queued
+        """
+        assert window >= 0, "window cannot be negative"
+        assert max_batch > 0, "max_batch must be at least 1"
+        self.process_batch = process_batch
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self):
+        """Flush queued items and stop the batching thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            entry = self._queue.get()
+            if entry is None:
+                break
+            batch = [entry]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=max(remaining, 0))
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self.process_batch(batch)
+
+
+class _Domain:
+    """Warm per-domain state: logger, batcher and the open session."""
+
+    def __init__(self, name, domain_config, logger, batcher):
+        self.name = name
+        self.config = domain_config
+        self.logger = logger
+        self.batcher = batcher
+        self.session = None
+        self.requests = 0
+        self.items = 0
+        self.batches = 0
+        self.verified = 0
+
+
+class ValidationService:
+    def __init__(
+        self,
+        domains=None,
+        adapter=None,
+        iterations: int | None = None,
+        threshold_ratio: float | None = None,
+        batch_window: float | None = None,
+        max_batch: int | None = None,
+        workers: int | None = None,
+        session_seconds: float | None = None,
+        **verifier_options,
+    ):
+        """
+        Load domains and build warm verifiers.
+
+        Args:
+            domains: Registered domain names or module paths, or a dict of
+                name -> domain config module (default: every registered domain)
+            adapter: Adapter instance shared by all domains (default: configured one)
+            iterations: Consensus iterations (uses framework default if None)
+            threshold_ratio: Consensus threshold ratio (uses framework default if None)
+            batch_window: Seconds to collect a micro-batch (default: SERVICE_BATCH_WINDOW_MS)
+            max_batch: Max items per micro-batch (default: SERVICE_MAX_BATCH)
+            workers: Items verified concurrently (default: SERVICE_WORKERS)
+            session_seconds: Lifetime of a domain's logging session; 0 keeps one
+                session per domain until close() (default: SERVICE_SESSION_SECONDS)
+            **verifier_options: Extra ConsensusVerifier options (engine, prompt_layout, ...)
+        """
+        if domains is None:
+            domains = list(config.DOMAIN_REGISTRY)
+        if not isinstance(domains, dict):
+            domains = {name: config.load_domain_config(name) for name in domains}
+        assert domains, "at least one domain is required"
+
+        self.adapter = adapter or config.get_selected_adapter()
+        self.model_name = getattr(self.adapter, "model_name", None) or (
+            self.adapter.get_params().get("model", "unknown")
+        )
+        self.iterations = iterations or config.CONSENSUS_ITERATIONS
+        threshold_ratio = threshold_ratio or config.CONSENSUS_THRESHOLD_RATIO
+        self.threshold = math.ceil(self.iterations * threshold_ratio)
+        if batch_window is None:
+            batch_window = config.SERVICE_BATCH_WINDOW_MS / 1000
+        max_batch = max_batch or config.SERVICE_MAX_BATCH
+        if session_seconds is None:
+            session_seconds = config.SERVICE_SESSION_SECONDS
+        self.session_seconds = session_seconds
+        self.verifier_options = verifier_options
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or config.SERVICE_WORKERS
+        )
+        self._lock = threading.Lock()
+
+        warm_guard_cache(domains.values())
+        self.domains = {}
+        for name, domain_config in domains.items():
+            logger = ValidationLogger(config.get_db_path(domain_config))
+            domain = _Domain(name, domain_config, logger, None)
+            domain.batcher = MicroBatcher(
+                lambda batch, domain=domain: self._process_batch(domain, batch),
+                window=batch_window,
+                max_batch=max_batch,
+            )
+            self.domains[name] = domain
+
+    def submit(self, domain_name: str, items: list) -> list:
+        """Queue items for validation; returns one Future per item."""
+        domain = self.domains.get(domain_name)
+        if domain is None:
+            raise ValueError(f"Unknown domain: {domain_name}")
+        if not isinstance(items, list) or not items:
+            raise TypeError("items must be a non-empty list")
+        if not all(isinstance(item, str) and item for item in items):
+            raise TypeError("items must be non-empty strings")
+        with self._lock:
+            domain.requests += 1
+            domain.items += len(items)
+        return [domain.batcher.submit(item) for item in items]
+
+    def validate(
+        self, domain_name: str, items: list, timeout: float | None = None
+    ) -> list:
+        """
+        Validate items and wait for the results.
+
+        Returns:
+            One dict per item, in order: item, consensus, history, session_id
+        """
+        futures = self.submit(domain_name, items)
+        return [future.result(timeout=timeout) for future in futures]
+
+    def stats(self) -> dict:
+        """Per-domain request, item, batch and verified-item counts."""
+        with self._lock:
+            return {
+                name: {
+                    "requests": domain.requests,
+                    "items": domain.items,
+                    "batches": domain.batches,
+                    "verified": domain.verified,
+                }
+                for name, domain in self.domains.items()
+            }
+
+    def close(self):
+        """Finish queued work, stop background threads and complete open sessions."""
+        for domain in self.domains.values():
+            domain.batcher.close()
+        self._executor.shutdown(wait=True)
+        for domain in self.domains.values():
+            with self._lock:
+                session, domain.session = domain.session, None
+            if session is not None:
+                self._complete_session(domain, session)
+
+    def _start_session(self, domain: _Domain) -> dict:
+        """Log a new session for a domain, with a verifier of its own."""
+        task = domain.config.VALIDATION_TASK
+        session_id = f"{task.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        domain.logger.start_session(
+            session_id=session_id,
+            total_items=0,
+            consensus_iterations=self.iterations,
+            consensus_threshold=self.threshold,
+            validation_task=task,
+            adapter_type=self.adapter.__class__.__name__,
+            model_name=self.model_name,
+        )
+        # The Guard comes from the shared cache, so a verifier is cheap to build
+        verifier = ConsensusVerifier(
+            adapter=self.adapter,
+            schema=domain.config.VALIDATION_SCHEMA,
+            validation_task=task,
+            iterations=self.iterations,
+            threshold=self.threshold,
+            logger=domain.logger,
+            session_id=session_id,
+            model_name=self.model_name,
+            **{**config.get_reask_policy(domain.config), **self.verifier_options},
+        )
+        return {
+            "session_id": session_id,
+            "verifier": verifier,
+            "started": time.monotonic(),
+            "items": 0,
+            # Items still being verified, and whether a newer session replaced this one
+            "in_flight": 0,
+            "retired": False,
+        }
+
+    def _complete_session(self, domain: _Domain, session: dict):
+        domain.logger.complete_session(
+            session["session_id"],
+            api_calls=session["verifier"].api_calls,
+            total_items=session["items"],
+        )
+
+    def _session_for(self, domain: _Domain, items: int) -> tuple:
+        """
+        The domain's open session, rotated once it is older than session_seconds.
+
+        Returns:
+            (session, retired session to complete now or None)
+        """
+        finished = None
+        with self._lock:
+            session = domain.session
+            expired = (
+                session is not None
+                and self.session_seconds > 0
+                and time.monotonic() - session["started"] >= self.session_seconds
+            )
+            if expired:
+                session["retired"] = True
+                if session["in_flight"] == 0:
+                    finished = session
+                session = None
+            if session is None:
+                session = domain.session = self._start_session(domain)
+            session["items"] += items
+            session["in_flight"] += items
+        return session, finished
+
+    def _process_batch(self, domain: _Domain, batch: list):
+        """Verify each distinct item of a batch once, in the domain's session."""
+        groups = {}
+        for item, future in batch:
+            groups.setdefault(item, []).append(future)
+
+        session, finished = self._session_for(domain, len(groups))
+        if finished is not None:
+            self._complete_session(domain, finished)
+        session_id = session["session_id"]
+
+        with self._lock:
+            domain.batches += 1
+            domain.verified += len(groups)
+
+        def resolve(item, futures, task_future):
+            try:
+                result = task_future.result()
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future in futures:
+                    future.set_result(
+                        {"item": item, **result, "session_id": session_id}
+                    )
+            with self._lock:
+                session["in_flight"] -= 1
+                done = session["retired"] and session["in_flight"] == 0
+            if done:
+                self._complete_session(domain, session)
+
+        for item, futures in groups.items():
+            task_future = self._executor.submit(session["verifier"].verify, item)
+            task_future.add_done_callback(
+                lambda f, item=item, futures=futures: resolve(item, futures, f)
+            )
+
+
+def make_handler(service: ValidationService, request_timeout: float | None = None):
+    """HTTP request handler class bound to a service."""
+    request_timeout = request_timeout or config.SERVICE_REQUEST_TIMEOUT_SECONDS
+
+    class ValidationHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "domains": list(service.domains)})
+            elif self.path == "/stats":
+                self._send(200, service.stats())
+            else:
+                self._send(404, {"error": f"Not found: {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/validate":
+                self._send(404, {"error": f"Not found: {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(body, dict):
+                    raise TypeError("request body must be a JSON object")
+                results = service.validate(
+                    body.get("domain"), body.get("items"), timeout=request_timeout
+                )
+            except (ValueError, TypeError) as e:
+                self._send(400, {"error": str(e)})
+            except TimeoutError:
+                self._send(
+                    504, {"error": f"validation exceeded {request_timeout} seconds"}
+                )
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+            else:
+                self._send(200, {"results": results})
+
+        def _send(self, status: int, payload: dict):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            # Keep the request path quiet; errors are returned to the client
+            pass
+
+    return ValidationHandler
+
+
+def create_server(
+    service: ValidationService,
+    host: str | None = None,
+    port: int | None = None,
+    request_timeout: float | None = None,
+) -> ThreadingHTTPServer:
+    """HTTP server for a service (port 0 picks a free port)."""
+    host = host or config.SERVICE_HOST
+    port = config.SERVICE_PORT if port is None else port
+    return ThreadingHTTPServer((host, port), make_handler(service, request_timeout))
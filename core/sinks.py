@@ -0,0 +1,304 @@
+"""
+Result sinks.
+
+Sinks receive each item's result off the hot path: run_validation hands
+results to a SinkDispatcher, which queues them and feeds every sink in
+batches from a background thread. A slow terminal or disk no longer holds
+up the next LLM call. Several sinks can run at once:
+
+    JsonlSink      one JSON line per item (consensus, optionally history)
+    CsvSink        one row per item with the consensus fields
+    SqliteSink     item_consensus table of a validation database
+    ProgressSink   throttled progress bar with throughput and ETA
+
+A sink implements open(context), write_batch(records) and close(). A sink
+whose write fails is logged and gets no further batches; the others carry on
+and the first error is raised when the dispatcher closes. Records
+are dicts with session_id, position, item, consensus, history, plus the
+optional result keys (canonical_item, iterations, memo_session_id, ...).
+"""
+
+import csv
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import ExitStack
+
+SINK_TYPES = ("jsonl", "csv", "sqlite", "progress")
+
+logger = logging.getLogger(__name__)
+
+
+class ResultSink:
+    """Base class: every method is optional."""
+
+    def open(self, context: dict):
+        """
+        Called once before the first record.
+
+        Args:
+            context: session_id, validation_task, field_names, total_items
+        """
+
+    def write_batch(self, records: list):
+        pass
+
+    def close(self):
+        pass
+
+
+class JsonlSink(ResultSink):
+    def __init__(self, path: str, include_history: bool = True):
+        self.path = path
+        self.include_history = include_history
+        self._file = None
+
+    def open(self, context: dict):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def write_batch(self, records: list):
+        lines = []
+        for record in records:
+            record = dict(record)
+            if self.include_history:
+                # Compact history records are Mappings, not dicts
+                record["history"] = [dict(entry) for entry in record["history"]]
+            else:
+                record.pop("history", None)
+            lines.append(json.dumps(record, default=str) + "\n")
+        self._file.writelines(lines)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+class CsvSink(ResultSink):
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._writer = None
+        self._field_names = []
+
+    def open(self, context: dict):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._field_names = list(context["field_names"])
+        self._file = open(self.path, "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(["position", "item", *self._field_names, "calls"])
+
+    def write_batch(self, records: list):
+        self._writer.writerows(
+            [
+                record["position"],
+                record["item"],
+                *(record["consensus"].get(key) for key in self._field_names),
+                len(record["history"]),
+            ]
+            for record in records
+        )
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+class SqliteSink(ResultSink):
+    def __init__(self, db_path: str):
+        """Write each item's consensus to the item_consensus table of db_path."""
+        self.db_path = db_path
+        self._logger = None
+        self._session_id = None
+
+    def open(self, context: dict):
+        from core.db_logger import ValidationLogger
+
+        self._logger = ValidationLogger(self.db_path)
+        self._session_id = context["session_id"]
+
+    def write_batch(self, records: list):
+        self._logger.log_item_consensus(
+            self._session_id,
+            [
+                (
+                    record["position"],
+                    record["item"],
+                    record["consensus"],
+                    len(record["history"]),
+                )
+                for record in records
+            ],
+        )
+
+
+class ProgressSink(ResultSink):
+    def __init__(self, interval: float = 0.5, width: int = 30, stream=None):
+        """
+        Args:
+            interval: Minimum seconds between redraws
+            width: Bar width in characters
+            stream: Output stream (default: stderr)
+        """
+        self.interval = interval
+        self.width = width
+        self.stream = stream or sys.stderr
+        self.total = 0
+        self.done = 0
+        self._started = None
+        self._last_draw = 0.0
+
+    def open(self, context: dict):
+        self.total = context["total_items"]
+        self._started = time.monotonic()
+
+    def write_batch(self, records: list):
+        self.done += len(records)
+        now = time.monotonic()
+        if now - self._last_draw >= self.interval:
+            self._last_draw = now
+            self._draw(now)
+
+    def close(self):
+        if self._started is not None:
+            self._draw(time.monotonic())
+            self.stream.write("\n")
+            self.stream.flush()
+
+    def _draw(self, now: float):
+        elapsed = max(now - self._started, 1e-9)
+        rate = self.done / elapsed
+        filled = int(self.width * self.done / self.total) if self.total else self.width
+        remaining = self.total - self.done
+        eta = _format_seconds(remaining / rate) if rate and remaining > 0 else "0s"
+        self.stream.write(
+            f"\r[{'#' * filled}{'-' * (self.width - filled)}] "
+            f"{self.done}/{self.total}  {rate:.1f} items/s  ETA {eta}"
+        )
+        self.stream.flush()
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
+
+
+class SinkDispatcher:
+    def __init__(
+        self,
+        sinks: list,
+        context: dict,
+        max_batch: int = 256,
+        max_queued: int = 4096,
+    ):
+        """
+        Feed results to sinks from a background thread.
+
+        Args:
+            sinks: ResultSink instances
+            context: Passed to every sink's open()
+            max_batch: Most records handed to a sink per write_batch call
+            max_queued: Records queued before submit() waits for the sinks
+                (bounds memory when sinks fall behind)
+
+        Raises:
+            Whatever a sink's open() raises, after closing the sinks already opened
+        """
+        assert max_batch > 0, "max_batch must be at least 1"
+        assert max_queued > 0, "max_queued must be at least 1"
+        self.sinks = sinks
+        self.max_batch = max_batch
+        self.errors = []
+        self._queue = queue.Queue(maxsize=max_queued)
+        # Sinks that failed a write and get no further batches
+        self._failed = set()
+        with ExitStack() as stack:
+            for sink in sinks:
+                sink.open(context)
+                stack.callback(sink.close)
+            # Every sink is open: close() takes over closing them
+            stack.pop_all()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, record: dict):
+        """Queue a record; waits only while max_queued records are pending."""
+        self._queue.put(record)
+
+    def close(self, raise_errors: bool = True):
+        """Drain queued records and close every sink; raises the first sink error."""
+        self._queue.put(None)
+        self._thread.join()
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                # Any sink failure: the remaining sinks still get closed
+                logger.exception("Closing %s failed", type(sink).__name__)
+                self.errors.append(e)
+        if self.errors and raise_errors:
+            raise self.errors[0]
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            record = self._queue.get()
+            if record is None:
+                break
+            batch = [record]
+            # Whatever else is already queued goes in the same batch
+            while len(batch) < self.max_batch:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stopping = True
+                    break
+                batch.append(record)
+            for index, sink in enumerate(self.sinks):
+                if index in self._failed:
+                    continue
+                try:
+                    sink.write_batch(batch)
+                except Exception as e:
+                    # Any sink failure: keep feeding the other sinks, and keep
+                    # draining the queue so submit() never blocks on a dead thread
+                    logger.exception(
+                        "%s failed; it gets no further records", type(sink).__name__
+                    )
+                    self._failed.add(index)
+                    self.errors.append(e)
+
+
+def make_sink(spec: str, db_path: str | None = None) -> ResultSink:
+    """
+    Build a sink from a CLI spec: "jsonl:PATH", "csv:PATH", "sqlite[:DB_PATH]"
+    or "progress".
+
+    Args:
+        spec: Sink spec
+        db_path: Database for "sqlite" without a path (the run's database)
+    """
+    kind, _, target = spec.partition(":")
+    if kind not in SINK_TYPES:
+        raise ValueError(f"Unknown sink '{kind}' (choose from {', '.join(SINK_TYPES)})")
+    if kind in ("jsonl", "csv") and not target:
+        raise ValueError(f"Sink '{kind}' needs a path, e.g. {kind}:data/results.{kind}")
+    if kind == "jsonl":
+        return JsonlSink(target)
+    if kind == "csv":
+        return CsvSink(target)
+    if kind == "sqlite":
+        assert target or db_path, "sqlite sink needs a database path"
+        return SqliteSink(target or db_path)
+    return ProgressSink()
@@ -0,0 +1,226 @@
+"""
+Streaming consensus samples.
+
+With streaming on, an item's iterations are requested as concurrent streams
+(adapter.stream) instead of blocking completions. Each stream's JSON object
+is parsed field by field as chunks arrive (IncrementalFieldParser). That
+gives the time to the first field, and a sample is complete as soon as every
+schema field has been read; trailing tokens are not waited for.
+
+After each completed sample the votes are checked. Once no outcome of the
+samples still pending could change the consensus (is_decided), running
+streams are closed at their next chunk and queued ones never start. The
+consensus of the completed samples is then the one the full run would give.
+"""
+
+import contextvars
+import json
+import threading
+import time
+from collections import Counter
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def _skip(text: str, pos: int, chars: str) -> int:
+    while pos < len(text) and text[pos] in chars:
+        pos += 1
+    return pos
+
+
+class IncrementalFieldParser:
+    def __init__(self):
+        """Parse the top-level members of a JSON object from text arriving in chunks."""
+        self.text = ""
+        self.fields = {}
+        # The object was closed, or is malformed and can't be parsed further
+        self.closed = False
+        # Start of the next member in text (None until "{" arrives)
+        self._pos = None
+
+    def feed(self, chunk: str) -> dict:
+        """Add a chunk of text. Returns the fields it completed."""
+        self.text += chunk
+        new_fields = {}
+        if self._pos is None:
+            start = self.text.find("{")
+            if start < 0:
+                return new_fields
+            self._pos = start + 1
+
+        text = self.text
+        while not self.closed:
+            pos = _skip(text, self._pos, _WHITESPACE + ",")
+            if pos >= len(text):
+                break
+            if text[pos] == "}":
+                self.closed = True
+                break
+            try:
+                key, end = _DECODER.raw_decode(text, pos)
+                colon = _skip(text, end, _WHITESPACE)
+                if colon >= len(text):
+                    break
+                if not isinstance(key, str) or text[colon] != ":":
+                    self.closed = True
+                    break
+                value, end = _DECODER.raw_decode(
+                    text, _skip(text, colon + 1, _WHITESPACE)
+                )
+            except ValueError:
+                # Member still incomplete (or malformed): wait for more text
+                break
+            # "12" may continue as "123" or "12.5": numbers need a delimiter after them
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and (end >= len(text) or text[end] not in _WHITESPACE + ",}")
+            ):
+                break
+            self.fields[key] = value
+            new_fields[key] = value
+            self._pos = end
+        return new_fields
+
+
+def is_decided(history: list, field_names: list, threshold: int, pending: int) -> bool:
+    """
+    Whether `pending` more samples can no longer change the consensus of
+    `history` (as ConsensusVerifier._calculate_consensus computes it).
+
+    A field is decided when its leading answer has reached the threshold and
+    leads by more than `pending` votes, or when no answer can reach the
+    threshold any more (ambiguous).
+    """
+    valid = [res for res in history if "error" not in res]
+    for key in field_names:
+        votes = Counter(res[key] for res in valid if key in res)
+        if not votes:
+            return False
+        counts = [count for _, count in votes.most_common(2)]
+        top = counts[0]
+        runner_up = counts[1] if len(counts) > 1 else 0
+        if top >= threshold and top > runner_up + pending:
+            continue
+        if top + pending < threshold:
+            continue
+        return False
+    return True
+
+
+class StreamingSampler:
+    def __init__(
+        self,
+        verifier,
+        item_name: str,
+        iterations: int,
+        concurrency: int | None = None,
+    ):
+        """
+        Stream `iterations` samples of an item, stopping once consensus is decided.
+
+        Args:
+            verifier: ConsensusVerifier whose adapter, prompt, validation and
+                logging are used
+            item_name: Item to sample
+            iterations: Samples planned (the threshold is scaled to them)
+            concurrency: Streams open at once (None: all iterations)
+        """
+        assert concurrency is None or concurrency > 0, "concurrency must be positive"
+        self.verifier = verifier
+        self.item_name = item_name
+        self.iterations = iterations
+        self.threshold = verifier.threshold_for(iterations)
+        self.field_names = list(verifier.schema.model_fields)
+        self._slots = threading.Semaphore(concurrency or iterations)
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        # iteration number -> history entry of each completed sample
+        self._done = {}
+        self._first_field = None
+        self._started = None
+
+    def run(self) -> dict:
+        """
+        Returns:
+            dict with 'history' (completed samples in iteration order),
+            'cancelled' (samples cancelled in flight or never started) and
+            'time_to_first_field' (seconds from the start; None if no field arrived)
+        """
+        self._started = time.monotonic()
+        # Each stream runs in the caller's context (e.g. the scheduler's session)
+        threads = [
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(self._run_sample, iteration),
+            )
+            for iteration in range(1, self.iterations + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        history = [self._done[iteration] for iteration in sorted(self._done)]
+        return {
+            "history": history,
+            "cancelled": self.iterations - len(history),
+            "time_to_first_field": self._first_field,
+        }
+
+    def _run_sample(self, iteration: int):
+        with self._slots:
+            if self._cancel.is_set():
+                return
+            res, metadata = self._stream()
+            if res is None:
+                return
+            self.verifier._log_result(self.item_name, iteration, res, metadata)
+            with self._lock:
+                self._done[iteration] = self.verifier._compact(res)
+                pending = self.iterations - len(self._done)
+                if pending and is_decided(
+                    list(self._done.values()), self.field_names, self.threshold, pending
+                ):
+                    self._cancel.set()
+
+    def _stream(self) -> tuple:
+        """One streamed sample: (result or None if cancelled, log metadata)."""
+        verifier = self.verifier
+        verifier._count_calls(1)
+        started = time.monotonic()
+        parser = IncrementalFieldParser()
+        first_field = None
+        try:
+            chunks = verifier.adapter.stream(verifier._build_messages(self.item_name))
+            try:
+                for chunk in chunks:
+                    if parser.feed(chunk) and first_field is None:
+                        first_field = time.monotonic()
+                    if all(key in parser.fields for key in self.field_names):
+                        break
+                    if self._cancel.is_set():
+                        return None, None
+            finally:
+                # Closing the stream stops generation on the provider side
+                close = getattr(chunks, "close", None)
+                if close:
+                    close()
+
+            complete = all(key in parser.fields for key in self.field_names)
+            res = verifier._validate_output(
+                json.dumps(parser.fields) if complete else parser.text
+            )
+            if not isinstance(res, dict):
+                res = res.dict()
+        except Exception as e:
+            res = {"error": str(e)}
+
+        if first_field is None:
+            return res, None
+        with self._lock:
+            since_start = first_field - self._started
+            if self._first_field is None or since_start < self._first_field:
+                self._first_field = since_start
+        return res, {"time_to_first_field_ms": round((first_field - started) * 1000, 1)}
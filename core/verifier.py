@@ -1,13 +1,39 @@
+import threading
 import time
 from collections import Counter
 from typing import Type
-from guardrails import Guard
 from pydantic import BaseModel
+from core.guard_cache import get_guard
+from core.fast_path import VALIDATION_ENGINES, fast_validate, is_flat_schema
+from core.compact_format import OUTPUT_FORMATS, get_codec
+from core.compact_history import get_layout, record_votes
+from core.consensus_memo import consensus_policy, is_decisive, memo_key
+from core.schema_utils import schema_fingerprint
+from llm_adapters import cached_prompt_tokens
+
+# "inline": one user message with the item inside the instructions (original).
+# "prefix": the instructions form a byte-identical system message shared by
+# every call, and the item follows as a short user message, so providers can
+# reuse the cached prefix.
+PROMPT_LAYOUTS = ("inline", "prefix")
+
+# What a guarded answer that fails validation gets (see config.REASK_MODE):
+# "reask": Guardrails' correction prompt; "resample": the original prompt again.
+REASK_MODES = ("reask", "resample")
 
 
 class HeroVerifier:
     def __init__(
-        self, adapter, schema: Type[BaseModel], validation_task: str = "validation"
+        self,
+        adapter,
+        schema: Type[BaseModel],
+        validation_task: str = "validation",
+        engine: str = "guard",
+        prompt_layout: str = "inline",
+        output_format: str = "json",
+        num_reasks: int = 1,
+        full_schema_reask: bool | None = None,
+        reask_mode: str = "reask",
     ):
         """
         Initialize verifier with an adapter and Pydantic schema.
@@ -16,25 +42,94 @@ class HeroVerifier:
             adapter: LLM adapter instance
             schema: Pydantic model class to validate against
             validation_task: Description of what's being validated (e.g., "superhero capabilities")
+            engine: "guard" (full Guardrails pipeline) or "fast" (direct completion +
+                pydantic JSON validation for flat schemas, Guard only on failure)
+            prompt_layout: "inline" or "prefix" (cache-friendly system prefix, see PROMPT_LAYOUTS)
+            output_format: "json" or "compact" (positional array decoded before
+                consensus, see core.compact_format; flat schemas only)
+            num_reasks: Re-asks per guarded call whose answer fails validation
+            full_schema_reask: Re-ask for the whole object (True) or only the
+                failing fields (False); None keeps the Guardrails default
+            reask_mode: "reask" or "resample" (see REASK_MODES)
         """
+        assert engine in VALIDATION_ENGINES, (
+            f"engine must be one of {VALIDATION_ENGINES}"
+        )
+        assert prompt_layout in PROMPT_LAYOUTS, (
+            f"prompt_layout must be one of {PROMPT_LAYOUTS}"
+        )
+        assert output_format in OUTPUT_FORMATS, (
+            f"output_format must be one of {OUTPUT_FORMATS}"
+        )
+        assert output_format != "compact" or is_flat_schema(schema), (
+            "compact output_format requires a flat schema"
+        )
+        assert num_reasks >= 0, "num_reasks cannot be negative"
+        assert reask_mode in REASK_MODES, f"reask_mode must be one of {REASK_MODES}"
         self.adapter = adapter
         self.schema = schema
         self.validation_task = validation_task
-        self.guard = Guard.for_pydantic(output_class=schema)
+        self.engine = engine
+        self.prompt_layout = prompt_layout
+        self.output_format = output_format
+        self.num_reasks = num_reasks
+        self.full_schema_reask = full_schema_reask
+        self.reask_mode = reask_mode
+        # Provider calls behind each thread's latest guarded call (reasks included)
+        self._guard_calls = threading.local()
+        # schema -> system prompt, built once so the prefix stays byte-identical
+        self._system_prompts = {}
+        # Shared per schema; guardrails itself is only imported on first use
+        self.guard = get_guard(schema)
 
     def verify(self, item_name: str) -> dict:
         """Single check verifier (legacy)."""
-        return self._call_guard(item_name)
+        return self._call(item_name)[0]
 
-    def _generate_prompt(self, item_name: str) -> str:
-        """Generate prompt dynamically based on schema."""
-        # Get field information from schema
+    def _use_fast_path(self, schema: Type[BaseModel] | None = None) -> bool:
+        return self.engine == "fast" and is_flat_schema(schema or self.schema)
+
+    def _uses_completion(self, schema: Type[BaseModel] | None = None) -> bool:
+        """Whether calls go straight to adapter.complete instead of the Guard."""
+        return self.output_format == "compact" or self._use_fast_path(schema)
+
+    def _call(self, item_name: str, schema: Type[BaseModel] | None = None) -> tuple:
+        """
+        One LLM call for an item, validated by the configured engine.
+
+        Returns:
+            (validated dict, provider calls made; more than 1 after reasks)
+        """
+        if self._uses_completion(schema):
+            text = self.adapter.complete(self._build_messages(item_name, schema))[0]
+            return self._validate_output(text, schema), 1
+        self._guard_calls.count = 1
+        res = self._call_guard(item_name, schema)
+        return res, self._guard_calls.count
+
+    def _fields_text(self, schema: Type[BaseModel]) -> str:
+        """Field list for the prompt, one "name: description" line per field."""
         fields_desc = []
-        for field_name, field_info in self.schema.model_fields.items():
+        for field_name, field_info in schema.model_fields.items():
             desc = field_info.description or field_name
             fields_desc.append(f"  - {field_name}: {desc}")
 
-        fields_text = "\n".join(fields_desc)
+        return "\n".join(fields_desc)
+
+    def _output_instructions(self, schema: Type[BaseModel]) -> str:
+        """Closing instructions describing the expected answer format."""
+        if self.output_format == "compact":
+            return f"{get_codec(schema).instructions()}\nBe factual and precise."
+        return "Return ONLY valid JSON matching the required schema. Be factual and precise."
+
+    def _generate_prompt(
+        self, item_name: str, schema: Type[BaseModel] | None = None
+    ) -> str:
+        """Generate prompt dynamically based on schema (defaults to the verifier's)."""
+        schema = schema or self.schema
+
+        # Get field information from schema
+        fields_text = self._fields_text(schema)
 
         # Generate prompt
 
@@ -45,16 +140,107 @@ Analyze the following item: "{item_name}"
 Determine the following attributes accurately:
 {fields_text}
 
-Return ONLY valid JSON matching the required schema. Be factual and precise."""
+{self._output_instructions(schema)}"""
+
+        return prompt
+
+    def _system_prompt(self, schema: Type[BaseModel] | None = None) -> str:
+        """Item-independent instructions used as the shared prefix ("prefix" layout)."""
+        schema = schema or self.schema
+        prompt = self._system_prompts.get(schema)
+        if prompt is None:
+            prompt = f"""You are an expert at analyzing and validating information for {self.validation_task}.
+
+The user gives one item to analyze. Determine the following attributes accurately:
+{self._fields_text(schema)}
 
+{self._output_instructions(schema)}"""
+            self._system_prompts[schema] = prompt
         return prompt
 
-    def _call_guard(self, item_name: str) -> dict:
-        prompt = self._generate_prompt(item_name)
+    def _build_messages(
+        self, item_name: str, schema: Type[BaseModel] | None = None
+    ) -> list:
+        """Chat messages sent for an item."""
+        if self.prompt_layout == "prefix":
+            return [
+                {"role": "system", "content": self._system_prompt(schema)},
+                {
+                    "role": "user",
+                    "content": f'Analyze the following item: "{item_name}"',
+                },
+            ]
+        return [{"role": "user", "content": self._generate_prompt(item_name, schema)}]
+
+    def _with_cache_usage(self, metadata: dict | None) -> dict | None:
+        """Add the prefix-cache hit tokens of the adapter's last completion, if reported."""
+        cached = cached_prompt_tokens(getattr(self.adapter, "last_usage", None))
+        if cached is None:
+            return metadata
+        return {**(metadata or {}), "cached_tokens": cached}
+
+    def _call_guard(
+        self, item_name: str, schema: Type[BaseModel] | None = None
+    ) -> dict:
+        """Guarded call under the reask policy; its provider calls go to _guard_calls."""
+        # A reduced schema (e.g. ambiguous fields only) gets its own shared Guard
+        guard = get_guard(schema) if schema is not None else self.guard
         guard_kwargs = self.adapter.get_params()
-        res = self.guard(messages=[{"role": "user", "content": prompt}], **guard_kwargs)
+        messages = self._build_messages(item_name, schema)
+        if self.reask_mode == "resample":
+            # Failed answers are replaced by fresh answers to the original prompt
+            provider_calls = 0
+            for _ in range(self.num_reasks + 1):
+                res = guard(messages=messages, num_reasks=0, **guard_kwargs)
+                provider_calls += 1
+                if getattr(res, "validation_passed", True):
+                    break
+        else:
+            res = guard(
+                messages=messages,
+                num_reasks=self.num_reasks,
+                full_schema_reask=self.full_schema_reask,
+                **guard_kwargs,
+            )
+            provider_calls = guard_provider_calls(guard, res)
+        self._guard_calls.count = provider_calls
         return getattr(res, "validated_output", None) or {}  # type: ignore
 
+    def _parse_output(
+        self, llm_output: str, schema: Type[BaseModel] | None = None
+    ) -> dict:
+        """Validate an already generated LLM output through the Guard (no LLM call)."""
+        guard = get_guard(schema) if schema is not None else self.guard
+        res = guard.parse(llm_output=llm_output)
+        return getattr(res, "validated_output", None) or {}  # type: ignore
+
+    def _validate_output(
+        self, llm_output: str, schema: Type[BaseModel] | None = None
+    ) -> dict:
+        """Validate a completion: fast path first when enabled, the Guard otherwise."""
+        if self.output_format == "compact":
+            # Positional answers can't go through the Guard; decode, then validate
+            data = get_codec(schema or self.schema).decode(llm_output)
+            return (schema or self.schema).model_validate(data).model_dump()
+        if self._use_fast_path(schema):
+            try:
+                return fast_validate(schema or self.schema, llm_output)
+            except ValueError:
+                # Malformed or off-schema output: let the Guard try to recover it
+                pass
+        return self._parse_output(llm_output, schema)
+
+
+def guard_provider_calls(guard, outcome) -> int:
+    """LLM calls behind a guard() outcome: one per Guardrails iteration (ask + reasks)."""
+    # The Guard is shared between verifiers, so find this call by id, not history.last
+    call_id = getattr(outcome, "call_id", None)
+    for call in guard.history:
+        if call.id == call_id:
+            return max(len(call.iterations), 1)
+    # Already pushed out of the Guard's bounded history by concurrent calls
+    return 1
+
 
 class ConsensusVerifier(HeroVerifier):
     def __init__(
@@ -67,8 +253,32 @@ class ConsensusVerifier(HeroVerifier):
         logger=None,
         session_id: str | None = None,
         model_name: str | None = None,
+        multi_sample: bool = False,
+        engine: str = "guard",
+        prompt_layout: str = "inline",
+        output_format: str = "json",
+        compact_history: bool = False,
+        memo: bool = False,
+        memo_ttl: float | None = None,
+        memo_normalizer=None,
+        num_reasks: int = 1,
+        full_schema_reask: bool | None = None,
+        reask_mode: str = "reask",
+        stream: bool = False,
+        stream_concurrency: int | None = None,
+        rate_limiter=None,
     ):
-        super().__init__(adapter, schema, validation_task)
+        super().__init__(
+            adapter,
+            schema,
+            validation_task,
+            engine,
+            prompt_layout,
+            output_format,
+            num_reasks,
+            full_schema_reask,
+            reask_mode,
+        )
         assert iterations > 0, "iterations must be at least 1"
         self.iterations = iterations
 
@@ -93,68 +303,325 @@ class ConsensusVerifier(HeroVerifier):
         self.session_id = session_id
         self.model_name = model_name
 
-    def verify(self, item_name: str) -> dict:
+        # Request all iterations as choices of one call when the adapter supports `n`
+        self.multi_sample = multi_sample and getattr(adapter, "supports_n", False)
+
+        # Stream iterations concurrently, parse fields as they arrive and cancel
+        # the rest once consensus is decided (see core.streaming)
+        assert not (stream and multi_sample), (
+            "stream cannot be combined with multi_sample"
+        )
+        assert not stream or output_format == "json", (
+            "stream requires the json output_format"
+        )
+        self.stream = stream
+        self.stream_concurrency = stream_concurrency
+
+        # Provider requests issued (multi-sample serves several iterations per
+        # request); reask_calls are the ones spent on reasks/resamples.
+        # Updated through _count_calls: threads may share a verifier
+        self.api_calls = 0
+        self.reask_calls = 0
+        self._calls_lock = threading.Lock()
+
+        # Optional limiter (e.g. core.scheduler.RateLimiter) charged one token
+        # per provider call
+        self.rate_limiter = rate_limiter
+
+        # Keep history entries as shared, interned records instead of dicts
+        self._history_layout = get_layout(schema) if compact_history else None
+
+        # Reuse decisive consensus results of earlier sessions (needs a logger);
+        # memo_ttl in seconds, None = entries never expire
+        self.memo = memo
+        self.memo_ttl = memo_ttl
+        self.memo_normalizer = memo_normalizer
+
+    def verify(self, item_name: str, iterations: int | None = None) -> dict:
         """
         Performs consensus verification.
         Returns a dict with 'consensus' (the result) and 'history' (list of all results).
+        With the memo on, a fresh remembered consensus is returned without
+        any call: history is empty and 'memo_session_id' names its session.
+
+        `iterations` below self.iterations (e.g. near a deadline) samples fewer
+        calls and scales the threshold to them (see threshold_for).
+
+        With streaming, history holds the samples that completed before the
+        consensus was decided; 'cancelled_streams' counts the others and
+        'time_to_first_field' is the seconds until the first field arrived.
+        """
+        iterations = iterations or self.iterations
+        assert 0 < iterations <= self.iterations, (
+            f"iterations must be between 1 and {self.iterations}"
+        )
+        key = self._memo_key(item_name)
+        if key:
+            hit = self.logger.get_consensus_memo(key, self.memo_ttl)
+            if hit:
+                return {
+                    "consensus": hit["consensus"],
+                    "history": [],
+                    "memo_session_id": hit["session_id"],
+                }
+
+        streamed = None
+        if self.stream:
+            from core.streaming import StreamingSampler
+
+            streamed = StreamingSampler(
+                self, item_name, iterations, self.stream_concurrency
+            ).run()
+            history = streamed["history"]
+        elif self.multi_sample:
+            history = self._sample_many(item_name, 1, iterations)
+        else:
+            history = [self._sample(item_name, i + 1) for i in range(iterations)]
+        consensus = self._calculate_consensus(history, self.threshold_for(iterations))
+
+        # Reduced runs don't match the memo's iterations/threshold policy
+        if key and iterations == self.iterations and is_decisive(consensus):
+            self.logger.store_consensus_memo(
+                memo_key=key,
+                item_name=item_name,
+                schema_fingerprint=schema_fingerprint(self.schema),
+                validation_task=self.validation_task,
+                model_name=self.model_name,
+                policy=consensus_policy(self.iterations, self.threshold),
+                consensus=consensus,
+                session_id=self.session_id,
+            )
+        result = {"consensus": consensus, "history": history}
+        if streamed:
+            if streamed["cancelled"]:
+                result["cancelled_streams"] = streamed["cancelled"]
+            if streamed["time_to_first_field"] is not None:
+                result["time_to_first_field"] = streamed["time_to_first_field"]
+        return result
+
+    def _memo_key(self, item_name: str) -> str | None:
+        """Consensus memo key for an item, or None when the memo is off."""
+        if not (self.memo and self.logger):
+            return None
+        return memo_key(
+            item_name,
+            self.schema,
+            self.validation_task,
+            self.model_name,
+            consensus_policy(self.iterations, self.threshold),
+            self.memo_normalizer,
+        )
+
+    def verify_adaptive(
+        self,
+        items: list,
+        call_budget: int | None = None,
+        confidence: float = 0.9,
+        initial_iterations: int = 2,
+        max_iterations: int | None = None,
+    ) -> list:
         """
+        Consensus for many items with calls allocated adaptively.
+
+        Every item gets `initial_iterations` calls; remaining budget goes to
+        the items whose fields are least certain (see core.adaptive).
+        Returns one verify()-style dict per item, in order.
+        """
+        from core.adaptive import AdaptiveSampler
+
+        sampler = AdaptiveSampler(
+            self,
+            call_budget=call_budget,
+            confidence=confidence,
+            initial_iterations=initial_iterations,
+            max_iterations=max_iterations,
+        )
+        return sampler.run(items)
+
+    def requery_ambiguous(
+        self, item_name: str, result_data: dict, iterations: int | None = None
+    ) -> dict:
+        """
+        Follow-up pass that re-asks only the fields left "ambiguous".
+
+        A reduced sub-schema (with its own Guard and prompt) is sampled
+        `iterations` times (default: self.iterations). The new votes are merged
+        with the earlier ones and only the ambiguous fields are re-scored,
+        against a threshold scaled to their combined number of calls.
+
+        Returns:
+            verify()-style dict; history includes the partial follow-up responses
+            and 'requeried_fields' lists the fields that were re-asked
+        """
+        consensus = result_data["consensus"]
+        ambiguous = [key for key, value in consensus.items() if value == "ambiguous"]
+        if not ambiguous:
+            return result_data
+
+        from core.schema_utils import sub_schema
+
+        iterations = iterations or self.iterations
+        schema = sub_schema(self.schema, ambiguous)
+        history = list(result_data["history"])
+        metadata = {"requery": True, "fields": ambiguous}
+        for _ in range(iterations):
+            history.append(self._sample(item_name, len(history) + 1, schema, metadata))
+
+        # Decided fields keep their verdict; ambiguous ones are re-scored
+        rescored = self._calculate_consensus(history, self.threshold_for(len(history)))
+        merged = dict(consensus)
+        for key in ambiguous:
+            merged[key] = rescored.get(key, "ambiguous")
+
+        return {"consensus": merged, "history": history, "requeried_fields": ambiguous}
+
+    def threshold_for(self, calls: int) -> int:
+        """Absolute threshold for an item that received `calls` calls (same ratio)."""
+        # Integer ceil(calls * threshold / iterations), free of float rounding
+        return -(-calls * self.threshold // self.iterations)
+
+    def _sample(
+        self,
+        item_name: str,
+        iteration_number: int,
+        schema: Type[BaseModel] | None = None,
+        metadata: dict | None = None,
+    ) -> dict:
+        """One guarded call, normalized to a dict and logged. Errors become {"error": ...}."""
+        try:
+            # Add delay to avoid RateLimitError (Groq free tier is sensitive)
+            if iteration_number > 1:
+                time.sleep(1 / 559)
+
+            self._count_calls(1)
+            res, provider_calls = self._call(item_name, schema)
+            if provider_calls > 1:
+                # Reasks are extra provider calls behind this one sample
+                self._count_calls(provider_calls - 1, reasks=True)
+                metadata = {**(metadata or {}), "provider_calls": provider_calls}
+            # Normalize result to dict if it's an object
+            if not isinstance(res, dict):
+                res = res.dict()
+            # Only direct completions expose usage (the Guard path doesn't)
+            if self._uses_completion(schema):
+                metadata = self._with_cache_usage(metadata)
+        except Exception as e:
+            res = {"error": str(e)}
+
+        self._log_result(item_name, iteration_number, res, metadata)
+        return self._compact(res)
+
+    def _sample_many(self, item_name: str, first_iteration: int, count: int) -> list:
+        """
+        `count` samples from one request using the adapter's `n` support.
+        Each choice is validated and logged as its own iteration. Missing choices
+        are filled with separate calls.
+        """
+        try:
+            self._count_calls(1)
+            choices = self.adapter.complete(self._build_messages(item_name), n=count)
+        except Exception as e:
+            # The request failed outright: every requested iteration is an error
+            history = []
+            for offset in range(count):
+                error_data = {"error": str(e)}
+                self._log_result(item_name, first_iteration + offset, error_data)
+                history.append(self._compact(error_data))
+            return history
+
+        # Usage is per request: attach it to the first choice only
+        request_metadata = self._with_cache_usage(None)
         history = []
-        for i in range(self.iterations):
+        for offset, choice in enumerate(choices[:count]):
             try:
-                # Add delay to avoid RateLimitError (Groq free tier is sensitive)
-                if i > 0:
-                    time.sleep(1 / 559)
-
-                res = self._call_guard(item_name)
-                # Normalize result to dict if it's an object
+                res = self._validate_output(choice)
                 if not isinstance(res, dict):
                     res = res.dict()
-                history.append(res)
-
-                # Log to database
-                if self.logger and self.session_id:
-                    self.logger.log_response(
-                        session_id=self.session_id,
-                        item_name=item_name,
-                        iteration_number=i + 1,
-                        response_data=res,
-                        model_name=self.model_name,
-                        adapter_type=self.adapter.__class__.__name__,
-                        validation_task=self.validation_task,
-                    )
-
             except Exception as e:
-                error_data = {"error": str(e)}
-                history.append(error_data)
-
-                # Log error to database
-                if self.logger and self.session_id:
-                    self.logger.log_response(
-                        session_id=self.session_id,
-                        item_name=item_name,
-                        iteration_number=i + 1,
-                        response_data=error_data,
-                        model_name=self.model_name,
-                        adapter_type=self.adapter.__class__.__name__,
-                        validation_task=self.validation_task,
-                    )
-
-        consensus = self._calculate_consensus(history)
-        return {"consensus": consensus, "history": history}
-
-    def _calculate_consensus(self, history: list) -> dict:
-        # Filter out errors
-        valid_history = [res for res in history if "error" not in res]
-
-        if not valid_history:
-            return {"error": "No valid responses"}
+                res = {"error": str(e)}
+            metadata = request_metadata if offset == 0 else None
+            self._log_result(item_name, first_iteration + offset, res, metadata)
+            history.append(self._compact(res))
+
+        # Provider returned fewer choices than requested: fall back to single calls
+        for offset in range(len(history), count):
+            history.append(self._sample(item_name, first_iteration + offset))
+
+        return history
+
+    def _count_calls(self, calls: int, reasks: bool = False):
+        """
+        Account for provider calls and charge them to the rate limiter.
+
+        Reasks have already happened inside the Guard when they are counted;
+        charging them still makes the following calls wait for them.
+        """
+        with self._calls_lock:
+            self.api_calls += calls
+            if reasks:
+                self.reask_calls += calls
+        if self.rate_limiter:
+            self.rate_limiter.acquire(calls)
+
+    def _compact(self, res: dict):
+        """History entry for a response (a HistoryRecord with compact history)."""
+        if self._history_layout is None:
+            return res
+        return self._history_layout.compact(res)
+
+    def _log_result(
+        self,
+        item_name: str,
+        iteration_number: int,
+        res: dict,
+        metadata: dict | None = None,
+    ):
+        """Log a response (or error) to the database if logging is enabled."""
+        if self.logger and self.session_id:
+            self.logger.log_response(
+                session_id=self.session_id,
+                item_name=item_name,
+                iteration_number=iteration_number,
+                response_data=res,
+                model_name=self.model_name,
+                adapter_type=self.adapter.__class__.__name__,
+                validation_task=self.validation_task,
+                metadata=metadata,
+            )
+
+    def calculate_batch_consensus(self, histories: list) -> list:
+        """
+        Consensus for many items at once (vectorized, requires NumPy).
+        Same results as calling _calculate_consensus on each history.
+        """
+        from core.batch_consensus import batch_consensus
+
+        field_names = list(self.schema.model_fields.keys())
+        return batch_consensus(histories, field_names, self.threshold)
+
+    def _calculate_consensus(self, history: list, threshold: int | None = None) -> dict:
+        threshold = self.threshold if threshold is None else threshold
 
-        # Vote on each field dynamically based on schema
         field_names = list(self.schema.model_fields.keys())
+
+        # Compact history: votes are read column-wise from the records
+        columns = record_votes(history, field_names)
+        if columns is None:
+            # Filter out errors
+            valid_history = [res for res in history if "error" not in res]
+
+            if not valid_history:
+                return {"error": "No valid responses"}
+
+            columns = [
+                [res.get(key) for res in valid_history if key in res]
+                for key in field_names
+            ]
+
+        # Vote on each field dynamically based on schema
         final_result = {}
 
-        for key in field_names:
-            votes = [res.get(key) for res in valid_history if key in res]
+        for key, votes in zip(field_names, columns):
             if not votes:
                 final_result[key] = None
                 continue
@@ -164,7 +631,7 @@ class ConsensusVerifier(HeroVerifier):
             most_common, count = counter.most_common(1)[0]
 
             # Usage of threshold from config/params
-            if count >= self.threshold:
+            if count >= threshold:
                 final_result[key] = most_common
             else:
                 final_result[key] = "ambiguous"
@@ -5,13 +5,41 @@ Validation helpers for running validations with custom display logic.
 import uuid
 from datetime import datetime
 import math
+import threading
+import time
 import config
 from core.verifier import ConsensusVerifier
 from core.db_logger import ValidationLogger
+from core.dedup import alias_rows, group_duplicates, normalize_item
+from core.deadline import RunBudget
+from core.sinks import SinkDispatcher, make_sink
 
 
 def run_validation(
-    domain_config, iterations=None, threshold_ratio=None, custom_display=None
+    domain_config,
+    iterations=None,
+    threshold_ratio=None,
+    custom_display=None,
+    dedup=None,
+    normalizer=None,
+    adaptive=None,
+    call_budget=None,
+    multi_sample=None,
+    requery_ambiguous=None,
+    engine=None,
+    prompt_layout=None,
+    output_format=None,
+    adapter=None,
+    failover=None,
+    profile=None,
+    compact_history=None,
+    memo=None,
+    deadline_seconds=None,
+    max_calls=None,
+    sinks=None,
+    num_reasks=None,
+    reask_mode=None,
+    stream=None,
 ):
     """
     Run validation with a domain config and optional custom display logic.
@@ -21,9 +49,48 @@ def run_validation(
         iterations: Number of consensus iterations (uses framework default if None)
         threshold_ratio: Consensus threshold ratio (uses framework default if None)
         custom_display: Optional function(item, result_data, field_names) for custom output
+        dedup: Validate duplicate items once (uses framework default if None)
+        normalizer: Function(item) -> key for dedup; defaults to the domain's
+            ITEM_NORMALIZER, then case/whitespace/punctuation-insensitive matching
+        adaptive: Allocate calls adaptively across items (uses framework default if None);
+            `iterations` becomes the per-item cap
+        call_budget: Total API calls for adaptive mode (default: items * iterations)
+        multi_sample: Get all iterations from one request when the adapter supports
+            `n` (uses framework default if None)
+        requery_ambiguous: Re-ask only the ambiguous fields of each item with a
+            reduced schema (uses framework default if None)
+        engine: "guard" or "fast" validation engine (uses framework default if None)
+        prompt_layout: "inline" or "prefix" prompt layout (uses framework default if None)
+        output_format: "json" or "compact" model answers (uses framework default if None)
+        adapter: Adapter instance to use instead of the configured one (e.g. a
+            ReplayAdapter)
+        failover: Wrap the configured adapter with its failover chain and circuit
+            breakers (uses framework default if None)
+        profile: Profile the run (cProfile, tracemalloc, per-phase timings) and
+            write the artifacts to DATA_DIR (uses framework default if None)
+        compact_history: Keep history entries as compact read-only records
+            instead of dicts (uses framework default if None)
+        memo: Reuse decisive consensus results of earlier sessions younger than
+            CONSENSUS_MEMO_TTL_SECONDS (uses framework default if None); items
+            are matched with `normalizer`
+        deadline_seconds: Wall-clock budget of the run (uses framework default if None)
+        max_calls: Maximum API calls of the run (uses framework default if None).
+            Near either limit items get fewer iterations; then dispatching
+            stops and the session is marked partial. Not for adaptive runs
+            (they have call_budget)
+        sinks: core.sinks.ResultSink instances fed each item's result from a
+            background thread (default: built from RESULT_SINKS specs)
+        num_reasks: Re-asks per guarded call that fails validation (uses the
+            domain's NUM_REASKS, then the framework default, if None)
+        reask_mode: "reask" or "resample" (uses the domain's REASK_MODE, then
+            the framework default, if None); FULL_SCHEMA_REASK is read the same way
+        stream: Stream iterations, parse fields incrementally and cancel streams
+            once consensus is decided (uses framework default if None)
 
     Returns:
-        dict with session_id, db_path, results
+        dict with session_id, db_path, results, unique_items, api_calls,
+        reask_calls, partial, stop_reason, skipped_items (and profile, the profile summary,
+        when profiling)
     """
     # Validation of domain_config
     assert hasattr(domain_config, "VALIDATION_TASK"), (
@@ -43,67 +110,361 @@ def run_validation(
     threshold_ratio = threshold_ratio or config.CONSENSUS_THRESHOLD_RATIO
     assert 0.0 <= threshold_ratio <= 1.0, "threshold_ratio must be between 0.0 and 1.0"
 
-    # Setup
-    db_path = config.get_db_path(domain_config)
-    logger = ValidationLogger(db_path)
-    session_id = f"{domain_config.VALIDATION_TASK.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
-
-    adapter = config.get_selected_adapter()
-    model_name = adapter.get_params().get("model", "unknown")
-    actual_threshold = math.ceil(iterations * threshold_ratio)
-
-    # Start session
-    logger.start_session(
-        session_id=session_id,
-        total_items=len(domain_config.ITEMS_TO_VALIDATE),
-        consensus_iterations=iterations,
-        consensus_threshold=actual_threshold,
-        validation_task=domain_config.VALIDATION_TASK,
-        adapter_type=adapter.__class__.__name__,
-    )
+    profile = config.PROFILE_RUNS if profile is None else profile
+    profiler = None
+    dispatcher = None
+    if profile:
+        from core.profiling import RunProfiler
 
-    # Create verifier
-    verifier = ConsensusVerifier(
-        adapter=adapter,
-        schema=domain_config.VALIDATION_SCHEMA,
-        validation_task=domain_config.VALIDATION_TASK,
-        iterations=iterations,
-        threshold=threshold_ratio,
-        logger=logger,
-        session_id=session_id,
-        model_name=model_name,
+        profiler = RunProfiler()
+        profiler.start()
+
+    # The run's clock starts now, so setup counts against the deadline too
+    deadline_seconds = (
+        config.RUN_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds
     )
+    max_calls = config.RUN_MAX_CALLS if max_calls is None else max_calls
+    budget = None
+    if deadline_seconds or max_calls:
+        budget = RunBudget(
+            deadline_seconds=deadline_seconds,
+            max_calls=max_calls,
+            min_iterations=config.DEADLINE_MIN_ITERATIONS,
+            safety_factor=config.DEADLINE_SAFETY_FACTOR,
+        )
+
+    try:
+        # Setup
+        db_path = config.get_db_path(domain_config)
+        logger = ValidationLogger(db_path)
+        if profiler:
+            profiler.instrument(logger, "logger")
+        session_id = f"{domain_config.VALIDATION_TASK.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
 
-    # Get field names
-    field_names = list(domain_config.VALIDATION_SCHEMA.model_fields.keys())
+        failover = config.FAILOVER_ENABLED if failover is None else failover
+        if adapter is None:
+            adapter = (
+                config.get_failover_adapter()
+                if failover
+                else config.get_selected_adapter()
+            )
+        model_name = getattr(adapter, "model_name", None) or adapter.get_params().get(
+            "model", "unknown"
+        )
+        if profiler:
+            profiler.instrument(adapter, "adapter")
+        actual_threshold = math.ceil(iterations * threshold_ratio)
+
+        # Start session
+        logger.start_session(
+            session_id=session_id,
+            total_items=len(domain_config.ITEMS_TO_VALIDATE),
+            consensus_iterations=iterations,
+            consensus_threshold=actual_threshold,
+            validation_task=domain_config.VALIDATION_TASK,
+            adapter_type=adapter.__class__.__name__,
+            model_name=model_name,
+        )
+
+        # Record failover hops of this run
+        if hasattr(adapter, "on_event"):
+            adapter.on_event = lambda event: logger.log_failover_event(
+                session_id, **event
+            )
+
+        # Reask policy: arguments, then the domain's settings, then defaults
+        reask_policy = config.get_reask_policy(domain_config)
+        if num_reasks is not None:
+            reask_policy["num_reasks"] = num_reasks
+        if reask_mode is not None:
+            reask_policy["reask_mode"] = reask_mode
+
+        # Create verifier
+        verifier = ConsensusVerifier(
+            adapter=adapter,
+            schema=domain_config.VALIDATION_SCHEMA,
+            validation_task=domain_config.VALIDATION_TASK,
+            iterations=iterations,
+            threshold=threshold_ratio,
+            logger=logger,
+            session_id=session_id,
+            model_name=model_name,
+            multi_sample=config.MULTI_SAMPLE if multi_sample is None else multi_sample,
+            engine=engine or config.VALIDATION_ENGINE,
+            prompt_layout=prompt_layout or config.PROMPT_LAYOUT,
+            output_format=output_format or config.OUTPUT_FORMAT,
+            compact_history=(
+                config.COMPACT_HISTORY if compact_history is None else compact_history
+            ),
+            memo=config.CONSENSUS_MEMO if memo is None else memo,
+            memo_ttl=config.CONSENSUS_MEMO_TTL_SECONDS,
+            memo_normalizer=(
+                normalizer or getattr(domain_config, "ITEM_NORMALIZER", None)
+            ),
+            **reask_policy,
+            stream=config.STREAM_RESPONSES if stream is None else stream,
+            stream_concurrency=config.STREAM_CONCURRENCY,
+        )
 
-    # Process items
-    results = []
-    for item in domain_config.ITEMS_TO_VALIDATE:
-        result_data = verifier.verify(item)
-        results.append(
-            {
+        if profiler:
+            profiler.instrument(verifier, "verifier")
+            if custom_display:
+                custom_display = profiler.timed("display", custom_display)
+
+        # Get field names
+        field_names = list(domain_config.VALIDATION_SCHEMA.model_fields.keys())
+
+        # Result sinks run off the hot path
+        if sinks is None:
+            sinks = [make_sink(spec, db_path) for spec in config.RESULT_SINKS]
+        if sinks:
+            dispatcher = SinkDispatcher(
+                sinks,
+                {
+                    "session_id": session_id,
+                    "validation_task": domain_config.VALIDATION_TASK,
+                    "field_names": field_names,
+                    "total_items": len(domain_config.ITEMS_TO_VALIDATE),
+                },
+            )
+
+        # Deduplicate: each item maps to the first item sharing its normalized key
+        dedup = config.DEDUPLICATE_ITEMS if dedup is None else dedup
+        canonical_of = {}
+        if dedup:
+            normalizer = (
+                normalizer
+                or getattr(domain_config, "ITEM_NORMALIZER", None)
+                or normalize_item
+            )
+            groups = group_duplicates(domain_config.ITEMS_TO_VALIDATE, normalizer)
+            for members in groups.values():
+                for member in members:
+                    canonical_of[member] = members[0]
+            logger.log_item_aliases(session_id, alias_rows(groups))
+
+        # Adaptive mode samples every (canonical) item up front, sharing one budget
+        adaptive = config.ADAPTIVE_SAMPLING if adaptive is None else adaptive
+        assert not (adaptive and budget), (
+            "deadline_seconds/max_calls don't apply to adaptive runs (use call_budget)"
+        )
+        if adaptive:
+            work_items = domain_config.ITEMS_TO_VALIDATE
+            if dedup:
+                work_items = list(dict.fromkeys(canonical_of.values()))
+            adaptive_results = iter(
+                verifier.verify_adaptive(
+                    work_items,
+                    call_budget=call_budget,
+                    confidence=config.ADAPTIVE_CONFIDENCE,
+                    initial_iterations=config.ADAPTIVE_INITIAL_ITERATIONS,
+                )
+            )
+
+        requery_ambiguous = (
+            config.REQUERY_AMBIGUOUS if requery_ambiguous is None else requery_ambiguous
+        )
+
+        # Process items (consensus runs once per canonical item and is fanned out)
+        results = []
+        canonical_results = {}
+        skipped = []
+        for position, item in enumerate(domain_config.ITEMS_TO_VALIDATE):
+            canonical = canonical_of.get(item, item)
+            if dedup and canonical in canonical_results:
+                result_data = canonical_results[canonical]
+            else:
+                if adaptive:
+                    result_data = next(adaptive_results)
+                elif budget:
+                    # Fewer iterations near the limits; none left: skip the rest
+                    planned = budget.plan(iterations)
+                    if not planned:
+                        skipped.append((position, item, budget.stop_reason))
+                        continue
+                    result_data = _budgeted(
+                        budget, verifier, planned, verifier.verify, canonical, planned
+                    )
+                    if planned < iterations and result_data["history"]:
+                        result_data["iterations"] = planned
+                else:
+                    result_data = verifier.verify(canonical)
+                if requery_ambiguous:
+                    requery_iterations = config.REQUERY_ITERATIONS or iterations
+                    if budget is None:
+                        result_data = verifier.requery_ambiguous(
+                            canonical, result_data, requery_iterations
+                        )
+                    elif (
+                        budget.plan(requery_iterations, stop=False)
+                        == requery_iterations
+                    ):
+                        result_data = _budgeted(
+                            budget,
+                            verifier,
+                            requery_iterations,
+                            verifier.requery_ambiguous,
+                            canonical,
+                            result_data,
+                            requery_iterations,
+                        )
+                if dedup:
+                    canonical_results[canonical] = result_data
+
+            result = {
                 "item": item,
                 "consensus": result_data["consensus"],
                 "history": result_data["history"],
             }
-        )
+            if canonical != item:
+                result["canonical_item"] = canonical
+            if result_data.get("requeried_fields"):
+                result["requeried_fields"] = result_data["requeried_fields"]
+            if "memo_session_id" in result_data:
+                result["memo_session_id"] = result_data["memo_session_id"]
+            if "iterations" in result_data:
+                result["iterations"] = result_data["iterations"]
+            for key in ("cancelled_streams", "time_to_first_field"):
+                if key in result_data:
+                    result[key] = result_data[key]
+            results.append(result)
+            if dispatcher:
+                dispatcher.submit(
+                    {"session_id": session_id, "position": position, **result}
+                )
 
-        # Custom display if provided
-        if custom_display:
-            custom_display(item, result_data, field_names)
+            # Custom display if provided
+            if custom_display:
+                custom_display(item, result_data, field_names)
 
-    # Complete session
-    logger.complete_session(session_id)
+        # Complete session (partial if the deadline or call budget cut it short)
+        logger.log_skipped_items(session_id, skipped)
+        logger.complete_session(
+            session_id,
+            partial=bool(skipped),
+            stop_reason=budget.stop_reason if skipped else None,
+            api_calls=verifier.api_calls,
+        )
+        if dispatcher:
+            dispatcher.close()
+    except BaseException:
+        if dispatcher:
+            dispatcher.close(raise_errors=False)
+        if profiler:
+            profiler.abort()
+        raise
 
-    return {
+    session_info = {
         "session_id": session_id,
         "db_path": db_path,
         "results": results,
         "model_name": model_name,
         "iterations": iterations,
         "threshold": actual_threshold,
+        "unique_items": len(canonical_results) if dedup else len(results),
+        "api_calls": verifier.api_calls,
+        "reask_calls": verifier.reask_calls,
+        "partial": bool(skipped),
+        "stop_reason": budget.stop_reason if skipped else None,
+        "skipped_items": [item for _, item, _ in skipped],
     }
+    if profiler:
+        session_info["profile"] = profiler.stop(session_id)
+    return session_info
+
+
+def _budgeted(budget, verifier, iterations, fn, *args):
+    """Call fn(*args) and charge its time and API calls to the run budget."""
+    calls_before = verifier.api_calls
+    started = time.monotonic()
+    result_data = fn(*args)
+    calls = verifier.api_calls - calls_before
+    # Memo hits cost nothing and tell nothing about per-iteration cost
+    budget.record(iterations if calls else 0, time.monotonic() - started, calls)
+    return result_data
+
+
+def run_multi_domain(
+    jobs,
+    iterations=None,
+    threshold_ratio=None,
+    custom_display=None,
+    multi_sample=None,
+    engine=None,
+    prompt_layout=None,
+    output_format=None,
+    adapter=None,
+    failover=None,
+    workers=None,
+    rate_limit=None,
+    compact_history=None,
+    num_reasks=None,
+    reask_mode=None,
+    memo=None,
+):
+    """
+    Run several domains in one process with the fair scheduler.
+
+    Items of all domains are interleaved over one worker pool, rate limiter
+    and DB writer (see core.scheduler). Each domain is logged as its own session.
+
+    Args:
+        jobs: core.scheduler.DomainJob list (domain config, priority, weight)
+        iterations: Number of consensus iterations (uses framework default if None)
+        threshold_ratio: Consensus threshold ratio (uses framework default if None)
+        custom_display: Optional function(item, result_data, field_names); calls are
+            serialized, and come in completion order across domains
+        multi_sample, engine, prompt_layout, output_format, adapter, failover,
+        compact_history, num_reasks, reask_mode, memo: As for run_validation
+            (the reask policy and memo normalizer default to each domain's own)
+        workers: Items verified concurrently (default: SCHEDULER_WORKERS)
+        rate_limit: Provider calls per second shared by all domains
+            (default: SCHEDULER_RATE_LIMIT)
+
+    Returns:
+        One session_info dict per job (with a "domain" key), in job order
+    """
+    from core.scheduler import MultiDomainRunner
+
+    failover = config.FAILOVER_ENABLED if failover is None else failover
+    if adapter is None:
+        adapter = (
+            config.get_failover_adapter() if failover else config.get_selected_adapter()
+        )
+
+    on_result = None
+    if custom_display:
+        display_lock = threading.Lock()
+
+        def on_result(job, item, result_data):
+            field_names = list(job.config.VALIDATION_SCHEMA.model_fields.keys())
+            with display_lock:
+                custom_display(item, result_data, field_names)
+
+    runner = MultiDomainRunner(
+        jobs,
+        adapter=adapter,
+        iterations=iterations,
+        threshold_ratio=threshold_ratio,
+        workers=workers,
+        rate_limit=rate_limit,
+        on_result=on_result,
+        multi_sample=config.MULTI_SAMPLE if multi_sample is None else multi_sample,
+        engine=engine or config.VALIDATION_ENGINE,
+        prompt_layout=prompt_layout or config.PROMPT_LAYOUT,
+        output_format=output_format or config.OUTPUT_FORMAT,
+        compact_history=(
+            config.COMPACT_HISTORY if compact_history is None else compact_history
+        ),
+        memo=config.CONSENSUS_MEMO if memo is None else memo,
+        memo_ttl=config.CONSENSUS_MEMO_TTL_SECONDS,
+        **{
+            key: value
+            for key, value in (("num_reasks", num_reasks), ("reask_mode", reask_mode))
+            if value is not None
+        },
+    )
+    return runner.run()
 
 
 def print_header(domain_config, model_name, iterations, threshold):
@@ -118,3 +479,42 @@ def print_summary(session_info):
     """Print a standard validation summary."""
     print(f"\n✅ Complete! Results in: {session_info['db_path']}")
     print(f"   Session ID: {session_info['session_id']}")
+    unique_items = session_info.get("unique_items")
+    if unique_items is not None and unique_items < len(session_info["results"]):
+        print(
+            f"   Deduplicated: {len(session_info['results'])} items -> {unique_items} unique"
+        )
+    if "api_calls" in session_info:
+        print(f"   API calls: {session_info['api_calls']}")
+    if session_info.get("reask_calls"):
+        print(f"   Reask calls: {session_info['reask_calls']} (included above)")
+    if session_info.get("partial"):
+        print(
+            f"   Partial: stopped by {session_info['stop_reason']}, "
+            f"{len(session_info['skipped_items'])} items skipped"
+        )
+        skipped = session_info["skipped_items"]
+        for item in skipped[:20]:
+            print(f"     - {item}")
+        if len(skipped) > 20:
+            print(
+                f"     ... and {len(skipped) - 20} more (see the skipped_items table)"
+            )
+    reduced = sum(1 for r in session_info["results"] if "iterations" in r)
+    if reduced:
+        print(f"   Reduced iterations: {reduced} items")
+    memo_hits = sum(1 for r in session_info["results"] if "memo_session_id" in r)
+    cancelled = sum(r.get("cancelled_streams", 0) for r in session_info["results"])
+    if cancelled:
+        print(f"   Streams cancelled after consensus: {cancelled}")
+    first_fields = [
+        r["time_to_first_field"]
+        for r in session_info["results"]
+        if "time_to_first_field" in r
+    ]
+    if first_fields:
+        print(
+            f"   Time to first field: {1000 * sum(first_fields) / len(first_fields):.0f} ms avg"
+        )
+    if memo_hits:
+        print(f"   Memo hits: {memo_hits} (no calls)")
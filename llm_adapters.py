@@ -1,3 +1,4 @@
+import threading
 from abc import ABC, abstractmethod
 from dotenv import load_dotenv
 
@@ -8,7 +9,81 @@ load_dotenv()
 class LLMAdapter(ABC):
     """Abstract base class for LLM providers."""
 
+    # Whether one request can return several choices (OpenAI-style `n`)
+    supports_n = False
+
+    @property
+    def last_usage(self):
+        """Token usage of this thread's latest complete() response (None if unknown)."""
+        return getattr(self._thread_state(), "usage", None)
+
+    @last_usage.setter
+    def last_usage(self, usage):
+        # Per thread: concurrent workers share one adapter
+        self._thread_state().usage = usage
+
+    def _thread_state(self) -> threading.local:
+        # Created lazily: subclasses don't have to call LLMAdapter.__init__
+        state = self.__dict__.get("_local")
+        if state is None:
+            state = self.__dict__.setdefault("_local", threading.local())
+        return state
+
     @abstractmethod
     def get_params(self) -> dict:
         """Returns the dictionary of parameters to pass to guard()."""
         pass
+
+    def complete(self, messages: list, n: int = 1) -> list:
+        """
+        Raw completion (no validation) returning the text of each choice.
+
+        With n > 1 the prompt is sent once and the provider samples n choices.
+        """
+        import litellm
+
+        response = litellm.completion(messages=messages, n=n, **self.get_params())
+        self.last_usage = getattr(response, "usage", None)
+        return [choice.message.content or "" for choice in response.choices]
+
+    def stream(self, messages: list):
+        """
+        Raw streamed completion (no validation) yielding text chunks as they arrive.
+
+        Closing the generator early closes the provider stream, so no further
+        tokens are generated for it.
+        """
+        import litellm
+
+        response = litellm.completion(
+            messages=messages, stream=True, **self.get_params()
+        )
+        try:
+            for chunk in response:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    yield text
+        finally:
+            completion_stream = getattr(response, "completion_stream", None)
+            close = getattr(completion_stream, "close", None)
+            if close:
+                close()
+
+
+def cached_prompt_tokens(usage) -> int | None:
+    """
+    Prompt tokens served from the provider's prefix cache, or None if not reported.
+
+    Reads OpenAI-style `prompt_tokens_details.cached_tokens` and Anthropic-style
+    `cache_read_input_tokens` from a usage object or dict.
+    """
+
+    def read(obj, key):
+        if obj is None:
+            return None
+        return obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
+
+    cached = read(read(usage, "prompt_tokens_details"), "cached_tokens")
+    if cached is None:
+        cached = read(usage, "cache_read_input_tokens")
+    return cached
@@ -5,12 +5,18 @@ Guardrails Validator - Main CLI
 Usage:
     uv run main.py --domain examples.domains.superhero_config
     uv run main.py  # Uses default superhero config
+    uv run main.py --domain superhero --domain product_review:weight=3,priority=1
+    uv run main.py export <session_id> [--format jsonl|csv|parquet]
+    uv run main.py prune [--older-than-days N] [--keep-last N] [--archive-dir DIR]
 """
 
+import os
 import sys
 import argparse
-import importlib
-from examples.validation_helpers import run_validation, print_summary
+import config
+from core.scheduler import parse_domain_spec
+from core.sinks import make_sink
+from examples.validation_helpers import run_multi_domain, run_validation, print_summary
 
 
 def default_display(item, result_data, field_names):
@@ -37,41 +43,427 @@ def default_display(item, result_data, field_names):
     print(f"  Result: {consensus_str}\n")
 
 
-def main():
+def load_domain_or_exit(domain):
+    """Import a domain config, printing a friendly error and exiting on failure."""
+    try:
+        return config.load_domain_config(domain)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except ImportError as e:
+        print(f"Error: Could not import domain config '{domain}': {e}")
+        print("\nMake sure the module path is correct and uses dot notation.")
+        sys.exit(1)
+
+
+def resolve_db_path(args):
+    """Database path from --db, or from the domain config."""
+    if args.db:
+        return args.db
+    if len(args.domain) > 1:
+        print("Error: pass a single --domain (or --db) to select the database")
+        sys.exit(1)
+    domain, _ = parse_domain_spec(args.domain[0])
+    return config.get_db_path(load_domain_or_exit(domain))
+
+
+def run_export(args):
+    """Stream a logged session to a JSONL/CSV/Parquet file."""
+    from core.db_logger import ValidationLogger
+    from core.exporter import export_session
+
+    db_path = resolve_db_path(args)
+    output = args.output or os.path.join(
+        config.DATA_DIR, f"{args.session_id}.{args.format}"
+    )
+    logger = ValidationLogger(db_path)
+    count = export_session(
+        logger, args.session_id, output, fmt=args.format, chunk_size=args.chunk_size
+    )
+    print(f"Exported {count} records from {db_path} to {output}")
+
+
+def run_prune(args):
+    """Apply retention to a validation database."""
+    from core.db_logger import ValidationLogger
+
+    if args.older_than_days is None and args.keep_last is None:
+        print("Error: prune needs --older-than-days and/or --keep-last")
+        sys.exit(1)
+
+    db_path = resolve_db_path(args)
+    logger = ValidationLogger(db_path)
+    summary = logger.apply_retention(
+        older_than_days=args.older_than_days,
+        keep_last=args.keep_last,
+        archive_dir=args.archive_dir,
+        compress=not args.no_compress,
+        dry_run=args.dry_run,
+    )
+
+    action = "Would prune" if args.dry_run else "Pruned"
+    print(f"{action} {len(summary['sessions'])} sessions from {db_path}")
+    for session_id in summary["sessions"]:
+        print(f"  - {session_id}")
+    if not args.dry_run:
+        print(f"Rows deleted: {summary['rows_deleted']}")
+        print(f"Memo entries deleted: {summary['memo_deleted']}")
+        print(f"Pages freed: {summary['pages_freed']}")
+        if summary["archive_path"]:
+            print(f"Archived to: {summary['archive_path']}")
+
+
+def run_serve(args):
+    """Run the HTTP validation service until interrupted."""
+    from core.service import ValidationService, create_server
+
+    try:
+        service = ValidationService(
+            domains=args.domains,
+            batch_window=(
+                args.batch_window_ms / 1000
+                if args.batch_window_ms is not None
+                else None
+            ),
+            max_batch=args.max_batch,
+            engine=args.engine or config.VALIDATION_ENGINE,
+            prompt_layout=args.prompt_layout or config.PROMPT_LAYOUT,
+            output_format=args.output_format or config.OUTPUT_FORMAT,
+        )
+    except (ImportError, ValueError) as e:
+        print(f"Error: Could not load domains: {e}")
+        sys.exit(1)
+
+    server = create_server(service, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"Serving {', '.join(service.domains)} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+def run_domains(args, domain_specs):
+    """Validate several domains together with the fair scheduler."""
+    from core.scheduler import DomainJob
+
+    unsupported = [
+        flag
+        for flag, value in [
+            ("--dedup", args.dedup),
+            ("--adaptive", args.adaptive),
+            ("--requery-ambiguous", args.requery_ambiguous),
+            ("--replay", args.replay),
+            ("--profile", args.profile),
+            ("--deadline", args.deadline),
+            ("--max-calls", args.max_calls),
+            ("--sink", args.sink),
+            ("--stream", args.stream),
+        ]
+        if value
+    ]
+    if unsupported:
+        print(
+            f"Error: {', '.join(unsupported)} cannot be combined with several domains"
+        )
+        sys.exit(1)
+
+    jobs = [
+        DomainJob(domain, load_domain_or_exit(domain), **options)
+        for domain, options in domain_specs
+    ]
+
+    print("Guardrails Validator - Multi-Domain Mode")
+    print("=" * 60)
+    for job in jobs:
+        print(
+            f"{job.name}: {len(job.items)} items, priority {job.priority}, weight {job.weight}"
+        )
+    print()
+
+    sessions = run_multi_domain(
+        jobs,
+        custom_display=default_display,
+        multi_sample=args.multi_sample or None,
+        engine=args.engine,
+        prompt_layout=args.prompt_layout,
+        output_format=args.output_format,
+        failover=args.failover or None,
+        workers=args.workers,
+        rate_limit=args.rate_limit,
+        compact_history=args.compact_history or None,
+        num_reasks=args.num_reasks,
+        reask_mode=args.reask_mode,
+        memo=args.memo or None,
+    )
+
+    print("-" * 60)
+    for session_info in sessions:
+        print(f"\n[{session_info['domain']}]", end="")
+        print_summary(session_info)
+
+
+DEFAULT_DOMAIN = "examples.domains.superhero_config"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line parser of main()."""
     parser = argparse.ArgumentParser(
         description="Guardrails Validator - Generic LLM validation with consensus",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
   uv run main.py --domain examples.domains.superhero_config
+  uv run main.py --domain product_review
+  uv run main.py --domain superhero --domain product_review:weight=3,priority=1
   uv run main.py  # Uses default superhero config
+  uv run main.py export <session_id> --format csv
+  uv run main.py prune --keep-last 20 --archive-dir data/archive
+  uv run main.py serve --port 8080 --domains superhero product_review
         """,
     )
     parser.add_argument(
         "--domain",
-        type=str,
-        default="examples.domains.superhero_config",
-        help="Python module path to domain configuration (default: examples.domains.superhero_config)",
+        action="append",
+        help=f"Registered domain name or Python module path to domain configuration (default: {DEFAULT_DOMAIN}); "
+        "repeat to schedule several domains together, each optionally as name:weight=W,priority=P",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="With several domains, items verified concurrently (default: SCHEDULER_WORKERS)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        help="With several domains, provider calls per second shared by all (default: SCHEDULER_RATE_LIMIT)",
+    )
+
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Validate duplicate items (case/whitespace/punctuation-insensitive) once",
+    )
+
+    parser.add_argument(
+        "--multi-sample",
+        action="store_true",
+        help="Get all iterations as choices of one request (adapters supporting n)",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Allocate calls adaptively: extra calls only for uncertain items",
+    )
+    parser.add_argument(
+        "--call-budget",
+        type=int,
+        help="Total API calls for --adaptive (default: items x iterations)",
+    )
+    parser.add_argument(
+        "--requery-ambiguous",
+        action="store_true",
+        help="Re-ask only ambiguous fields with a reduced schema after consensus",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["guard", "fast"],
+        help="Validation engine: full Guard pipeline or fast pydantic path for flat schemas",
+    )
+    parser.add_argument(
+        "--prompt-layout",
+        choices=["inline", "prefix"],
+        help="Prompt layout; 'prefix' keeps instructions in a cacheable system message",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=["json", "compact"],
+        help="Model answer format; 'compact' is a positional array (flat schemas)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream iterations, parse fields as they arrive and cancel streams once consensus is decided",
+    )
+    parser.add_argument(
+        "--num-reasks",
+        type=int,
+        help="Re-asks per guarded call that fails validation (default: domain NUM_REASKS, then config)",
+    )
+    parser.add_argument(
+        "--reask-mode",
+        choices=["reask", "resample"],
+        help="Failed answers get Guardrails' correction prompt or a fresh sample of the original prompt",
+    )
+    parser.add_argument(
+        "--failover",
+        action="store_true",
+        help="Fail over per call along the adapter's chain (FAILOVER_CHAINS) with circuit breakers",
+    )
+    parser.add_argument(
+        "--compact-history",
+        action="store_true",
+        help="Keep consensus history as compact shared records (less memory on large runs)",
+    )
+    parser.add_argument(
+        "--memo",
+        action="store_true",
+        help="Reuse decisive consensus results of earlier sessions (CONSENSUS_MEMO_TTL_SECONDS)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help="Wall-clock budget; iterations shrink near it, then the run stops and is marked partial",
+    )
+    parser.add_argument(
+        "--max-calls",
+        type=int,
+        help="Maximum API calls of the run (same behavior as --deadline)",
+    )
+    parser.add_argument(
+        "--sink",
+        action="append",
+        default=[],
+        metavar="SPEC",
+        help="Result sink, repeatable: jsonl:PATH, csv:PATH, sqlite[:DB_PATH] or progress "
+        "(replaces the per-call console log)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the run (cProfile, memory, per-phase timings); artifacts go to data/",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="SESSION_ID",
+        help="Serve responses from a logged session of the domain's database (offline)",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        action="store_true",
+        help="With --replay, sleep for each call's recorded latency",
     )
 
-    args = parser.parse_args()
+    subparsers = parser.add_subparsers(dest="command")
+
+    export_parser = subparsers.add_parser(
+        "export", help="Export a logged session to JSONL, CSV or Parquet"
+    )
+    export_parser.add_argument("session_id", help="Session ID to export")
+    export_parser.add_argument(
+        "--format",
+        choices=["jsonl", "csv", "parquet"],
+        default="jsonl",
+        help="Output format (default: jsonl; parquet requires pyarrow)",
+    )
+    export_parser.add_argument(
+        "--output", help="Output file (default: data/<session_id>.<format>)"
+    )
+    export_parser.add_argument(
+        "--db", help="Database path (default: the domain's database)"
+    )
+    export_parser.add_argument(
+        "--chunk-size", type=int, default=1000, help="Rows per chunk (default: 1000)"
+    )
+
+    prune_parser = subparsers.add_parser(
+        "prune", help="Prune (and optionally archive) old sessions"
+    )
+    prune_parser.add_argument(
+        "--older-than-days", type=float, help="Prune sessions older than N days"
+    )
+    prune_parser.add_argument(
+        "--keep-last", type=int, help="Keep only the N most recent sessions"
+    )
+    prune_parser.add_argument(
+        "--archive-dir", help="Archive pruned sessions into a DB file in this directory"
+    )
+    prune_parser.add_argument(
+        "--no-compress", action="store_true", help="Do not gzip the archive"
+    )
+    prune_parser.add_argument(
+        "--dry-run", action="store_true", help="List sessions without deleting"
+    )
+    prune_parser.add_argument(
+        "--db", help="Database path (default: the domain's database)"
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run a local HTTP/JSON validation service"
+    )
+    serve_parser.add_argument("--host", help="Bind address (default: SERVICE_HOST)")
+    serve_parser.add_argument("--port", type=int, help="Port (default: SERVICE_PORT)")
+    serve_parser.add_argument(
+        "--domains",
+        nargs="+",
+        help="Registered domain names or module paths (default: all registered)",
+    )
+    serve_parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        help="Collect concurrent requests for this long (default: SERVICE_BATCH_WINDOW_MS)",
+    )
+    serve_parser.add_argument(
+        "--max-batch",
+        type=int,
+        help="Max items per micro-batch (default: SERVICE_MAX_BATCH)",
+    )
+
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    args.domain = args.domain or [DEFAULT_DOMAIN]
+
+    if args.command == "serve":
+        run_serve(args)
+        return
+    if args.command == "export":
+        run_export(args)
+        return
+    if args.command == "prune":
+        run_prune(args)
+        return
 
-    # Import domain configuration
     try:
-        domain_config = importlib.import_module(args.domain)
-
-        # Validate required attributes
-        required_attrs = ["VALIDATION_TASK", "ITEMS_TO_VALIDATE", "VALIDATION_SCHEMA"]
-        missing = [attr for attr in required_attrs if not hasattr(domain_config, attr)]
-        if missing:
-            print(
-                f"Error: Domain config missing required attributes: {', '.join(missing)}"
+        domain_specs = [parse_domain_spec(spec) for spec in args.domain]
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if len(domain_specs) > 1 or domain_specs[0][1]:
+        run_domains(args, domain_specs)
+        return
+
+    # Import domain configuration (registered names map to module paths)
+    domain_config = load_domain_or_exit(domain_specs[0][0])
+
+    adapter = None
+    if args.replay:
+        from model_adapters.replay_adapter import ReplayAdapter
+
+        try:
+            adapter = ReplayAdapter(
+                session_id=args.replay,
+                db_path=config.get_db_path(domain_config),
+                simulate_latency=args.replay_latency,
+                schema=domain_config.VALIDATION_SCHEMA,
             )
+        except RuntimeError as e:
+            print(f"Error: {e}")
             sys.exit(1)
 
-    except ImportError as e:
-        print(f"Error: Could not import domain config '{args.domain}': {e}")
-        print("\nMake sure the module path is correct and uses dot notation.")
+    try:
+        sinks = [
+            make_sink(spec, config.get_db_path(domain_config)) for spec in args.sink
+        ]
+    except ValueError as e:
+        print(f"Error: {e}")
         sys.exit(1)
 
     print("Guardrails Validator - Generic Mode")
@@ -80,11 +472,36 @@ Examples:
     # Run validation with default CLI display
     # Use global config for iterations/threshold
     session_info = run_validation(
-        domain_config=domain_config, custom_display=default_display
+        domain_config=domain_config,
+        custom_display=None if sinks else default_display,
+        dedup=args.dedup or None,
+        adaptive=args.adaptive or None,
+        call_budget=args.call_budget,
+        multi_sample=args.multi_sample or None,
+        requery_ambiguous=args.requery_ambiguous or None,
+        engine=args.engine,
+        prompt_layout=args.prompt_layout,
+        output_format=args.output_format,
+        adapter=adapter,
+        failover=args.failover or None,
+        profile=args.profile or None,
+        compact_history=args.compact_history or None,
+        memo=args.memo or None,
+        deadline_seconds=args.deadline,
+        max_calls=args.max_calls,
+        sinks=sinks or None,
+        num_reasks=args.num_reasks,
+        reask_mode=args.reask_mode,
+        stream=args.stream or None,
     )
 
     print("-" * 60)
     print_summary(session_info)
+    if "profile" in session_info:
+        from core.profiling import format_phases
+
+        print()
+        print(format_phases(session_info["profile"]))
 
 
 if __name__ == "__main__":
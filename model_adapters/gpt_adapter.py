@@ -3,6 +3,9 @@ from llm_adapters import LLMAdapter
 
 
 class GPTAdapter(LLMAdapter):
+    # OpenAI returns several choices per request via `n`
+    supports_n = True
+
     def __init__(self):
         self.api_key = os.getenv("OPENAI_API_KEY")
         if not self.api_key:
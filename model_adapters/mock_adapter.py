@@ -1,48 +1,109 @@
+import random
+import time
 from llm_adapters import LLMAdapter
+from core.compact_format import COMPACT_MARKER, compact_answer
+
+# Canned answers keyed by hero name found in the prompt
+HERO_RESPONSES = {
+    "Superman": '{"can_fly": true, "has_super_strength": true, "gender": "male"}',
+    "Wonder Woman": '{"can_fly": true, "has_super_strength": true, "gender": "female"}',
+    "Batman": '{"can_fly": false, "has_super_strength": false, "gender": "male"}',
+}
+DEFAULT_RESPONSE = (
+    '{"can_fly": false, "has_super_strength": false, "gender": "unknown"}'
+)
 
 
 class MockAdapter(LLMAdapter):
-    def get_params(self) -> dict:
-        # Mock adapter acts differently; main.py handles it specially or we need to support it.
-        # But wait, guardrails doesn't support "mock" provider via params natively?
-        # Actually, Guardrails has no native "mock" provider that takes specific params like this.
-        # However, looking at main.py:
-        #     guard_kwargs = adapter.get_params()
-        #     res = guard(..., **guard_kwargs)
-        #
-        # If we return empty dict, guard() uses default model? Or fails?
-        # The user's main.py implies MockAdapter works.
-        # If MockAdapter was working before, it was a callable.
-        # But now we changed main.py to call guard(**params).
-        # This breaks MockAdapter if MockAdapter was a local callable!
-        #
-        # Use Case in main.py:
-        # if adapter is MockAdapter, we might need to handle it.
-        # But main.py says:
-        #     guard_kwargs = adapter.get_params()
-        #     res = guard(..., **guard_kwargs)
-        #
-        # If MockAdapter returns {"llm_api": self_callable}, then guard uses it!
-        # Because `guard(llm_api=...)` is valid.
-        # So MockAdapter should return `{"llm_api": self}` and implement `__call__`.
+    supports_n = True
+
+    def __init__(
+        self,
+        variation: float = 0.0,
+        seed: int | None = None,
+        chunk_size: int = 8,
+        chunk_delay: float = 0.0,
+    ):
+        """
+        Offline adapter returning canned hero answers.
 
+        Args:
+            variation: Probability that an answer is replaced by a random canned
+                one, so consensus sees disagreement (0.0 = always the same answer)
+            seed: Seed for the variation, for reproducible tests
+            chunk_size: Characters per chunk of stream()
+            chunk_delay: Seconds before each streamed chunk (simulated generation)
+        """
+        assert 0.0 <= variation <= 1.0, "variation must be between 0.0 and 1.0"
+        assert chunk_size > 0, "chunk_size must be positive"
+        self.variation = variation
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        # Chunks handed out by stream() (fewer when streams are closed early)
+        self.chunks_sent = 0
+        self._rng = random.Random(seed)
+        # Number of requests served (one per __call__ or complete())
+        self.requests = 0
+        # System prompts seen so far, to report prefix-cache hits like a provider
+        self._cached_prefixes = set()
+
+    def get_params(self) -> dict:
+        # Guardrails has no native "mock" provider, but guard(llm_api=callable)
+        # is valid, so the adapter itself is the LLM callable (see __call__).
         return {"llm_api": self}
 
     def __call__(
         self, prompt: str | None = None, messages: list | None = None, **kwargs
     ) -> str:
         # Simple logic to return valid JSON based on hero name in prompt
-        # Extract hero name from prompt if possible
-        if prompt is not None:
-            if "Superman" in prompt:
-                return '{"can_fly": true, "has_super_strength": true, "gender": "male"}'
-            elif "Wonder Woman" in prompt:
-                return (
-                    '{"can_fly": true, "has_super_strength": true, "gender": "female"}'
-                )
-            elif "Batman" in prompt:
-                return (
-                    '{"can_fly": false, "has_super_strength": false, "gender": "male"}'
-                )
-
-        return '{"can_fly": false, "has_super_strength": false, "gender": "unknown"}'
+        self.requests += 1
+        return self._answer(prompt or self._messages_text(messages))
+
+    def complete(self, messages: list, n: int = 1) -> list:
+        """One request, n (possibly varied) choices."""
+        self.requests += 1
+        self.last_usage = self._usage(messages)
+        text = self._messages_text(messages)
+        return [self._answer(text) for _ in range(n)]
+
+    def stream(self, messages: list):
+        """One request, its answer yielded in chunk_size pieces."""
+        self.requests += 1
+        text = self._answer(self._messages_text(messages))
+        for start in range(0, len(text), self.chunk_size):
+            if self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            self.chunks_sent += 1
+            yield text[start : start + self.chunk_size]
+
+    def _usage(self, messages: list) -> dict:
+        """OpenAI-style usage (~4 chars per token); a repeated system prefix counts as cached."""
+        prompt_tokens = len(self._messages_text(messages)) // 4
+        cached_tokens = 0
+        if messages and messages[0].get("role") == "system":
+            prefix = messages[0]["content"]
+            if prefix in self._cached_prefixes:
+                cached_tokens = len(prefix) // 4
+            self._cached_prefixes.add(prefix)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }
+
+    def _messages_text(self, messages: list | None) -> str:
+        return "\n".join(str(m.get("content", "")) for m in messages or [])
+
+    def _answer(self, text: str) -> str:
+        response = self._json_answer(text)
+        if COMPACT_MARKER in text:
+            return compact_answer(response, text)
+        return response
+
+    def _json_answer(self, text: str) -> str:
+        if self.variation and self._rng.random() < self.variation:
+            return self._rng.choice([*HERO_RESPONSES.values(), DEFAULT_RESPONSE])
+
+        for hero, response in HERO_RESPONSES.items():
+            if hero in text:
+                return response
+        return DEFAULT_RESPONSE
@@ -0,0 +1,178 @@
+import os
+import re
+import json
+import threading
+import time
+from datetime import datetime
+from pydantic import TypeAdapter, ValidationError
+from llm_adapters import LLMAdapter
+from core.compact_format import COMPACT_MARKER, compact_answer
+
+# Both prompt layouts name the item this way (see HeroVerifier._build_messages)
+_ITEM_PATTERN = re.compile(r'Analyze the following item: "(.*)"')
+
+# Field values are logged as str(value); map Python literals back to JSON.
+# With a schema, a decoded value its field's type rejects stays a string
+_LITERALS = {"True": True, "False": False, "None": None}
+
+
+class ReplayError(RuntimeError):
+    """Raised for a recorded error response or a call that was never recorded."""
+
+
+class ReplayAdapter(LLMAdapter):
+    supports_n = True
+
+    def __init__(
+        self,
+        session_id: str | None = None,
+        db_path: str | None = None,
+        simulate_latency: bool = False,
+        latency_scale: float = 1.0,
+        schema=None,
+    ):
+        """
+        Offline adapter serving the responses of a logged session.
+
+        All rows of the session are loaded and indexed by (item, iteration)
+        once; each call for an item returns that item's next recorded
+        iteration. Recorded errors are raised again so they become error votes.
+
+        Args:
+            session_id: Session to replay (default: REPLAY_SESSION_ID env var)
+            db_path: Database holding the session (default: REPLAY_DB_PATH env var)
+            simulate_latency: Sleep for each call's recorded latency (time since
+                the previous logged call of the session)
+            latency_scale: Multiplier for the simulated latency
+            schema: Pydantic model the session was validated against. Values
+                are decoded by its field types, so a str field recorded as
+                "5" replays as "5"; without it numbers and literals are guessed
+        """
+        self.session_id = session_id or os.getenv("REPLAY_SESSION_ID")
+        self.db_path = db_path or os.getenv("REPLAY_DB_PATH")
+        if not self.session_id or not self.db_path:
+            raise RuntimeError(
+                "Set REPLAY_SESSION_ID and REPLAY_DB_PATH (or pass session_id and db_path) to replay a session."
+            )
+        assert latency_scale >= 0, "latency_scale cannot be negative"
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+        self._field_types = {
+            name: TypeAdapter(field.annotation)
+            for name, field in (schema.model_fields.items() if schema else ())
+        }
+
+        from core.db_logger import ValidationLogger
+
+        logger = ValidationLogger(self.db_path)
+        session = logger.get_session(self.session_id)
+        if session is None:
+            raise RuntimeError(f"Session {self.session_id} not found in {self.db_path}")
+        self.model_name = f"replay:{session.get('model_name') or 'unknown'}"
+
+        # (item, iteration) -> response text, or ReplayError for recorded errors
+        self.responses = {}
+        # (item, iteration) -> recorded latency in seconds
+        self.latencies = {}
+        self._load(logger, session)
+
+        # Next iteration served per item; concurrent samples of one item
+        # must each get their own iteration
+        self._next_iteration = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def _load(self, logger, session):
+        fields = {}
+        timestamps = {}
+        for chunk in logger.iter_session_rows(self.session_id):
+            for item, iteration, timestamp, *_, field, value, is_error, error in chunk:
+                key = (item, iteration)
+                timestamps.setdefault(key, timestamp)
+                if is_error:
+                    self.responses[key] = ReplayError(error or "Recorded error")
+                else:
+                    fields.setdefault(key, {})[field] = self._decode_value(field, value)
+
+        for key, data in fields.items():
+            self.responses.setdefault(key, json.dumps(data))
+
+        # Latency of a call: time since the previous call of the session was logged
+        previous = datetime.fromisoformat(session["started_at"])
+        for key, timestamp in sorted(timestamps.items(), key=lambda kv: kv[1]):
+            current = datetime.fromisoformat(timestamp)
+            self.latencies[key] = max((current - previous).total_seconds(), 0.0)
+            previous = current
+
+    def _decode_value(self, field, value):
+        decoded = self._guess_value(value)
+        field_type = self._field_types.get(field)
+        if field_type is None or decoded is value:
+            return decoded
+        try:
+            field_type.validate_python(decoded, strict=True)
+        except ValidationError:
+            return value
+        return decoded
+
+    def _guess_value(self, value):
+        if value in _LITERALS:
+            return _LITERALS[value]
+        try:
+            number = json.loads(value)
+        except (TypeError, ValueError):
+            return value
+        return number if isinstance(number, (int, float)) else value
+
+    def get_params(self) -> dict:
+        # Same as MockAdapter: the adapter itself is the guard's LLM callable
+        return {"llm_api": self}
+
+    def __call__(
+        self, prompt: str | None = None, messages: list | None = None, **kwargs
+    ) -> str:
+        self._count_request()
+        text = prompt or self._messages_text(messages)
+        return self._serve(text)
+
+    def complete(self, messages: list, n: int = 1) -> list:
+        """One request, the item's next n recorded iterations."""
+        self._count_request()
+        text = self._messages_text(messages)
+        return [self._serve(text) for _ in range(n)]
+
+    def stream(self, messages: list):
+        """One request, the item's next recorded iteration as a single chunk."""
+        self._count_request()
+        yield self._serve(self._messages_text(messages))
+
+    def _count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def _messages_text(self, messages: list | None) -> str:
+        return "\n".join(str(m.get("content", "")) for m in messages or [])
+
+    def _serve(self, text: str) -> str:
+        match = _ITEM_PATTERN.search(text)
+        if match is None:
+            raise ReplayError("No item found in the prompt")
+        item = match.group(1)
+        with self._lock:
+            iteration = self._next_iteration.get(item, 1)
+            self._next_iteration[item] = iteration + 1
+
+        key = (item, iteration)
+        if key not in self.responses:
+            raise ReplayError(
+                f"No recorded response for {item!r} iteration {iteration}"
+            )
+        if self.simulate_latency:
+            time.sleep(self.latencies.get(key, 0.0) * self.latency_scale)
+
+        response = self.responses[key]
+        if isinstance(response, ReplayError):
+            raise response
+        if COMPACT_MARKER in text:
+            return compact_answer(response, text)
+        return response
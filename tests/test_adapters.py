@@ -37,3 +37,26 @@ def test_mock_adapter_batman():
 
     assert "can_fly" in result
     assert "false" in result.lower()
+
+
+def test_mock_adapter_reads_messages():
+    """Test MockAdapter answers from chat messages, as Guard passes them."""
+    adapter = MockAdapter()
+    result = adapter(messages=[{"role": "user", "content": 'Analyze "Wonder Woman"'}])
+
+    assert '"gender": "female"' in result
+    assert adapter.requests == 1
+
+
+def test_mock_adapter_complete_n():
+    """Test one request returns n choices, varied when requested."""
+    messages = [{"role": "user", "content": "Superman"}]
+
+    steady = MockAdapter()
+    assert len(set(steady.complete(messages, n=5))) == 1
+
+    varied = MockAdapter(variation=0.8, seed=1)
+    choices = varied.complete(messages, n=20)
+    assert len(choices) == 20
+    assert len(set(choices)) > 1
+    assert varied.requests == 1
@@ -0,0 +1,62 @@
+"""
+Tests for adaptive call allocation
+"""
+
+import pytest
+from models import HeroCapabilities
+from core.adaptive import AdaptiveSampler, majority_confidence
+from core.verifier import ConsensusVerifier
+
+
+class ScriptedVerifier(ConsensusVerifier):
+    """Verifier whose calls return scripted answers instead of hitting an LLM."""
+
+    def __init__(self, answers, **kwargs):
+        from model_adapters.mock_adapter import MockAdapter
+
+        super().__init__(adapter=MockAdapter(), schema=HeroCapabilities, **kwargs)
+        self.answers = answers
+        self.calls = {item: 0 for item in answers}
+
+    def _call_guard(self, item_name, schema=None):
+        answer = self.answers[item_name][self.calls[item_name]]
+        self.calls[item_name] += 1
+        return {"can_fly": answer, "has_super_strength": True, "gender": "male"}
+
+
+def test_majority_confidence():
+    """Test the Beta posterior grows with agreement and shrinks with dissent."""
+    assert majority_confidence(2, 2) == pytest.approx(7 / 8)
+    assert majority_confidence(3, 3) == pytest.approx(15 / 16)
+    assert majority_confidence(2, 4) < majority_confidence(3, 4)
+    assert majority_confidence(0, 0) == 0.5
+
+
+def test_extra_calls_go_to_contested_items():
+    """Test easy items stop early while contested ones get the remaining budget."""
+    answers = {
+        "Superman": [True] * 6,
+        "Thor": [True, False, True, False, True, True],
+    }
+    verifier = ScriptedVerifier(answers, iterations=6, threshold=0.6)
+
+    sampler = AdaptiveSampler(verifier, confidence=0.9, initial_iterations=2)
+    results = sampler.run(["Superman", "Thor"])
+
+    # Superman settles after 3 unanimous calls (15/16 >= 0.9); Thor uses the cap
+    assert [r["iterations"] for r in results] == [3, 6]
+    assert sampler.calls_made == 9
+    assert results[0]["consensus"]["can_fly"] is True
+    # Thor: 4/6 True meets ceil(6 * 0.6) = 4
+    assert results[1]["consensus"]["can_fly"] is True
+
+
+def test_call_budget_is_respected():
+    """Test the total number of calls never exceeds the budget."""
+    answers = {name: [True, False] * 5 for name in ("A", "B", "C")}
+    verifier = ScriptedVerifier(answers, iterations=10)
+
+    results = verifier.verify_adaptive(["A", "B", "C"], call_budget=7)
+
+    assert sum(r["iterations"] for r in results) == 7
+    assert all(r["iterations"] >= 2 for r in results)
@@ -0,0 +1,83 @@
+"""
+Tests for vectorized batch consensus
+"""
+
+import random
+import pytest
+from models import HeroCapabilities
+from model_adapters.mock_adapter import MockAdapter
+from core.verifier import ConsensusVerifier
+
+pytest.importorskip("numpy")
+
+from core.batch_consensus import batch_consensus, encode_votes
+
+FIELDS = list(HeroCapabilities.model_fields.keys())
+
+
+def _random_history(rng, iterations):
+    history = []
+    for _ in range(iterations):
+        if rng.random() < 0.15:
+            history.append({"error": "boom"})
+            continue
+        entry = {
+            "can_fly": rng.choice([True, False]),
+            "has_super_strength": rng.choice([True, False, None]),
+            "gender": rng.choice(["male", "female", "unknown"]),
+        }
+        # Occasionally drop a field to exercise missing votes
+        if rng.random() < 0.1:
+            entry.pop(rng.choice(FIELDS))
+        history.append(entry)
+    return history
+
+
+@pytest.mark.parametrize("threshold", [0, 1, 2, 3, 5])
+def test_matches_per_item_consensus(threshold):
+    """Test batch results equal _calculate_consensus item by item."""
+    rng = random.Random(threshold)
+    verifier = ConsensusVerifier(
+        adapter=MockAdapter(),
+        schema=HeroCapabilities,
+        iterations=5,
+        threshold=threshold,
+    )
+    histories = [_random_history(rng, rng.randint(1, 5)) for _ in range(300)]
+    histories.append([{"error": "only errors"}])
+    histories.append([{}])
+
+    expected = [verifier._calculate_consensus(history) for history in histories]
+
+    assert verifier.calculate_batch_consensus(histories) == expected
+
+
+def test_ties_break_by_first_appearance():
+    """Test ties resolve to the value seen first, like Counter.most_common."""
+    history = [{"gender": "female"}, {"gender": "male"}, {"gender": "male"}]
+    history += [{"gender": "female"}]
+
+    result = batch_consensus([history], ["gender"], threshold=2)
+
+    assert result == [{"gender": "female"}]
+
+
+def test_high_cardinality_field():
+    """Test a free-text field with a value per item beside a boolean field."""
+    histories = [
+        [{"name": f"hero {i}", "can_fly": i % 2 == 0}] * 2 + [{"name": "x"}]
+        for i in range(5000)
+    ]
+
+    results = batch_consensus(histories, ["name", "can_fly"], threshold=2)
+
+    assert results[0] == {"name": "hero 0", "can_fly": True}
+    assert results[4999] == {"name": "hero 4999", "can_fly": False}
+
+
+def test_encode_votes_shape():
+    """Test encoded array is items x iterations x fields."""
+    encoded = encode_votes([[{"can_fly": True}], [{}, {}]], FIELDS)
+
+    assert encoded.shape == (2, 2, 3)
+    assert encoded.vocabularies[0] == [True]
@@ -0,0 +1,177 @@
+"""
+Tests for circuit breakers and adapter failover
+"""
+
+from types import SimpleNamespace
+import pytest
+import config
+from models import HeroCapabilities
+from core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    AllAdaptersUnavailable,
+    CircuitBreaker,
+    FailoverAdapter,
+)
+from core.db_logger import ValidationLogger
+from examples.validation_helpers import run_validation
+from model_adapters.mock_adapter import MockAdapter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class DownAdapter(MockAdapter):
+    """Adapter whose every request fails."""
+
+    def complete(self, messages, n=1):
+        self.requests += 1
+        raise ConnectionError("provider down")
+
+
+class BrokenStreamAdapter(MockAdapter):
+    """Adapter whose streams fail after the first chunk."""
+
+    def stream(self, messages):
+        self.requests += 1
+        yield '{"can_fly": '
+        raise ConnectionError("stream cut")
+
+
+class InterruptedAdapter(MockAdapter):
+    """Adapter whose requests are interrupted."""
+
+    def complete(self, messages, n=1):
+        raise KeyboardInterrupt
+
+
+MESSAGES = [{"role": "user", "content": 'Analyze the following item: "Superman"'}]
+
+
+def test_breaker_opens_and_recovers():
+    """Test the circuit opens on failures, half-opens after cool-down and closes on success."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(window=4, min_calls=2, open_seconds=10, clock=clock)
+
+    breaker.record(True)
+    breaker.record(False)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # one trial call at a time
+    breaker.record(True)
+    assert breaker.state == CLOSED
+
+
+def test_breaker_counts_slow_calls():
+    """Test successful but slow calls count as failures."""
+    breaker = CircuitBreaker(min_calls=2, slow_call_seconds=1.0)
+
+    breaker.record(True, latency=5.0)
+    breaker.record(True, latency=5.0)
+
+    assert breaker.state == OPEN
+
+
+def test_failover_skips_down_adapter():
+    """Test calls fail over per call and skip the adapter once its circuit opens."""
+    down, backup = DownAdapter(), MockAdapter()
+    events = []
+    adapter = FailoverAdapter(
+        [("groq", down), ("mock", backup)],
+        breakers={
+            "groq": CircuitBreaker(window=4, min_calls=2),
+            "mock": CircuitBreaker(),
+        },
+        on_event=events.append,
+    )
+
+    for _ in range(4):
+        assert "true" in adapter.complete(MESSAGES)[0]
+
+    assert down.requests == 2
+    assert backup.requests == 4
+    assert adapter.last_adapter == "mock"
+    # The open circuit is reported once, not for every call it skips
+    assert [e["reason"] for e in events] == ["error", "error", "circuit_open"]
+    assert events[0]["to_adapter"] == "mock"
+    assert events[0]["error_message"] == "provider down"
+
+
+def test_interrupted_trial_is_released():
+    """Test a half-open trial interrupted by a BaseException frees the trial slot."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(window=2, min_calls=1, open_seconds=10, clock=clock)
+    breaker.record(False)
+    clock.now = 10
+    adapter = FailoverAdapter(
+        [("flaky", InterruptedAdapter())], breakers={"flaky": breaker}
+    )
+
+    with pytest.raises(KeyboardInterrupt):
+        adapter.complete(MESSAGES)
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+def test_stream_error_after_first_chunk_is_recorded():
+    """Test a stream failing mid-way is raised and counts against the breaker."""
+    breaker = CircuitBreaker(window=2, min_calls=2)
+    adapter = FailoverAdapter(
+        [("broken", BrokenStreamAdapter())], breakers={"broken": breaker}
+    )
+
+    for _ in range(2):
+        chunks = []
+        with pytest.raises(ConnectionError, match="stream cut"):
+            for chunk in adapter.stream(MESSAGES):
+                chunks.append(chunk)
+        assert chunks == ['{"can_fly": ']
+
+    assert breaker.state == OPEN
+
+
+def test_failover_all_down():
+    """Test an error is raised when no adapter in the chain can serve."""
+    adapter = FailoverAdapter(
+        [("a", DownAdapter()), ("b", DownAdapter())],
+        breakers={"a": CircuitBreaker(), "b": CircuitBreaker()},
+    )
+
+    with pytest.raises(AllAdaptersUnavailable, match="provider down"):
+        adapter(messages=MESSAGES)
+
+
+def test_failover_events_logged(tmp_path, monkeypatch):
+    """Test run_validation records failover hops in the session's database."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    domain_config = SimpleNamespace(
+        VALIDATION_TASK="failover test",
+        ITEMS_TO_VALIDATE=["Superman"],
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "failover.db"),
+    )
+    adapter = FailoverAdapter(
+        [("groq", DownAdapter()), ("mock", MockAdapter())],
+        breakers={"groq": CircuitBreaker(), "mock": CircuitBreaker()},
+    )
+
+    session_info = run_validation(
+        domain_config, iterations=2, adapter=adapter, engine="fast"
+    )
+
+    assert session_info["results"][0]["consensus"]["can_fly"] is True
+    events = ValidationLogger(session_info["db_path"]).get_failover_events(
+        session_info["session_id"]
+    )
+    assert [event[1:4] for event in events] == [("groq", "mock", "error")] * 2
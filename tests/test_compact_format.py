@@ -0,0 +1,75 @@
+"""
+Tests for the compact positional output format
+"""
+
+import pytest
+from models import HeroCapabilities
+from core.compact_format import compact_answer, get_codec
+from core.verifier import ConsensusVerifier
+from model_adapters.mock_adapter import MockAdapter
+
+
+def test_codec_round_trip():
+    """Test booleans become 1/0 and Literal values their option index."""
+    codec = get_codec(HeroCapabilities)
+    data = {"can_fly": True, "has_super_strength": False, "gender": "unknown"}
+
+    assert codec.encode(data) == "[1, 0, 2]"
+    assert codec.decode("[1, 0, 2]") == data
+    assert codec.decode("```json\n[0,1,1]\n```")["gender"] == "female"
+
+
+def test_codec_rejects_bad_answers():
+    """Test wrong lengths, unknown codes and missing arrays are errors."""
+    codec = get_codec(HeroCapabilities)
+
+    for text in ("[1, 0]", "[1, 0, 7]", '{"can_fly": true}'):
+        with pytest.raises(ValueError):
+            codec.decode(text)
+
+
+def test_codec_instructions():
+    """Test the prompt lists every field with its codes in schema order."""
+    instructions = get_codec(HeroCapabilities).instructions()
+
+    assert "1. can_fly: 1 = true, 0 = false" in instructions
+    assert "3. gender: 0 = male, 1 = female, 2 = unknown" in instructions
+
+
+def test_compact_answer():
+    """Test JSON answers re-encode from the prompt and unknown values fail."""
+    from pydantic import BaseModel
+
+    class Scored(BaseModel):
+        can_fly: bool
+        score: int
+
+    prompt = get_codec(HeroCapabilities).instructions()
+    answer = '{"can_fly": false, "has_super_strength": true, "gender": "female"}'
+
+    assert compact_answer(answer, prompt) == "[0, 1, 1]"
+    assert (
+        compact_answer(
+            '{"can_fly": true, "score": 7}', get_codec(Scored).instructions()
+        )
+        == "[1, 7]"
+    )
+    with pytest.raises(ValueError, match="gender"):
+        compact_answer(answer.replace("female", "robot"), prompt)
+
+
+def test_compact_consensus_matches_json():
+    """Test compact answers decode to the same consensus as JSON answers."""
+    results = {
+        output_format: ConsensusVerifier(
+            MockAdapter(),
+            HeroCapabilities,
+            iterations=3,
+            engine="fast",
+            output_format=output_format,
+        ).verify("Wonder Woman")
+        for output_format in ("json", "compact")
+    }
+
+    assert results["compact"] == results["json"]
+    assert results["compact"]["consensus"]["gender"] == "female"
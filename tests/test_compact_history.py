@@ -0,0 +1,111 @@
+"""
+Tests for compact consensus history
+"""
+
+import json
+from types import SimpleNamespace
+import config
+from models import HeroCapabilities
+from core.compact_history import HistoryRecord, get_layout
+from core.verifier import ConsensusVerifier
+from examples.validation_helpers import run_validation
+from model_adapters.mock_adapter import MockAdapter
+
+
+def test_records_behave_like_dicts():
+    """Test records compare, index and iterate like the response dicts."""
+    layout = get_layout(HeroCapabilities)
+    res = json.loads('{"can_fly": true, "has_super_strength": false, "gender": "male"}')
+
+    record = layout.compact(res)
+
+    assert isinstance(record, HistoryRecord)
+    assert record == res
+    assert dict(record) == res
+    assert record["gender"] == "male"
+    assert record.get("missing", "N/A") == "N/A"
+    assert "error" not in record
+    assert list(record) == list(res)
+
+
+def test_records_are_shared():
+    """Test identical answers and identical errors share one record."""
+    layout = get_layout(HeroCapabilities)
+    answer = '{"can_fly": false, "has_super_strength": true, "gender": "female"}'
+
+    first = layout.compact(json.loads(answer))
+    second = layout.compact(json.loads(answer))
+    error = layout.compact({"error": "timeout"})
+
+    assert first is second
+    assert error is layout.compact({"error": "timeout"})
+    assert error["error"] == "timeout" and "error" in error
+    assert layout.compact({"can_fly": True}) == {"can_fly": True}
+
+
+def test_equal_values_of_other_types_are_not_shared():
+    """Test 1, 1.0 and True get records of their own."""
+    layout = get_layout(HeroCapabilities)
+
+    records = [layout.compact({"can_fly": value}) for value in (True, 1, 1.0)]
+
+    assert [type(record["can_fly"]) for record in records] == [bool, int, float]
+
+
+def test_unknown_keys_stay_dicts():
+    """Test responses with keys outside the schema are kept as they are."""
+    layout = get_layout(HeroCapabilities)
+    res = {"can_fly": True, "extra": 1}
+
+    assert layout.compact(res) is res
+
+
+def test_consensus_from_records():
+    """Test consensus over records matches consensus over dicts."""
+    verifier = ConsensusVerifier(
+        MockAdapter(), HeroCapabilities, iterations=4, threshold=3, engine="fast"
+    )
+    layout = get_layout(HeroCapabilities)
+    history = [
+        {"can_fly": True, "has_super_strength": True, "gender": "male"},
+        {"can_fly": True, "has_super_strength": False, "gender": "male"},
+        {"error": "boom"},
+        {"can_fly": True, "gender": "male"},
+    ]
+
+    expected = verifier._calculate_consensus(history)
+    records = [layout.compact(res) for res in history]
+
+    assert verifier._calculate_consensus(records) == expected
+    assert expected == {
+        "can_fly": True,
+        "has_super_strength": "ambiguous",
+        "gender": "male",
+    }
+    assert verifier._calculate_consensus([layout.compact({"error": "x"})]) == {
+        "error": "No valid responses"
+    }
+
+
+def test_run_with_compact_history(tmp_path, monkeypatch):
+    """Test run_validation keeps compact records in results."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    domain_config = SimpleNamespace(
+        VALIDATION_TASK="compact history test",
+        ITEMS_TO_VALIDATE=["Superman", "Superman"],
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "compact.db"),
+    )
+
+    session_info = run_validation(
+        domain_config,
+        iterations=3,
+        adapter=MockAdapter(),
+        engine="fast",
+        compact_history=True,
+    )
+
+    histories = [result["history"] for result in session_info["results"]]
+    assert all(isinstance(entry, HistoryRecord) for entry in histories[0])
+    assert histories[0][0] is histories[1][2]
+    assert session_info["results"][0]["consensus"]["can_fly"] is True
@@ -0,0 +1,68 @@
+"""
+Tests for framework configuration and adapter registry
+"""
+
+import os
+import sys
+import subprocess
+import pytest
+import config
+from model_adapters.mock_adapter import MockAdapter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_main_is_lazy():
+    """Test importing the CLI does not pull in guardrails or adapter modules."""
+    code = (
+        "import sys, main; "
+        "print(sorted(m for m in sys.modules "
+        "if m.split('.')[0] in ('guardrails', 'model_adapters')))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_get_selected_adapter_mock():
+    """Test the registry resolves the mock adapter by name."""
+    adapter = config.get_selected_adapter("MOCK")
+    assert isinstance(adapter, MockAdapter)
+
+
+def test_register_adapter():
+    """Test custom adapters can be registered by class or import string."""
+    config.register_adapter("custom", "model_adapters.mock_adapter:MockAdapter")
+    try:
+        assert config.get_adapter_class("custom") is MockAdapter
+    finally:
+        config.ADAPTER_REGISTRY.pop("custom")
+
+
+def test_unknown_adapter():
+    """Test unknown adapter types raise ValueError."""
+    with pytest.raises(ValueError):
+        config.get_selected_adapter("does-not-exist")
+
+
+def test_domain_option_leaves_subcommands_alone():
+    """Test --domain before export/prune doesn't swallow the subcommand."""
+    from main import build_parser
+
+    parser = build_parser()
+
+    args = parser.parse_args(["--domain", "product_review", "export", "sid"])
+    assert (args.domain, args.command, args.session_id) == (
+        ["product_review"],
+        "export",
+        "sid",
+    )
+    args = parser.parse_args(["--domain", "superhero", "prune", "--keep-last", "3"])
+    assert (args.domain, args.command, args.keep_last) == (["superhero"], "prune", 3)
+    args = parser.parse_args(["--domain", "superhero", "--domain", "product_review"])
+    assert args.domain == ["superhero", "product_review"]
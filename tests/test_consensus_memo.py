@@ -0,0 +1,114 @@
+"""
+Tests for the cross-session consensus memo
+"""
+
+from types import SimpleNamespace
+from pydantic import BaseModel, Field
+import config
+from models import HeroCapabilities
+from core.consensus_memo import consensus_policy, is_decisive, memo_key
+from core.db_logger import ValidationLogger
+from core.scheduler import DomainJob
+from examples.validation_helpers import run_multi_domain, run_validation
+from model_adapters.mock_adapter import MockAdapter
+
+
+class RenamedCapabilities(BaseModel):
+    can_fly: bool = Field(description="Whether the hero can fly")
+
+
+def make_domain(tmp_path, items):
+    return SimpleNamespace(
+        VALIDATION_TASK="memo test",
+        ITEMS_TO_VALIDATE=items,
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "memo.db"),
+    )
+
+
+def test_memo_key_parts():
+    """Test the key ignores item formatting but not schema, model or policy."""
+    policy = consensus_policy(5, 3)
+    key = memo_key("Superman", HeroCapabilities, "task", "model-a", policy)
+
+    assert memo_key(" superman! ", HeroCapabilities, "task", "model-a", policy) == key
+    assert memo_key("Superman", RenamedCapabilities, "task", "model-a", policy) != key
+    assert memo_key("Superman", HeroCapabilities, "task", "model-b", policy) != key
+    assert (
+        memo_key(
+            "Superman", HeroCapabilities, "task", "model-a", consensus_policy(5, 4)
+        )
+        != key
+    )
+    assert is_decisive({"can_fly": True, "gender": "male"})
+    assert not is_decisive({"can_fly": "ambiguous"})
+    assert not is_decisive({"error": "No valid responses"})
+
+
+def test_second_session_hits_memo(tmp_path, monkeypatch):
+    """Test a later session reuses decisive results without calling the LLM."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    first = run_validation(
+        make_domain(tmp_path, ["Superman"]),
+        iterations=3,
+        adapter=MockAdapter(),
+        engine="fast",
+        memo=True,
+    )
+
+    adapter = MockAdapter()
+    second = run_validation(
+        make_domain(tmp_path, ["superman", "Batman"]),
+        iterations=3,
+        adapter=adapter,
+        engine="fast",
+        memo=True,
+    )
+
+    hit, miss = second["results"]
+    assert hit["memo_session_id"] == first["session_id"]
+    assert hit["consensus"] == first["results"][0]["consensus"]
+    assert hit["history"] == []
+    assert "memo_session_id" not in miss
+    assert adapter.requests == 3
+    assert second["api_calls"] == 3
+
+
+def test_multi_domain_run_uses_memo(tmp_path, monkeypatch):
+    """Test multi-domain runs read and honour the memo too."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    first = run_validation(
+        make_domain(tmp_path, ["Superman"]),
+        iterations=3,
+        adapter=MockAdapter(),
+        engine="fast",
+        memo=True,
+    )
+
+    adapter = MockAdapter()
+    (session,) = run_multi_domain(
+        [DomainJob("heroes", make_domain(tmp_path, ["superman", "Batman"]))],
+        iterations=3,
+        adapter=adapter,
+        engine="fast",
+        memo=True,
+    )
+
+    hit, miss = session["results"]
+    assert hit["memo_session_id"] == first["session_id"]
+    assert "memo_session_id" not in miss
+    assert adapter.requests == 3
+
+
+def test_memo_expires(tmp_path):
+    """Test entries older than the TTL are ignored and can be pruned."""
+    logger = ValidationLogger(str(tmp_path / "memo.db"))
+    logger.store_consensus_memo(
+        "key", "Superman", "fp", "task", "model", "3/5", {"can_fly": True}
+    )
+
+    assert logger.get_consensus_memo("key")["consensus"] == {"can_fly": True}
+    assert logger.get_consensus_memo("key", max_age_seconds=60) is not None
+    assert logger.get_consensus_memo("key", max_age_seconds=-1) is None
+    assert logger.prune_consensus_memo(-1) == 1
+    assert logger.get_consensus_memo("key") is None
@@ -4,6 +4,7 @@ Tests for database logger functionality
 
 import os
 import tempfile
+import pytest
 from core.db_logger import ValidationLogger
 
 
@@ -125,3 +126,330 @@ def test_error_logging():
     finally:
         if os.path.exists(db_path):
             os.remove(db_path)
+
+
+def _log_history(logger, session_id, item_name, history, model_name="test-model"):
+    for i, response in enumerate(history, 1):
+        logger.log_response(
+            session_id=session_id,
+            item_name=item_name,
+            iteration_number=i,
+            response_data=response,
+            model_name=model_name,
+            adapter_type="MockAdapter",
+            validation_task="test task",
+        )
+
+
+def test_session_consensus_in_sql():
+    """Test SQL consensus matches verifier logic, ties and ambiguity included."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as f:
+        db_path = f.name
+
+    try:
+        logger = ValidationLogger(db_path)
+        session_id = "test_session_004"
+        logger.start_session(
+            session_id=session_id,
+            total_items=3,
+            consensus_iterations=4,
+            consensus_threshold=3,
+            validation_task="test task",
+            adapter_type="MockAdapter",
+        )
+
+        _log_history(
+            logger,
+            session_id,
+            "item_a",
+            [{"flag": True}, {"flag": True}, {"error": "x"}, {"flag": True}],
+        )
+        # Tie: first value seen wins, but falls below the threshold
+        _log_history(
+            logger,
+            session_id,
+            "item_b",
+            [{"flag": False}, {"flag": True}, {"flag": True}, {"flag": False}],
+        )
+        _log_history(logger, session_id, "item_c", [{"error": "x"}])
+
+        assert logger.get_session_consensus(session_id) == [
+            ("item_a", "flag", "True", 3, 3),
+            ("item_b", "flag", "ambiguous", 2, 4),
+        ]
+        # Re-derive under a lower threshold without reloading rows
+        assert logger.get_session_consensus(session_id, threshold=2)[1] == (
+            "item_b",
+            "flag",
+            "False",
+            2,
+            4,
+        )
+
+        field, items, agreement, decided = logger.get_agreement_rates(session_id)[0]
+        assert (field, items, decided) == ("flag", 2, 1)
+        assert agreement == (1.0 + 0.5) / 2
+
+        assert logger.get_error_rates(session_id) == [
+            ("item_a", 4, 1, 0.25),
+            ("item_b", 4, 0, 0.0),
+            ("item_c", 1, 1, 1.0),
+        ]
+        assert logger.get_model_breakdown(session_id) == [
+            ("test-model", "MockAdapter", 3, 9, 2, 2 / 9)
+        ]
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+
+def test_retention_archive_and_prune():
+    """Test old sessions are archived to a gzipped DB and removed."""
+    import gzip
+    import shutil
+    import sqlite3
+
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "retention.db")
+
+    try:
+        logger = ValidationLogger(db_path)
+        for n in range(3):
+            session_id = f"retention_{n}"
+            logger.start_session(
+                session_id=session_id,
+                total_items=1,
+                consensus_iterations=1,
+                consensus_threshold=1,
+                validation_task="test task",
+                adapter_type="MockAdapter",
+            )
+            _log_history(logger, session_id, "item", [{"flag": True}])
+            logger.store_consensus_memo(
+                f"key_{n}", "item", "fp", "test task", None, "policy", {}, session_id
+            )
+        # An expired entry of a session that is kept
+        logger.store_consensus_memo(
+            "key_old", "item", "fp", "test task", None, "policy", {}, "retention_2"
+        )
+        with logger._get_connection() as conn:
+            conn.execute(
+                "UPDATE consensus_memo SET created_at = '2000-01-01' "
+                "WHERE memo_key = 'key_old'"
+            )
+            conn.commit()
+
+        assert logger.select_sessions(keep_last=1) == ["retention_0", "retention_1"]
+        assert logger.select_sessions(older_than_days=1) == []
+
+        summary = logger.apply_retention(
+            keep_last=1, archive_dir=os.path.join(tmp_dir, "archive")
+        )
+
+        assert summary["rows_deleted"] == 2
+        assert summary["memo_deleted"] == 1
+        with logger._get_connection() as conn:
+            memo_keys = conn.execute(
+                "SELECT memo_key FROM consensus_memo ORDER BY memo_key"
+            ).fetchall()
+        assert memo_keys == [("key_2",)]
+        assert summary["archive_path"].endswith(".db.gz")
+        assert logger.get_session_responses("retention_0") == []
+        assert len(logger.get_session_responses("retention_2")) == 1
+
+        # Archive holds the pruned sessions with their responses
+        archive_db = os.path.join(tmp_dir, "restored.db")
+        with gzip.open(summary["archive_path"], "rb") as src:
+            with open(archive_db, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        conn = sqlite3.connect(archive_db)
+        sessions = conn.execute(
+            "SELECT session_id FROM validation_sessions ORDER BY session_id"
+        ).fetchall()
+        responses = conn.execute("SELECT COUNT(*) FROM validation_responses").fetchone()
+        archived_memo = conn.execute(
+            "SELECT memo_key FROM consensus_memo ORDER BY memo_key"
+        ).fetchall()
+        conn.close()
+        assert sessions == [("retention_0",), ("retention_1",)]
+        assert responses == (2,)
+        assert archived_memo == [("key_0",), ("key_1",)]
+
+        # A second prune in the same second gets its own archive
+        second = logger.apply_retention(
+            keep_last=0, archive_dir=os.path.join(tmp_dir, "archive")
+        )
+        assert second["archive_path"] != summary["archive_path"]
+        with pytest.raises(FileExistsError):
+            logger.archive_sessions(["retention_2"], summary["archive_path"][:-3])
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_compact_enables_incremental_vacuum():
+    """Test compact() switches legacy databases to incremental auto_vacuum."""
+    import sqlite3
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as f:
+        db_path = f.name
+
+    try:
+        # A database created before auto_vacuum was enabled
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE legacy (x)")
+        conn.close()
+
+        logger = ValidationLogger(db_path)
+        logger.compact()
+
+        with logger._get_connection() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert logger.compact() == 0
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+
+def test_paginated_queries():
+    """Test keyset-paginated lookups by item, model and ambiguous field."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as f:
+        db_path = f.name
+
+    try:
+        logger = ValidationLogger(db_path)
+        for n in range(3):
+            session_id = f"paged_{n}"
+            logger.start_session(
+                session_id=session_id,
+                total_items=2,
+                consensus_iterations=2,
+                consensus_threshold=2,
+                validation_task="test task",
+                adapter_type="MockAdapter",
+                model_name="model-a" if n < 2 else "model-b",
+            )
+            _log_history(logger, session_id, "Thor", [{"flag": True}, {"flag": False}])
+            _log_history(logger, session_id, "Hulk", [{"flag": True}, {"flag": True}])
+
+        rows, after = logger.get_item_responses_page("Thor", limit=4)
+        assert len(rows) == 4 and after == rows[-1][0]
+        assert len(list(logger.iter_item_responses("Thor", page_size=4))) == 6
+
+        sessions = list(logger.iter_model_sessions("model-a", page_size=1))
+        assert [row[0] for row in sessions] == ["paged_0", "paged_1"]
+        assert list(logger.iter_model_sessions("model-a", since="2999-01-01")) == []
+
+        ambiguous = list(logger.iter_ambiguous_items("flag", page_size=2))
+        assert [row[:2] for row in ambiguous] == [
+            ("paged_0", "Thor"),
+            ("paged_1", "Thor"),
+            ("paged_2", "Thor"),
+        ]
+        assert ambiguous[0][2:] == ("True", 1, 2, 2)
+        # A one-item window holds a decided item: scanning moves on to fill the page
+        rows, after = logger.get_ambiguous_items_page("flag", limit=1)
+        assert [row[:2] for row in rows] == [("paged_0", "Thor")]
+        rows, after = logger.get_ambiguous_items_page("flag", after=after, limit=1)
+        assert [row[:2] for row in rows] == [("paged_1", "Thor")]
+        assert len(list(logger.iter_ambiguous_items("flag", "paged_1"))) == 1
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+
+def test_migrates_sessions_model_name():
+    """Test older databases gain validation_sessions.model_name, backfilled."""
+    import sqlite3
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as f:
+        db_path = f.name
+
+    try:
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE validation_sessions (
+                session_id TEXT PRIMARY KEY, started_at DATETIME NOT NULL,
+                completed_at DATETIME, total_items INTEGER,
+                consensus_iterations INTEGER, consensus_threshold INTEGER,
+                validation_task TEXT, adapter_type TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE validation_responses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL,
+                timestamp DATETIME NOT NULL, item_name TEXT NOT NULL,
+                iteration_number INTEGER NOT NULL, model_name TEXT,
+                adapter_type TEXT, field_name TEXT NOT NULL, field_value TEXT,
+                is_error BOOLEAN DEFAULT 0, error_message TEXT,
+                validation_task TEXT, response_metadata TEXT
+            )
+        """)
+        conn.execute(
+            "INSERT INTO validation_sessions (session_id, started_at) VALUES ('old', '2020')"
+        )
+        conn.execute(
+            "INSERT INTO validation_responses (session_id, timestamp, item_name, "
+            "iteration_number, model_name, field_name) "
+            "VALUES ('old', '2020', 'x', 1, 'legacy-model', 'flag')"
+        )
+        conn.commit()
+        conn.close()
+
+        logger = ValidationLogger(db_path)
+
+        sessions = list(logger.iter_model_sessions("legacy-model"))
+        assert [row[0] for row in sessions] == ["old"]
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+
+def test_response_indexes():
+    """Test the responses table's index set and that legacy indexes are dropped."""
+    import sqlite3
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as f:
+        db_path = f.name
+
+    try:
+        ValidationLogger(db_path)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE INDEX idx_session_item ON validation_responses(session_id, item_name)"
+            )
+        ValidationLogger(db_path)
+
+        with sqlite3.connect(db_path) as conn:
+            indexes = conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = 'validation_responses' "
+                "ORDER BY name"
+            ).fetchall()
+            plans = [
+                conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()[0][3]
+                for query, params in [
+                    (
+                        "SELECT item_name, field_name, field_value, COUNT(*) "
+                        "FROM validation_responses WHERE session_id = ? AND is_error = 0 "
+                        "GROUP BY item_name, field_name, field_value",
+                        ("s1",),
+                    ),
+                    (
+                        "SELECT DISTINCT session_id, item_name FROM validation_responses "
+                        "WHERE field_name = ? AND is_error = 0 "
+                        "ORDER BY session_id, item_name LIMIT 10",
+                        ("flag",),
+                    ),
+                ]
+            ]
+        assert indexes == [
+            ("idx_field_items",),
+            ("idx_item_name",),
+            ("idx_response_time",),
+            ("idx_response_votes",),
+        ]
+        assert "COVERING INDEX idx_response_votes" in plans[0]
+        assert "COVERING INDEX idx_field_items" in plans[1]
+    finally:
+        if os.path.exists(db_path):
+            os.remove(db_path)
@@ -0,0 +1,99 @@
+"""
+Tests for run deadlines and call budgets
+"""
+
+from types import SimpleNamespace
+import config
+from models import HeroCapabilities
+from core.db_logger import ValidationLogger
+from core.deadline import CALL_BUDGET, DEADLINE, RunBudget
+from examples.validation_helpers import run_validation
+from model_adapters.mock_adapter import MockAdapter
+
+ITEMS = ["Superman", "Batman", "Wonder Woman"]
+
+
+def make_domain(tmp_path):
+    return SimpleNamespace(
+        VALIDATION_TASK="deadline test",
+        ITEMS_TO_VALIDATE=ITEMS,
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "deadline.db"),
+    )
+
+
+def test_iterations_shrink_before_deadline():
+    """Test items get fewer iterations as the deadline nears, then dispatching stops."""
+    now = [0.0]
+    budget = RunBudget(deadline_seconds=10, min_iterations=2, clock=lambda: now[0])
+
+    assert budget.plan(5) == 5  # no estimate yet
+    now[0] = 5.0
+    budget.record(5, 5.0, 5)  # 1s per iteration
+    assert budget.plan(5) == 4  # 5s left / 1.2s
+    now[0] = 8.0
+    assert budget.plan(5) == 0
+    assert budget.stop_reason == DEADLINE
+    now[0] = 0.0
+    assert budget.plan(5) == 0  # stopped for good
+
+
+def test_call_budget_reduces_then_stops():
+    """Test the call budget trims the last item and reports why it stopped."""
+    budget = RunBudget(max_calls=7, min_iterations=2)
+
+    assert budget.plan(3) == 3
+    budget.record(3, 0.1, 3)
+    assert budget.plan(3) == 3
+    budget.record(3, 0.1, 3)
+    assert budget.plan(3, stop=False) == 0
+    assert budget.stop_reason is None
+    assert budget.plan(3) == 0
+    assert budget.stop_reason == CALL_BUDGET
+
+
+def test_partial_session_recorded(tmp_path, monkeypatch):
+    """Test a run cut short by max_calls marks the session partial and lists skips."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+
+    session_info = run_validation(
+        make_domain(tmp_path),
+        iterations=3,
+        adapter=MockAdapter(),
+        engine="fast",
+        max_calls=7,
+    )
+
+    assert session_info["api_calls"] == 6
+    assert session_info["partial"] is True
+    assert session_info["stop_reason"] == CALL_BUDGET
+    assert session_info["skipped_items"] == ["Wonder Woman"]
+    assert [r["item"] for r in session_info["results"]] == ["Superman", "Batman"]
+
+    logger = ValidationLogger(session_info["db_path"])
+    session = logger.get_session(session_info["session_id"])
+    assert (session["partial"], session["stop_reason"]) == (1, CALL_BUDGET)
+    assert logger.get_skipped_items(session_info["session_id"]) == [
+        (2, "Wonder Woman", CALL_BUDGET)
+    ]
+
+
+def test_reduced_iterations(tmp_path, monkeypatch):
+    """Test the last item runs with fewer iterations instead of being skipped."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+
+    session_info = run_validation(
+        make_domain(tmp_path),
+        iterations=3,
+        adapter=MockAdapter(),
+        engine="fast",
+        max_calls=8,
+    )
+
+    assert session_info["partial"] is False
+    assert session_info["api_calls"] == 8
+    last = session_info["results"][2]
+    assert last["iterations"] == 2
+    assert len(last["history"]) == 2
+    assert last["consensus"]["gender"] == "female"
+    assert "iterations" not in session_info["results"][0]
@@ -0,0 +1,58 @@
+"""
+Tests for item deduplication
+"""
+
+from types import SimpleNamespace
+import config
+from models import HeroCapabilities
+from core.db_logger import ValidationLogger
+from core.dedup import alias_rows, group_duplicates, normalize_item
+from examples.validation_helpers import run_validation
+
+
+def test_normalize_item():
+    """Test case, whitespace and punctuation are ignored."""
+    assert normalize_item("  Great product,  totally worth it! ") == (
+        "great product totally worth it"
+    )
+    assert normalize_item("GREAT product totally worth it") == normalize_item(
+        "great product, totally worth it."
+    )
+
+
+def test_group_duplicates_and_aliases():
+    """Test groups keep first-seen order and aliases map to the first item."""
+    groups = group_duplicates(["Thor", "thor!", "Hulk", "Thor"])
+
+    assert list(groups.values()) == [["Thor", "thor!", "Thor"], ["Hulk"]]
+    assert alias_rows(groups) == [
+        ("Thor", "Thor", "thor", 2),
+        ("thor!", "Thor", "thor", 1),
+    ]
+
+
+def test_run_validation_dedup(tmp_path, monkeypatch):
+    """Test duplicates are validated once and results fanned out."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "DEFAULT_ADAPTER_TYPE", "mock")
+    domain_config = SimpleNamespace(
+        VALIDATION_TASK="dedup test",
+        ITEMS_TO_VALIDATE=["Superman", "superman.", "Batman", "SUPERMAN"],
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "dedup.db"),
+    )
+
+    session_info = run_validation(domain_config, iterations=1, dedup=True)
+
+    assert session_info["unique_items"] == 2
+    results = session_info["results"]
+    assert [r["item"] for r in results] == domain_config.ITEMS_TO_VALIDATE
+    assert results[1]["canonical_item"] == "Superman"
+    assert results[1]["consensus"] == results[0]["consensus"]
+
+    logger = ValidationLogger(session_info["db_path"])
+    responses = logger.get_session_responses(session_info["session_id"])
+    assert {row[3] for row in responses} == {"Superman", "Batman"}
+    assert ("superman.", "Superman", "superman", 1) in logger.get_item_aliases(
+        session_info["session_id"]
+    )
@@ -0,0 +1,114 @@
+"""
+Tests for streaming session export
+"""
+
+import os
+import csv
+import json
+import pytest
+from core.db_logger import ValidationLogger
+from core import exporter
+from core.exporter import export_session
+
+
+@pytest.fixture
+def logged_session(tmp_path):
+    """A database with one session: two items, one failed call."""
+    tmp_dir = str(tmp_path)
+    logger = ValidationLogger(os.path.join(tmp_dir, "export.db"))
+    session_id = "export_session_001"
+    logger.start_session(
+        session_id=session_id,
+        total_items=2,
+        consensus_iterations=2,
+        consensus_threshold=1,
+        validation_task="test task",
+        adapter_type="MockAdapter",
+    )
+    responses = {
+        "Batman": [{"can_fly": False, "gender": "male"}, {"error": "timeout"}],
+        "Superman": [
+            {"can_fly": True, "gender": "male"},
+            {"can_fly": True, "gender": "male"},
+        ],
+    }
+    for item_name, history in responses.items():
+        for i, response in enumerate(history, 1):
+            logger.log_response(
+                session_id=session_id,
+                item_name=item_name,
+                iteration_number=i,
+                response_data=response,
+                model_name="mock-model",
+                adapter_type="MockAdapter",
+                validation_task="test task",
+            )
+    return logger, session_id, tmp_dir
+
+
+def test_export_jsonl_pivots_records(logged_session):
+    """Test JSONL export writes one record per item/iteration."""
+    logger, session_id, tmp_dir = logged_session
+    output = os.path.join(tmp_dir, "out.jsonl")
+
+    # Tiny chunks so records straddle fetchmany boundaries
+    count = export_session(logger, session_id, output, chunk_size=1)
+
+    with open(output) as f:
+        records = [json.loads(line) for line in f]
+    assert count == len(records) == 4
+    assert records[0]["item_name"] == "Batman"
+    assert records[0]["can_fly"] == "False"
+    assert records[1]["is_error"] is True
+    assert records[1]["error_message"] == "timeout"
+    assert [r["iteration_number"] for r in records[2:]] == [1, 2]
+
+
+def test_export_csv_columns(logged_session):
+    """Test CSV export has base columns followed by schema fields."""
+    logger, session_id, tmp_dir = logged_session
+    output = os.path.join(tmp_dir, "out.csv")
+
+    export_session(logger, session_id, output)
+
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0].keys())[-2:] == ["can_fly", "gender"]
+    assert rows[3]["gender"] == "male"
+
+
+def test_export_parquet(logged_session):
+    """Test Parquet export when pyarrow is available."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    logger, session_id, tmp_dir = logged_session
+    output = os.path.join(tmp_dir, "out.parquet")
+
+    export_session(logger, session_id, output, chunk_size=2)
+
+    table = pq.read_table(output)
+    assert table.num_rows == 4
+    assert table.column("is_error").to_pylist() == [False, True, False, False]
+
+
+def test_export_unknown_format(logged_session):
+    """Test unknown formats are rejected."""
+    logger, session_id, tmp_dir = logged_session
+    with pytest.raises(ValueError):
+        export_session(logger, session_id, os.path.join(tmp_dir, "out.xml"))
+
+
+def test_export_closes_file_on_error(logged_session, monkeypatch):
+    """Test the output file is closed when writing a chunk fails."""
+    logger, session_id, tmp_dir = logged_session
+    writers = []
+
+    class FailingWriter(exporter.JsonlWriter):
+        def write_chunk(self, records):
+            writers.append(self)
+            raise OSError("disk full")
+
+    monkeypatch.setitem(exporter.WRITERS, "jsonl", FailingWriter)
+    with pytest.raises(OSError, match="disk full"):
+        export_session(logger, session_id, os.path.join(tmp_dir, "out.jsonl"))
+
+    assert writers[0].file.closed
@@ -0,0 +1,100 @@
+"""
+Tests for the fast validation engine
+"""
+
+import pytest
+from pydantic import BaseModel, Field
+from models import HeroCapabilities
+from core.fast_path import extract_json, fast_validate, is_flat_schema
+from core.verifier import ConsensusVerifier, HeroVerifier
+from model_adapters.mock_adapter import MockAdapter
+
+
+class Nested(BaseModel):
+    hero: HeroCapabilities
+
+
+class Validated(BaseModel):
+    name: str = Field(json_schema_extra={"validators": [("two-words", "fix")]})
+
+
+class FixedAdapter(MockAdapter):
+    """MockAdapter answering every call with the same raw text."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+    def _answer(self, text):
+        return self.response
+
+
+def test_is_flat_schema():
+    """Test scalar and Literal fields are flat, nested models are not."""
+    assert is_flat_schema(HeroCapabilities)
+    assert not is_flat_schema(Nested)
+
+
+def test_guardrails_validators_need_the_guard():
+    """Test scalar fields with Guardrails validators aren't treated as flat."""
+    assert not is_flat_schema(Validated)
+    verifier = HeroVerifier(MockAdapter(), Validated, engine="fast")
+    assert not verifier._use_fast_path()
+
+
+def test_fast_validate_extracts_json():
+    """Test code fences and surrounding text are ignored."""
+    text = 'Sure:\n```json\n{"can_fly": true, "has_super_strength": false, "gender": "female"}\n```'
+
+    assert fast_validate(HeroCapabilities, text) == {
+        "can_fly": True,
+        "has_super_strength": False,
+        "gender": "female",
+    }
+    with pytest.raises(ValueError):
+        extract_json("no json here")
+    with pytest.raises(ValueError):
+        fast_validate(HeroCapabilities, '{"can_fly": true, "gender": "robot"}')
+
+
+def test_fast_engine_skips_guard():
+    """Test valid output is validated without going through the Guard."""
+    verifier = HeroVerifier(MockAdapter(), HeroCapabilities, engine="fast")
+    verifier._call_guard = None
+    verifier._parse_output = None
+
+    assert verifier.verify("Superman") == {
+        "can_fly": True,
+        "has_super_strength": True,
+        "gender": "male",
+    }
+
+
+def test_fast_engine_falls_back_to_guard(monkeypatch):
+    """Test off-schema output is handed to the Guard without a new LLM call."""
+    adapter = FixedAdapter('{"can_fly": "maybe"}')
+    verifier = ConsensusVerifier(adapter, HeroCapabilities, iterations=1, engine="fast")
+    parsed = []
+
+    def fake_parse(llm_output, schema=None):
+        parsed.append(llm_output)
+        return {"error": "guard rejected"}
+
+    monkeypatch.setattr(verifier, "_parse_output", fake_parse)
+    result = verifier.verify("Superman")
+
+    assert parsed == ['{"can_fly": "maybe"}']
+    assert adapter.requests == 1
+    assert result["history"] == [{"error": "guard rejected"}]
+
+
+def test_fast_engine_matches_guard():
+    """Test both engines reach the same consensus for valid output."""
+    results = [
+        ConsensusVerifier(
+            MockAdapter(), HeroCapabilities, iterations=2, engine=engine
+        ).verify("Batman")
+        for engine in ("guard", "fast")
+    ]
+
+    assert results[0] == results[1]
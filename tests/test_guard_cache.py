@@ -0,0 +1,129 @@
+"""
+Tests for the shared Guard cache
+"""
+
+import gc
+import threading
+import weakref
+from pydantic import BaseModel, Field, create_model, field_validator
+from models import HeroCapabilities
+from model_adapters.mock_adapter import MockAdapter
+from core.guard_cache import GuardCache, guard_cache, warm_guard_cache
+from core.compact_format import get_codec
+from core.fast_path import is_flat_schema
+from core.schema_utils import schema_fingerprint, sub_schema
+from core.verifier import ConsensusVerifier
+
+
+class SimpleSchema(BaseModel):
+    flag: bool = Field(description="A flag")
+
+
+class OtherSchema(BaseModel):
+    label: str = Field(description="A label")
+
+
+def _must_be_set(cls, value):
+    assert value, "flag must be set"
+    return value
+
+
+# Same name and JSON schema as SimpleSchema, plus a validator
+StrictSchema = create_model(
+    "SimpleSchema",
+    flag=(bool, Field(description="A flag")),
+    __validators__={"must_be_set": field_validator("flag")(_must_be_set)},
+)
+
+
+def test_verifiers_share_guard():
+    """Test verifiers built for the same schema reuse one Guard."""
+    adapter = MockAdapter()
+    first = ConsensusVerifier(adapter=adapter, schema=HeroCapabilities)
+    second = ConsensusVerifier(adapter=adapter, schema=HeroCapabilities)
+
+    assert first.guard is second.guard
+    assert HeroCapabilities in guard_cache
+
+
+def test_schema_fingerprint_is_structural():
+    """Test identical schemas share a fingerprint and changed ones do not."""
+    same = create_model("SimpleSchema", flag=(bool, Field(description="A flag")))
+    changed = create_model(
+        "SimpleSchema", flag=(bool, Field(description="A different flag"))
+    )
+
+    assert schema_fingerprint(same) == schema_fingerprint(SimpleSchema)
+    assert schema_fingerprint(changed) != schema_fingerprint(SimpleSchema)
+
+    # The fingerprint cache doesn't keep dynamically created schemas alive
+    ref = weakref.ref(same)
+    del same
+    gc.collect()
+    assert ref() is None
+
+
+def test_schema_caches_are_weak():
+    """Test the flat-schema, codec and sub-schema caches don't pin schemas."""
+    schema = create_model(
+        "Dynamic",
+        flag=(bool, Field(description="A flag")),
+        label=(str, Field(description="A label")),
+    )
+    assert is_flat_schema(schema)
+    assert get_codec(schema) is get_codec(schema)
+    assert sub_schema(schema, ["flag"]) is sub_schema(schema, ["flag"])
+
+    ref = weakref.ref(schema)
+    del schema
+    gc.collect()
+    assert ref() is None
+
+
+def test_same_json_schema_gets_own_guard():
+    """Test classes with equal JSON schemas but different validators don't share a Guard."""
+    cache = GuardCache()
+
+    assert schema_fingerprint(StrictSchema) == schema_fingerprint(SimpleSchema)
+    assert cache.get(StrictSchema) is not cache.get(SimpleSchema)
+    assert cache.get(StrictSchema) is cache.get(StrictSchema)
+
+
+def test_cache_is_bounded():
+    """Test least recently used Guards are evicted past maxsize."""
+    cache = GuardCache(maxsize=1)
+    cache.get(SimpleSchema)
+    cache.get(OtherSchema)
+
+    assert len(cache) == 1
+    assert OtherSchema in cache
+    assert SimpleSchema not in cache
+
+
+def test_cache_is_thread_safe():
+    """Test concurrent lookups compile the Guard only once."""
+    cache = GuardCache()
+    guards = []
+
+    threads = [
+        threading.Thread(target=lambda: guards.append(cache.get(SimpleSchema)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.misses == 1
+    assert all(guard is guards[0] for guard in guards)
+
+
+def test_warm_guard_cache_from_registry():
+    """Test pre-warming from registered domain module paths."""
+    import config
+
+    warm_guard_cache(config.DOMAIN_REGISTRY.values())
+
+    from examples.domains import product_review_config
+
+    assert product_review_config.VALIDATION_SCHEMA in guard_cache
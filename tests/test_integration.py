@@ -76,3 +76,59 @@ def test_full_validation_workflow():
 
         if os.path.exists(db_path):
             os.remove(db_path)
+
+
+def test_multi_sample_uses_one_request():
+    """Test multi-sample mode validates n choices from a single request."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as f:
+        db_path = f.name
+
+    try:
+        logger = ValidationLogger(db_path)
+        adapter = MockAdapter(variation=0.5, seed=7)
+        verifier = ConsensusVerifier(
+            adapter=adapter,
+            schema=HeroCapabilities,
+            validation_task="test superheroes",
+            iterations=5,
+            logger=logger,
+            session_id="multi_sample_001",
+            model_name="mock-model",
+            multi_sample=True,
+        )
+
+        result = verifier.verify("Superman")
+
+        assert adapter.requests == 1
+        assert verifier.api_calls == 1
+        assert len(result["history"]) == 5
+        assert all("error" not in entry for entry in result["history"])
+        iterations = {
+            row[4] for row in logger.get_session_responses("multi_sample_001")
+        }
+        assert iterations == {1, 2, 3, 4, 5}
+    finally:
+        import os
+
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+
+def test_multi_sample_falls_back_without_n_support():
+    """Test adapters without `n` support get one request per iteration."""
+
+    class SingleChoiceAdapter(MockAdapter):
+        supports_n = False
+
+    adapter = SingleChoiceAdapter()
+    verifier = ConsensusVerifier(
+        adapter=adapter,
+        schema=HeroCapabilities,
+        iterations=3,
+        multi_sample=True,
+    )
+
+    verifier.verify("Batman")
+
+    assert verifier.multi_sample is False
+    assert verifier.api_calls == 3
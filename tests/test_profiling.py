@@ -0,0 +1,109 @@
+"""
+Tests for run profiling
+"""
+
+import os
+import time
+from types import SimpleNamespace
+import config
+from models import HeroCapabilities
+from core.profiling import RunProfiler
+from examples.validation_helpers import run_validation
+from model_adapters.mock_adapter import MockAdapter
+
+
+def test_nested_phases_count_self_time(tmp_path):
+    """Test time spent in a nested phase is not counted twice."""
+    profiler = RunProfiler()
+    inner = profiler.timed("prompt_generation", lambda: time.sleep(0.02))
+
+    def call():
+        inner()
+        time.sleep(0.01)
+
+    profiler.start()
+    profiler.timed("guard_call", call)()
+    summary = profiler.stop("nested", output_dir=str(tmp_path))
+
+    phases = summary["phases"]
+    assert phases["prompt_generation"]["seconds"] >= 0.02
+    assert 0.01 <= phases["guard_call"]["seconds"] < 0.02
+    assert os.path.exists(summary["artifacts"]["cprofile"])
+
+
+def test_profiled_run(tmp_path, monkeypatch):
+    """Test run_validation writes profile artifacts and restores instrumented methods."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    domain_config = SimpleNamespace(
+        VALIDATION_TASK="profile test",
+        ITEMS_TO_VALIDATE=["Superman", "Batman"],
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "profile.db"),
+    )
+    adapter = MockAdapter()
+    displayed = []
+
+    session_info = run_validation(
+        domain_config,
+        iterations=3,
+        adapter=adapter,
+        engine="fast",
+        custom_display=lambda item, result_data, field_names: displayed.append(item),
+        profile=True,
+    )
+
+    summary = session_info["profile"]
+    phases = summary["phases"]
+    assert phases["consensus"]["calls"] == 2
+    assert phases["display"]["calls"] == 2
+    # responses + start, skipped items and complete
+    assert phases["db_logging"]["calls"] == 2 * 3 + 3
+    assert phases["prompt_generation"]["calls"] == 6
+    assert summary["memory"]["peak_bytes"] > 0
+    assert any(
+        "core/verifier.py" in row["function"] for row in summary["top_functions"]
+    )
+    assert os.path.exists(tmp_path / f"{session_info['session_id']}.profile.json")
+    assert displayed == ["Superman", "Batman"]
+    assert "complete" not in vars(adapter)
+
+
+def test_memo_lookups_count_as_db_logging(tmp_path, monkeypatch):
+    """Test consensus memo reads and writes are timed as db_logging."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    domain_config = SimpleNamespace(
+        VALIDATION_TASK="profile memo test",
+        ITEMS_TO_VALIDATE=["Superman"],
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "profile.db"),
+    )
+
+    session_info = run_validation(
+        domain_config,
+        iterations=3,
+        adapter=MockAdapter(),
+        engine="fast",
+        memo=True,
+        profile=True,
+    )
+
+    # responses + start, skipped items and complete + memo lookup/store
+    assert session_info["profile"]["phases"]["db_logging"]["calls"] == 3 + 3 + 2
+
+
+def test_profiling_off_by_default(tmp_path, monkeypatch):
+    """Test runs are not profiled unless asked to."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    domain_config = SimpleNamespace(
+        VALIDATION_TASK="profile test",
+        ITEMS_TO_VALIDATE=["Superman"],
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "profile.db"),
+    )
+
+    session_info = run_validation(
+        domain_config, iterations=1, adapter=MockAdapter(), engine="fast"
+    )
+
+    assert "profile" not in session_info
+    assert not list(tmp_path.glob("*.profile.*"))
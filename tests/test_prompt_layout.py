@@ -0,0 +1,74 @@
+"""
+Tests for the prefix-cache friendly prompt layout
+"""
+
+import json
+from types import SimpleNamespace
+from models import HeroCapabilities
+from core.db_logger import ValidationLogger
+from core.verifier import ConsensusVerifier
+from llm_adapters import cached_prompt_tokens
+from model_adapters.mock_adapter import MockAdapter
+
+
+def test_prefix_layout_messages():
+    """Test the system prefix is identical across items and the item comes last."""
+    verifier = ConsensusVerifier(
+        MockAdapter(),
+        HeroCapabilities,
+        "superhero capabilities",
+        prompt_layout="prefix",
+    )
+
+    first = verifier._build_messages("Superman")
+    second = verifier._build_messages("Batman")
+
+    assert [m["role"] for m in first] == ["system", "user"]
+    assert first[0]["content"] == second[0]["content"]
+    assert "Superman" not in first[0]["content"]
+    assert "has_super_strength" in first[0]["content"]
+    assert first[1]["content"] == 'Analyze the following item: "Superman"'
+
+
+def test_inline_layout_unchanged():
+    """Test the default layout is still a single user message."""
+    verifier = ConsensusVerifier(MockAdapter(), HeroCapabilities)
+
+    messages = verifier._build_messages("Superman")
+
+    assert len(messages) == 1
+    assert messages[0]["role"] == "user"
+    assert '"Superman"' in messages[0]["content"]
+
+
+def test_cached_prompt_tokens():
+    """Test OpenAI- and Anthropic-style usage reporting."""
+    openai_usage = SimpleNamespace(
+        prompt_tokens=100, prompt_tokens_details=SimpleNamespace(cached_tokens=64)
+    )
+    assert cached_prompt_tokens(openai_usage) == 64
+    assert cached_prompt_tokens({"cache_read_input_tokens": 32}) == 32
+    assert cached_prompt_tokens({"prompt_tokens": 10}) is None
+    assert cached_prompt_tokens(None) is None
+
+
+def test_cache_hits_logged(tmp_path):
+    """Test cache-hit tokens reported by the adapter end up in response metadata."""
+    logger = ValidationLogger(str(tmp_path / "layout.db"))
+    logger.start_session("s1", 1, 2, 2, "layout test", "MockAdapter")
+    verifier = ConsensusVerifier(
+        MockAdapter(),
+        HeroCapabilities,
+        iterations=2,
+        logger=logger,
+        session_id="s1",
+        engine="fast",
+        prompt_layout="prefix",
+    )
+
+    verifier.verify("Superman")
+
+    rows = logger.get_session_responses("s1")
+    cached = {row[4]: json.loads(row[12])["cached_tokens"] for row in rows}
+    assert cached[1] == 0
+    assert cached[2] > 0
@@ -0,0 +1,125 @@
+"""
+Tests for the reask policy and provider call accounting
+"""
+
+import json
+import sqlite3
+from types import SimpleNamespace
+import config
+from models import HeroCapabilities
+from core.db_logger import ValidationLogger
+from core.verifier import ConsensusVerifier
+from examples.validation_helpers import run_validation
+from model_adapters.mock_adapter import MockAdapter
+
+GOOD = '{"can_fly": true, "has_super_strength": true, "gender": "male"}'
+BAD = '{"can_fly": true, "gender": "robot"}'
+
+
+class ScriptedAdapter(MockAdapter):
+    """MockAdapter answering guarded calls from a script and recording their messages."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.messages = []
+
+    def __call__(self, prompt=None, messages=None, **kwargs):
+        self.messages.append(messages)
+        return super().__call__(prompt, messages, **kwargs)
+
+    def _answer(self, text):
+        return self.responses.pop(0)
+
+
+def response_metadata(db_path, session_id):
+    """Response metadata by iteration number (one row per field, so deduplicated)."""
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT iteration_number, response_metadata FROM validation_responses "
+            "WHERE session_id = ?",
+            (session_id,),
+        ).fetchall()
+    return {
+        iteration: json.loads(metadata) if metadata else None
+        for iteration, metadata in rows
+    }
+
+
+def test_reasks_are_counted(tmp_path):
+    """Test reask calls count in api_calls and in the logged response metadata."""
+    db_path = str(tmp_path / "reasks.db")
+    logger = ValidationLogger(db_path)
+    adapter = ScriptedAdapter([BAD, GOOD, GOOD])
+    verifier = ConsensusVerifier(
+        adapter,
+        HeroCapabilities,
+        iterations=2,
+        threshold=2,
+        logger=logger,
+        session_id="s1",
+        num_reasks=1,
+    )
+
+    result = verifier.verify("Superman")
+
+    assert result["consensus"]["gender"] == "male"
+    assert verifier.api_calls == 3
+    assert verifier.reask_calls == 1
+    assert len(adapter.messages) == 3
+    # The reask sends Guardrails' correction prompt, not the original one
+    assert adapter.messages[1] != adapter.messages[0]
+    assert response_metadata(db_path, "s1") == {1: {"provider_calls": 2}, 2: None}
+
+
+def test_resample_mode_repeats_the_original_prompt():
+    """Test resample mode replaces the reask with a fresh sample of the same prompt."""
+    adapter = ScriptedAdapter([BAD, GOOD])
+    verifier = ConsensusVerifier(
+        adapter,
+        HeroCapabilities,
+        iterations=1,
+        num_reasks=2,
+        reask_mode="resample",
+    )
+
+    result = verifier.verify("Superman")
+
+    assert result["consensus"]["can_fly"] is True
+    assert adapter.messages == [adapter.messages[0]] * 2
+    assert (verifier.api_calls, verifier.reask_calls) == (2, 1)
+
+    # Without reasks a failed answer stays a single call
+    adapter = ScriptedAdapter([BAD])
+    verifier = ConsensusVerifier(adapter, HeroCapabilities, iterations=1, num_reasks=0)
+    verifier.verify("Superman")
+    assert (verifier.api_calls, verifier.reask_calls) == (1, 0)
+
+
+def test_domain_reask_policy(tmp_path, monkeypatch):
+    """Test the domain's reask settings apply and session totals include reasks."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    domain_config = SimpleNamespace(
+        VALIDATION_TASK="reask policy test",
+        ITEMS_TO_VALIDATE=["Superman"],
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "policy.db"),
+        REASK_MODE="resample",
+    )
+    assert config.get_reask_policy(domain_config) == {
+        "num_reasks": config.NUM_REASKS,
+        "full_schema_reask": config.FULL_SCHEMA_REASK,
+        "reask_mode": "resample",
+    }
+
+    session_info = run_validation(
+        domain_config,
+        iterations=2,
+        adapter=ScriptedAdapter([BAD, GOOD, GOOD]),
+    )
+
+    assert (session_info["api_calls"], session_info["reask_calls"]) == (3, 1)
+    session = ValidationLogger(session_info["db_path"]).get_session(
+        session_info["session_id"]
+    )
+    assert session["api_calls"] == 3
@@ -0,0 +1,146 @@
+"""
+Tests for replaying logged sessions
+"""
+
+import json
+import threading
+from types import SimpleNamespace
+import pytest
+import config
+from models import HeroCapabilities
+from core.db_logger import ValidationLogger
+from examples.validation_helpers import run_validation
+from model_adapters.mock_adapter import MockAdapter
+from model_adapters.replay_adapter import ReplayAdapter, ReplayError
+
+
+@pytest.fixture
+def domain_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    return SimpleNamespace(
+        VALIDATION_TASK="replay test",
+        ITEMS_TO_VALIDATE=["Superman", "Batman", "Thor"],
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "replay.db"),
+    )
+
+
+def test_replay_reproduces_session(domain_config):
+    """Test a replayed run logs the same responses and consensus as the original."""
+    original = run_validation(
+        domain_config, iterations=3, adapter=MockAdapter(variation=0.5, seed=7)
+    )
+    adapter = ReplayAdapter(original["session_id"], original["db_path"])
+
+    replayed = run_validation(domain_config, iterations=3, adapter=adapter)
+
+    assert adapter.requests == 9
+    assert replayed["model_name"] == "replay:unknown"
+    for before, after in zip(original["results"], replayed["results"]):
+        assert after["history"] == before["history"]
+        assert after["consensus"] == before["consensus"]
+
+
+def test_replay_errors_and_missing_calls(domain_config):
+    """Test recorded errors are raised again and unrecorded calls fail."""
+    logger = ValidationLogger(domain_config.DATABASE_PATH)
+    logger.start_session("s1", 1, 2, 2, "replay test", "MockAdapter")
+    logger.log_response("s1", "Thor", 1, {"error": "rate limited"})
+    logger.log_response("s1", "Thor", 2, {"can_fly": True, "gender": "male"})
+    adapter = ReplayAdapter("s1", domain_config.DATABASE_PATH)
+    messages = [{"role": "user", "content": 'Analyze the following item: "Thor"'}]
+
+    with pytest.raises(ReplayError, match="rate limited"):
+        adapter(messages=messages)
+    assert adapter(messages=messages) == '{"can_fly": true, "gender": "male"}'
+    with pytest.raises(ReplayError, match="iteration 3"):
+        adapter(messages=messages)
+
+
+def test_replay_decodes_by_schema(domain_config):
+    """Test numeric-looking values of str fields replay as strings."""
+    from pydantic import BaseModel
+
+    class Record(BaseModel):
+        code: str
+        sci: str
+        note: str
+        count: int
+        flag: bool
+
+    logger = ValidationLogger(domain_config.DATABASE_PATH)
+    logger.start_session("s1", 1, 1, 1, "replay test", "MockAdapter")
+    logger.log_response(
+        "s1",
+        "Thor",
+        1,
+        {"code": "5", "sci": "1e3", "note": "True", "count": 7, "flag": True},
+    )
+    messages = [{"role": "user", "content": 'Analyze the following item: "Thor"'}]
+
+    typed = ReplayAdapter("s1", domain_config.DATABASE_PATH, schema=Record)
+    guessed = ReplayAdapter("s1", domain_config.DATABASE_PATH)
+
+    assert json.loads(typed(messages=messages)) == {
+        "code": "5",
+        "sci": "1e3",
+        "note": "True",
+        "count": 7,
+        "flag": True,
+    }
+    assert json.loads(guessed(messages=messages))["code"] == 5
+
+
+def test_concurrent_calls_get_distinct_iterations(domain_config):
+    """Test concurrent samples of one item are each served their own iteration."""
+    logger = ValidationLogger(domain_config.DATABASE_PATH)
+    logger.start_session("s1", 1, 40, 40, "replay test", "MockAdapter")
+    for iteration in range(1, 41):
+        logger.log_response("s1", "Thor", iteration, {"n": iteration})
+    adapter = ReplayAdapter("s1", domain_config.DATABASE_PATH)
+    messages = [{"role": "user", "content": 'Analyze the following item: "Thor"'}]
+    served = []
+
+    def sample():
+        for _ in range(5):
+            served.append(json.loads(adapter(messages=messages))["n"])
+
+    threads = [threading.Thread(target=sample) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(served) == list(range(1, 41))
+    assert adapter.requests == 40
+
+
+def test_replay_latency(domain_config, monkeypatch):
+    """Test recorded latencies are slept when simulation is on."""
+    original = run_validation(domain_config, iterations=1, adapter=MockAdapter())
+    adapter = ReplayAdapter(
+        original["session_id"],
+        original["db_path"],
+        simulate_latency=True,
+        latency_scale=0.5,
+    )
+    slept = []
+    monkeypatch.setattr(
+        "model_adapters.replay_adapter.time.sleep",
+        lambda seconds: slept.append(seconds),
+    )
+
+    adapter.complete(
+        [{"role": "user", "content": 'Analyze the following item: "Batman"'}]
+    )
+
+    assert slept == [adapter.latencies[("Batman", 1)] * 0.5]
+    assert all(latency >= 0 for latency in adapter.latencies.values())
+
+
+def test_replay_unknown_session(domain_config):
+    """Test replaying a session that doesn't exist fails at construction."""
+    ValidationLogger(domain_config.DATABASE_PATH)
+
+    with pytest.raises(RuntimeError, match="not found"):
+        ReplayAdapter("missing", domain_config.DATABASE_PATH)
@@ -0,0 +1,94 @@
+"""
+Tests for re-querying ambiguous fields
+"""
+
+import json
+from models import HeroCapabilities
+from core.db_logger import ValidationLogger
+from core.schema_utils import sub_schema
+from core.verifier import ConsensusVerifier
+from model_adapters.mock_adapter import MockAdapter
+
+
+class ScriptedVerifier(ConsensusVerifier):
+    """Verifier answering from a script and recording the schema of each call."""
+
+    def __init__(self, can_fly_answers, **kwargs):
+        super().__init__(adapter=MockAdapter(), schema=HeroCapabilities, **kwargs)
+        self.can_fly_answers = list(can_fly_answers)
+        self.schemas = []
+
+    def _call_guard(self, item_name, schema=None):
+        schema = schema or self.schema
+        self.schemas.append(schema)
+        full = {
+            "can_fly": self.can_fly_answers.pop(0),
+            "has_super_strength": True,
+            "gender": "male",
+        }
+        return {key: full[key] for key in schema.model_fields}
+
+
+def test_sub_schema_keeps_fields_and_is_cached():
+    """Test the reduced schema keeps field order, types and descriptions."""
+    reduced = sub_schema(HeroCapabilities, ["gender", "can_fly"])
+
+    assert list(reduced.model_fields) == ["can_fly", "gender"]
+    assert (
+        reduced.model_fields["can_fly"].description
+        == HeroCapabilities.model_fields["can_fly"].description
+    )
+    assert sub_schema(HeroCapabilities, ["can_fly", "gender"]) is reduced
+
+
+def test_requery_only_ambiguous_fields():
+    """Test only ambiguous fields are re-asked and decided ones are kept."""
+    verifier = ScriptedVerifier(
+        [True, False, True, False, True, True, True, True],
+        iterations=4,
+        threshold=0.6,
+    )
+    result = verifier.verify("Thor")
+    assert result["consensus"]["can_fly"] == "ambiguous"
+    assert result["consensus"]["has_super_strength"] is True
+
+    requeried = verifier.requery_ambiguous("Thor", result)
+
+    assert requeried["requeried_fields"] == ["can_fly"]
+    assert list(verifier.schemas[-1].model_fields) == ["can_fly"]
+    assert len(requeried["history"]) == 8
+    assert requeried["history"][-1] == {"can_fly": True}
+    # 6 of 8 votes against a threshold of ceil(8 * 0.6) = 5
+    assert requeried["consensus"]["can_fly"] is True
+    assert requeried["consensus"]["has_super_strength"] is True
+    assert verifier.api_calls == 8
+
+
+def test_requery_skips_decided_items():
+    """Test items without ambiguous fields make no extra calls."""
+    verifier = ScriptedVerifier([True, True, True], iterations=3)
+    result = verifier.verify("Superman")
+
+    assert verifier.requery_ambiguous("Superman", result) is result
+    assert verifier.api_calls == 3
+
+
+def test_requery_logs_metadata(tmp_path):
+    """Test follow-up responses are logged after the original iterations."""
+    logger = ValidationLogger(str(tmp_path / "requery.db"))
+    logger.start_session("s1", 1, 2, 2, "requery test", "MockAdapter")
+    verifier = ScriptedVerifier(
+        [True, False, True, True],
+        iterations=2,
+        threshold=2,
+        logger=logger,
+        session_id="s1",
+    )
+
+    verifier.requery_ambiguous("Thor", verifier.verify("Thor"))
+
+    rows = logger.get_session_responses("s1")
+    can_fly_rows = [row for row in rows if row[7] == "can_fly"]
+    assert [row[4] for row in can_fly_rows] == [1, 2, 3, 4]
+    assert {row[7] for row in rows if row[4] > 2} == {"can_fly"}
+    assert json.loads(can_fly_rows[-1][12]) == {"requery": True, "fields": ["can_fly"]}
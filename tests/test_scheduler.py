@@ -0,0 +1,165 @@
+"""
+Tests for the multi-domain fair scheduler
+"""
+
+from types import SimpleNamespace
+import pytest
+import config
+from models import HeroCapabilities
+from core.circuit_breaker import CircuitBreaker, FailoverAdapter
+from core.db_logger import ValidationLogger
+from core.scheduler import (
+    DomainJob,
+    FairScheduler,
+    MultiDomainRunner,
+    RateLimiter,
+    parse_domain_spec,
+)
+from model_adapters.mock_adapter import MockAdapter
+
+
+class DownAdapter(MockAdapter):
+    """Adapter whose every request fails."""
+
+    def complete(self, messages, n=1):
+        raise ConnectionError("provider down")
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.acquired = []
+
+    def acquire(self, calls=1):
+        self.acquired.append(calls)
+
+
+def make_domain(tmp_path, name, items, **extra):
+    return SimpleNamespace(
+        VALIDATION_TASK=f"{name} test",
+        ITEMS_TO_VALIDATE=items,
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / f"{name}.db"),
+        **extra,
+    )
+
+
+def drain(scheduler):
+    order = []
+    while (task := scheduler.next()) is not None:
+        order.append(task)
+    return order
+
+
+def test_weighted_fair_interleaving(tmp_path):
+    """Test items are interleaved in proportion to the domains' weights."""
+    bulk = DomainJob("bulk", make_domain(tmp_path, "bulk", ["a"] * 6), weight=1)
+    heavy = DomainJob("heavy", make_domain(tmp_path, "heavy", ["b"] * 4), weight=2)
+
+    order = [job for job, _ in drain(FairScheduler([bulk, heavy]))]
+
+    assert order[:6] == [1, 0, 1, 1, 0, 1]
+    assert order[6:] == [0, 0, 0, 0]
+
+
+def test_priority_served_first(tmp_path):
+    """Test a small urgent domain is not starved by a large bulk domain."""
+    bulk = DomainJob("bulk", make_domain(tmp_path, "bulk", ["a"] * 50), weight=10)
+    urgent = DomainJob(
+        "urgent", make_domain(tmp_path, "urgent", ["b"] * 2, SCHEDULE_PRIORITY=1)
+    )
+
+    order = drain(FairScheduler([bulk, urgent]))
+
+    assert urgent.priority == 1
+    assert order[:2] == [(1, 0), (1, 1)]
+    assert len(order) == 52
+
+
+def test_rate_limiter_waits_for_tokens():
+    """Test the token bucket sleeps until enough calls are available."""
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=2, clock=lambda: now[0], sleep=sleep)
+    limiter.acquire(2)
+    limiter.acquire(1)
+
+    assert sleeps == [0.5]
+
+
+def test_parse_domain_spec():
+    """Test domain specs with and without weight/priority options."""
+    assert parse_domain_spec("superhero") == ("superhero", {})
+    assert parse_domain_spec("product_review:weight=3,priority=1") == (
+        "product_review",
+        {"weight": 3.0, "priority": 1},
+    )
+    with pytest.raises(ValueError, match="Unknown domain option"):
+        parse_domain_spec("superhero:speed=2")
+
+
+def test_multi_domain_run(tmp_path, monkeypatch):
+    """Test several domains are validated and logged as separate sessions."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    heroes = DomainJob(
+        "heroes", make_domain(tmp_path, "heroes", ["Superman", "Batman"])
+    )
+    urgent = DomainJob(
+        "urgent", make_domain(tmp_path, "urgent", ["Wonder Woman"]), priority=1
+    )
+    adapter = MockAdapter()
+    runner = MultiDomainRunner(
+        [heroes, urgent], adapter=adapter, iterations=2, workers=1, engine="fast"
+    )
+
+    sessions = runner.run()
+
+    assert runner.dispatch_order[0] == ("urgent", "Wonder Woman")
+    assert [s["domain"] for s in sessions] == ["heroes", "urgent"]
+    assert [r["item"] for r in sessions[0]["results"]] == ["Superman", "Batman"]
+    assert sessions[0]["results"][1]["consensus"]["can_fly"] is False
+    assert sessions[1]["results"][0]["consensus"]["gender"] == "female"
+    assert adapter.requests == 6
+
+    for session in sessions:
+        logger = ValidationLogger(session["db_path"])
+        assert logger.get_session(session["session_id"])["completed_at"]
+        assert len(logger.get_session_responses(session["session_id"])) == len(
+            session["results"]
+        ) * 2 * len(HeroCapabilities.model_fields)
+
+
+def test_multi_domain_failover_and_rate_limit(tmp_path, monkeypatch):
+    """Test failover hops are logged per session and the limiter is charged per call."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    heroes = DomainJob(
+        "heroes", make_domain(tmp_path, "heroes", ["Superman", "Batman"])
+    )
+    villains = DomainJob("villains", make_domain(tmp_path, "villains", ["Joker"]))
+    adapter = FailoverAdapter(
+        [("groq", DownAdapter()), ("mock", MockAdapter())],
+        breakers={"groq": CircuitBreaker(min_calls=20), "mock": CircuitBreaker()},
+    )
+    limiter = RecordingLimiter()
+    runner = MultiDomainRunner(
+        [heroes, villains],
+        adapter=adapter,
+        iterations=2,
+        workers=3,
+        engine="fast",
+    )
+    runner.rate_limiter = limiter
+
+    sessions = runner.run()
+
+    assert adapter.on_event is None
+    assert limiter.acquired == [1] * 6
+    for session in sessions:
+        events = ValidationLogger(session["db_path"]).get_failover_events(
+            session["session_id"]
+        )
+        assert len(events) == len(session["results"]) * 2
@@ -0,0 +1,173 @@
+"""
+Tests for the validation service
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+import pytest
+import config
+from models import HeroCapabilities
+from core.db_logger import ValidationLogger
+from core.service import MicroBatcher, ValidationService, create_server
+from model_adapters.mock_adapter import MockAdapter
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    domain_config = SimpleNamespace(
+        VALIDATION_TASK="service test",
+        ITEMS_TO_VALIDATE=["Superman"],
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "service.db"),
+    )
+    service = ValidationService(
+        domains={"heroes": domain_config},
+        adapter=MockAdapter(),
+        iterations=2,
+        batch_window=0.05,
+        engine="fast",
+    )
+    yield service
+    service.close()
+
+
+def test_micro_batcher_groups_items():
+    """Test items submitted within the window are dispatched together."""
+    batches = []
+    batcher = MicroBatcher(
+        lambda batch: batches.append([item for item, _ in batch]), window=0.05
+    )
+    for item in ["a", "b", "c"]:
+        batcher.submit(item)
+    batcher.close()
+
+    assert batches == [["a", "b", "c"]]
+
+
+def test_micro_batcher_max_batch():
+    """Test a full batch is dispatched without waiting for the window."""
+    batches = []
+    batcher = MicroBatcher(
+        lambda batch: batches.append(len(batch)), window=10, max_batch=2
+    )
+    for item in ["a", "b", "c"]:
+        batcher.submit(item)
+    batcher.close()
+
+    assert batches == [2, 1]
+
+
+def test_service_dedups_concurrent_requests(service):
+    """Test concurrent requests for the same item share one verification."""
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.extend(service.validate("heroes", ["Superman"]))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 4
+    assert all(r["consensus"]["can_fly"] is True for r in results)
+    assert service.adapter.requests == 2
+    stats = service.stats()["heroes"]
+    assert stats == {"requests": 4, "items": 4, "batches": 1, "verified": 1}
+
+    logger = ValidationLogger(service.domains["heroes"].logger.db_path)
+    responses = logger.get_session_responses(results[0]["session_id"])
+    assert {row[4] for row in responses} == {1, 2}
+
+
+def test_service_http(service):
+    """Test the HTTP API validates items and reports errors as JSON."""
+    server = create_server(service, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def post(payload):
+        request = urllib.request.Request(
+            f"{base_url}/validate",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    try:
+        body = post({"domain": "heroes", "items": ["Batman", "Wonder Woman"]})
+        assert [r["item"] for r in body["results"]] == ["Batman", "Wonder Woman"]
+        assert body["results"][1]["consensus"]["gender"] == "female"
+
+        with urllib.request.urlopen(f"{base_url}/health") as response:
+            assert json.loads(response.read())["domains"] == ["heroes"]
+
+        for payload in [
+            {"domain": "villains", "items": ["Joker"]},
+            {"domain": "heroes", "items": None},
+            {"domain": "heroes", "items": [1, 2]},
+            ["heroes"],
+        ]:
+            with pytest.raises(urllib.error.HTTPError) as error:
+                post(payload)
+            assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_service_http_timeout(service):
+    """Test a request outlasting the request timeout gets a 504."""
+    server = create_server(service, "127.0.0.1", 0, request_timeout=0.001)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{server.server_address[1]}/validate",
+        data=json.dumps({"domain": "heroes", "items": ["Batman"]}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request)
+        assert error.value.code == 504
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_service_reuses_domain_session(tmp_path, monkeypatch):
+    """Test batches share the domain's session until it expires or the service closes."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    domain_config = SimpleNamespace(
+        VALIDATION_TASK="session test",
+        ITEMS_TO_VALIDATE=["Superman"],
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "sessions.db"),
+    )
+    service = ValidationService(
+        domains={"heroes": domain_config},
+        adapter=MockAdapter(),
+        iterations=2,
+        batch_window=0,
+        session_seconds=0,
+        engine="fast",
+    )
+    first = service.validate("heroes", ["Superman"])[0]
+    second = service.validate("heroes", ["Batman"])[0]
+    service.session_seconds = 1e-9
+    third = service.validate("heroes", ["Wonder Woman"])[0]
+    service.close()
+
+    assert first["session_id"] == second["session_id"] != third["session_id"]
+    logger = ValidationLogger(service.domains["heroes"].logger.db_path)
+    sessions = [logger.get_session(r["session_id"]) for r in (first, third)]
+    assert [s["completed_at"] is not None for s in sessions] == [True, True]
+    assert [(s["total_items"], s["api_calls"]) for s in sessions] == [(2, 4), (1, 2)]
@@ -0,0 +1,152 @@
+"""
+Tests for result sinks
+"""
+
+import csv
+import io
+import itertools
+import json
+from types import SimpleNamespace
+import pytest
+import config
+from models import HeroCapabilities
+from core.db_logger import ValidationLogger
+from core.sinks import (
+    CsvSink,
+    JsonlSink,
+    ProgressSink,
+    ResultSink,
+    SinkDispatcher,
+    SqliteSink,
+    make_sink,
+)
+from examples.validation_helpers import run_validation
+from model_adapters.mock_adapter import MockAdapter
+
+
+class RecordingSink(ResultSink):
+    def __init__(self):
+        self.batches = []
+        self.closed = False
+
+    def write_batch(self, records):
+        self.batches.append([record["item"] for record in records])
+
+    def close(self):
+        self.closed = True
+
+
+class FailingSink(ResultSink):
+    def __init__(self):
+        self.calls = 0
+
+    def write_batch(self, records):
+        self.calls += 1
+        raise OSError("disk full")
+
+
+class UnopenableSink(ResultSink):
+    def open(self, context):
+        raise PermissionError("read-only")
+
+
+def test_dispatcher_feeds_every_sink():
+    """Test every sink gets every record, and a failing sink doesn't stop the others."""
+    recording = RecordingSink()
+    dispatcher = SinkDispatcher([FailingSink(), recording], {})
+    for item in ["a", "b", "c"]:
+        dispatcher.submit({"item": item})
+
+    with pytest.raises(OSError, match="disk full"):
+        dispatcher.close()
+
+    assert list(itertools.chain.from_iterable(recording.batches)) == ["a", "b", "c"]
+    assert recording.closed
+
+
+def test_failed_sink_is_skipped(caplog):
+    """Test a sink that failed a write is logged once and gets no more batches."""
+    failing, recording = FailingSink(), RecordingSink()
+    dispatcher = SinkDispatcher([failing, recording], {}, max_batch=1, max_queued=1)
+    for item in ["a", "b", "c"]:
+        dispatcher.submit({"item": item})
+    dispatcher.close(raise_errors=False)
+
+    assert failing.calls == 1
+    assert len(recording.batches) == 3
+    assert "FailingSink failed" in caplog.text
+
+
+def test_open_failure_closes_opened_sinks(tmp_path):
+    """Test sinks opened before a failing open() are closed again."""
+    jsonl = JsonlSink(str(tmp_path / "results.jsonl"))
+
+    with pytest.raises(PermissionError):
+        SinkDispatcher([jsonl, UnopenableSink()], {})
+
+    assert jsonl._file.closed
+
+
+def test_make_sink():
+    """Test sink specs from the CLI."""
+    assert isinstance(make_sink("jsonl:out.jsonl"), JsonlSink)
+    assert isinstance(make_sink("csv:out.csv"), CsvSink)
+    assert make_sink("sqlite", db_path="run.db").db_path == "run.db"
+    assert isinstance(make_sink("progress"), ProgressSink)
+    with pytest.raises(ValueError, match="needs a path"):
+        make_sink("csv")
+    with pytest.raises(ValueError, match="Unknown sink"):
+        make_sink("parquet:out.parquet")
+
+
+def test_run_with_sinks(tmp_path, monkeypatch):
+    """Test a run writes JSONL, CSV, SQLite and progress output together."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    domain_config = SimpleNamespace(
+        VALIDATION_TASK="sink test",
+        ITEMS_TO_VALIDATE=["Superman", "Wonder Woman"],
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "sinks.db"),
+    )
+    progress = io.StringIO()
+
+    session_info = run_validation(
+        domain_config,
+        iterations=2,
+        adapter=MockAdapter(),
+        engine="fast",
+        compact_history=True,
+        sinks=[
+            JsonlSink(str(tmp_path / "out" / "results.jsonl")),
+            CsvSink(str(tmp_path / "results.csv")),
+            SqliteSink(str(tmp_path / "sinks.db")),
+            ProgressSink(interval=0, stream=progress),
+        ],
+    )
+
+    with open(tmp_path / "out" / "results.jsonl", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert [line["item"] for line in lines] == ["Superman", "Wonder Woman"]
+    assert lines[1]["history"][0]["gender"] == "female"
+    assert lines[0]["session_id"] == session_info["session_id"]
+
+    with open(tmp_path / "results.csv", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == [
+        "position",
+        "item",
+        "can_fly",
+        "has_super_strength",
+        "gender",
+        "calls",
+    ]
+    assert rows[2] == ["1", "Wonder Woman", "True", "True", "female", "2"]
+
+    stored = ValidationLogger(session_info["db_path"]).get_item_consensus(
+        session_info["session_id"]
+    )
+    assert [row[:2] for row in stored] == [(0, "Superman"), (1, "Wonder Woman")]
+    assert stored[0][2] == session_info["results"][0]["consensus"]
+
+    assert "2/2" in progress.getvalue()
+    assert "items/s" in progress.getvalue()
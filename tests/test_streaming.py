@@ -0,0 +1,114 @@
+"""
+Tests for streamed consensus samples
+"""
+
+import itertools
+import time
+from types import SimpleNamespace
+import config
+from models import HeroCapabilities
+from core.streaming import IncrementalFieldParser, is_decided
+from core.verifier import ConsensusVerifier
+from examples.validation_helpers import run_validation
+from model_adapters.mock_adapter import MockAdapter
+
+SUPERMAN = '{"can_fly": true, "has_super_strength": true, "gender": "male"}'
+
+
+class SlowStreamAdapter(MockAdapter):
+    """MockAdapter whose streams after the first `fast` ones crawl."""
+
+    def __init__(self, fast, **kwargs):
+        super().__init__(chunk_size=4, **kwargs)
+        self.fast = fast
+        self._streams = itertools.count()
+
+    def stream(self, messages):
+        slow = next(self._streams) >= self.fast
+        for chunk in super().stream(messages):
+            if slow:
+                time.sleep(0.05)
+            yield chunk
+
+
+def test_parser_reads_fields_as_they_complete():
+    """Test fields appear once their value is complete, numbers at a delimiter."""
+    parser = IncrementalFieldParser()
+    text = (
+        'Sure!\n```json\n{"name": "Bat, man", "age": 42, "tags": [1, 2], "ok": true}```'
+    )
+    seen = []
+    for char in text:
+        for key, value in parser.feed(char).items():
+            seen.append((key, value, len(parser.text)))
+
+    assert parser.fields == {"name": "Bat, man", "age": 42, "tags": [1, 2], "ok": True}
+    assert [key for key, _, _ in seen] == ["name", "age", "tags", "ok"]
+    # "age" is only read after the comma: 4 could have been 42 or 42.5
+    assert text[seen[1][2] - 1] == ","
+    assert parser.closed
+
+
+def test_is_decided():
+    """Test a field is decided once pending samples can't change its outcome."""
+    fields = ["can_fly"]
+    yes, no = {"can_fly": True}, {"can_fly": False}
+
+    assert is_decided([yes, yes, yes], fields, threshold=3, pending=2)
+    assert not is_decided([yes, yes, no], fields, threshold=3, pending=2)
+    # No answer can reach the threshold any more: ambiguous either way
+    assert is_decided([yes, no, {"error": "x"}], fields, threshold=3, pending=1)
+    assert not is_decided([{"error": "x"}], fields, threshold=1, pending=0)
+
+
+def test_stream_stops_once_decided(tmp_path, monkeypatch):
+    """Test queued streams never start after consensus and fields are timed."""
+    monkeypatch.setattr(config, "DATA_DIR", str(tmp_path))
+    domain_config = SimpleNamespace(
+        VALIDATION_TASK="streaming test",
+        ITEMS_TO_VALIDATE=["Superman", "Batman"],
+        VALIDATION_SCHEMA=HeroCapabilities,
+        DATABASE_PATH=str(tmp_path / "stream.db"),
+    )
+    monkeypatch.setattr(config, "STREAM_CONCURRENCY", 1)
+
+    session_info = run_validation(
+        domain_config,
+        iterations=5,
+        adapter=MockAdapter(chunk_size=5),
+        engine="fast",
+        stream=True,
+    )
+
+    superman = session_info["results"][0]
+    assert superman["consensus"] == {
+        "can_fly": True,
+        "has_super_strength": True,
+        "gender": "male",
+    }
+    # 3 of 5 agreeing answers decide the 3/5 threshold
+    assert len(superman["history"]) == 3
+    assert superman["cancelled_streams"] == 2
+    assert superman["time_to_first_field"] >= 0
+    assert session_info["api_calls"] == 6
+
+
+def test_in_flight_streams_are_cancelled():
+    """Test a slow stream is closed mid-way once the others decided the item."""
+    adapter = SlowStreamAdapter(fast=2)
+    verifier = ConsensusVerifier(
+        adapter,
+        HeroCapabilities,
+        iterations=3,
+        threshold=2,
+        engine="fast",
+        stream=True,
+    )
+
+    result = verifier.verify("Superman")
+
+    assert result["consensus"]["can_fly"] is True
+    assert len(result["history"]) == 2
+    assert result["cancelled_streams"] == 1
+    chunks_per_answer = -(-len(SUPERMAN) // 4)
+    assert adapter.chunks_sent < 3 * chunks_per_answer